@@ -0,0 +1,126 @@
+"""
+Measure encrypted POST throughput against a local stub modem.
+
+The stub serves the CSRF home page, webserver/publickey, user/state-login
+and accepts encrypted posts on api/test/encrypted, checking that each body
+decrypts. "uncached" drops the session's encryption parameters and the
+cipher cache before every post, which is what every encrypted request
+used to cost; "cached" is the current behaviour.
+
+Usage: python benchmarks/encrypted_post.py [--number N] [--padding 0|1]
+"""
+import argparse
+import sys
+import threading
+import time
+from binascii import unhexlify
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from Cryptodome.Cipher import PKCS1_OAEP, PKCS1_v1_5
+from Cryptodome.PublicKey import RSA
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from huawei_lte_api.Session import Session  # noqa: E402
+from huawei_lte_api.Tools import Tools  # noqa: E402
+
+HOME = b'<html><head><meta name="csrf_token" content="benchmarktoken"/></head></html>'
+
+
+def make_handler(key: RSA.RsaKey, padding: int, counters: Dict[str, int]) -> Type[BaseHTTPRequestHandler]:
+    public_key = (
+        '<?xml version="1.0" encoding="UTF-8"?><response>'
+        '<encpubkeyn>{:x}</encpubkeyn><encpubkeye>{:x}</encpubkeye>'
+        '</response>'
+    ).format(key.n, key.e).encode()
+    state_login = (
+        '<?xml version="1.0" encoding="UTF-8"?><response>'
+        '<State>0</State><password_type>4</password_type><rsapadingtype>{}</rsapadingtype>'
+        '</response>'
+    ).format(padding).encode()
+    block = key.size_in_bytes()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            pass
+
+        def _reply(self, body: bytes, content_type: str = 'text/xml') -> None:
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            counters[self.path] = counters.get(self.path, 0) + 1
+            if self.path == '/':
+                self._reply(HOME, 'text/html')
+            elif self.path == '/api/webserver/publickey':
+                self._reply(public_key)
+            elif self.path == '/api/user/state-login':
+                self._reply(state_login)
+            else:
+                self._reply(b'<error><code>100002</code><message></message></error>')
+
+        def do_POST(self) -> None:
+            counters[self.path] = counters.get(self.path, 0) + 1
+            body = unhexlify(self.rfile.read(int(self.headers['Content-Length'])))
+            chunks = []  # type: List[Optional[bytes]]
+            if padding:
+                oaep = PKCS1_OAEP.new(key)
+                chunks = [oaep.decrypt(body[i:i + block]) for i in range(0, len(body), block)]
+            else:
+                v1_5 = PKCS1_v1_5.new(key)
+                chunks = [v1_5.decrypt(body[i:i + block], None) for i in range(0, len(body), block)]
+            if None in chunks:
+                self._reply(b'<error><code>125003</code><message></message></error>')
+            else:
+                self._reply(b'<response>OK</response>')
+
+    return Handler
+
+
+def run(session: Session, number: int, cached: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        if not cached:
+            session._reset_encryption()
+            Tools.rsa_cipher.cache_clear()
+        session.post_set('test/encrypted', {'Password': 'secret' * 4}, is_encrypted=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=200, help='Encrypted posts per measure')
+    parser.add_argument('--padding', type=int, choices=(0, 1), default=1, help='rsapadingtype announced by the stub')
+    args = parser.parse_args()
+
+    key = RSA.generate(2048)
+    counters = {}  # type: Dict[str, int]
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(key, args.padding, counters))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with Session('http://127.0.0.1:{}/'.format(server.server_port)) as session:
+            for cached in (False, True):
+                counters.clear()
+                elapsed = run(session, args.number, cached)
+                requests = sum(counters.values())
+                print('{:<9} {:>8.1f} posts/s {:>6.2f} ms/post {:>5.1f} requests/post'.format(
+                    'cached' if cached else 'uncached',
+                    args.number / elapsed,
+                    elapsed / args.number * 1000,
+                    requests / args.number,
+                ))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure Client throughput against the simulated modem (fake_modem.py).
+
+Runs read calls (device.signal, sms.sms_count, sms.get_sms_list) and
+sms.send_sms through a logged-in Connection, sequentially and from
+several threads sharing one thread-safe Connection, optionally with
+simulated network latency and injected busy/CSRF errors. No hardware is
+needed, so the numbers can be tracked on a CI box.
+
+Usage: python benchmarks/fake_modem_bench.py [--number N] [--threads T] [--latency S] [--csrf-rate R]
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_modem import FakeModem, FakeModemServer  # noqa: E402
+from huawei_lte_api.Client import Client  # noqa: E402
+from huawei_lte_api.Connection import Connection, ConnectionOptions  # noqa: E402
+
+CALLS = {
+    'device.signal': lambda client: client.device.signal(),
+    'sms.sms_count': lambda client: client.sms.sms_count(),
+    'sms.get_sms_list': lambda client: client.sms.get_sms_list(),
+    'sms.send_sms': lambda client: client.sms.send_sms(['+420123456789'], 'benchmark'),
+}
+
+
+def run(client: Client, call: Callable[[Client], Any], number: int, threads: int) -> float:
+    per_thread = max(1, number // threads)
+    errors = []  # type: List[Exception]
+
+    def worker() -> None:
+        for _ in range(per_thread):
+            try:
+                call(client)
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        print('  {} errors, first: {!r}'.format(len(errors), errors[0]))
+    return per_thread * threads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--busy-rate', type=float, default=0.0)
+    parser.add_argument('--csrf-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeModemServer(('127.0.0.1', 0), FakeModem(
+        latency=args.latency,
+        busy_rate=args.busy_rate,
+        csrf_rate=args.csrf_rate,
+    ))
+    server.start()
+    try:
+        with Connection(server.url, username='admin', password='admin',
+                        options=ConnectionOptions(thread_safe=True)) as connection:
+            client = Client(connection)
+            for name, call in CALLS.items():
+                sequential = run(client, call, args.number, 1)
+                threaded = run(client, call, args.number, args.threads)
+                print('{:18} {:8.1f} calls/s   {:8.1f} calls/s with {} threads'.format(
+                    name, sequential, threaded, args.threads))
+            print('modem requests: {requests}, logins: {logins}, injected errors: {errors_injected}'.format(
+                **server.modem.stats))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
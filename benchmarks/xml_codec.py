@@ -0,0 +1,103 @@
+"""
+Compare XmlCodec with xmltodict on recorded modem responses.
+
+Every fixture in benchmarks/fixtures is decoded by both implementations and
+checked for identical results before timing, so this doubles as a quick
+equivalence check after codec changes.
+
+Usage: python benchmarks/xml_codec.py [--number N]
+"""
+import argparse
+import sys
+import timeit
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+import xmltodict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from huawei_lte_api.XmlCodec import XmlCodec  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+REQUESTS = {  # type: Dict[str, Union[dict, list, int]]
+    'send-sms': {
+        'Index': -1,
+        'Phones': {'Phone': ['+33612345678', '+33698765432']},
+        'Sca': '',
+        'Content': 'Rappel : réunion <équipe> reportée à 14h30 & confirmée',
+        'Length': 55,
+        'Reserved': 1,
+        'Date': '2024-05-01 10:00:00',
+    },
+    'sms-list': {
+        'PageIndex': 1,
+        'ReadCount': 50,
+        'BoxType': 1,
+        'SortType': 0,
+        'Ascending': 0,
+        'UnreadPreferred': 0,
+    },
+}
+
+CONTENT_TYPES = [
+    'text/xml; charset=UTF-8',
+    'application/json;charset=utf-8',
+    'text/html',
+    'application/vnd.api+json',
+]
+
+
+def email_content_type_is_json(content_type: str) -> Optional[bool]:
+    msg = EmailMessage()
+    msg['Content-Type'] = content_type
+    content_type = msg.get_content_type()
+    if content_type.endswith('/json') or content_type.endswith('+json'):
+        return True
+    if content_type.endswith('/xml') or content_type.endswith('+xml'):
+        return False
+    return None
+
+
+def report(name: str, number: int, reference: Callable[[], Any], candidate: Callable[[], Any]) -> None:
+    before = timeit.timeit(reference, number=number) / number * 1e6
+    after = timeit.timeit(candidate, number=number) / number * 1e6
+    print('{:<28} {:>10.1f} µs {:>10.1f} µs {:>7.1f}x'.format(name, before, after, before / after))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=2000, help='Iterations per measure')
+    args = parser.parse_args()
+
+    print('{:<28} {:>13} {:>13} {:>8}'.format('', 'xmltodict', 'XmlCodec', ''))
+    for path in sorted(FIXTURES.glob('*.xml')):
+        data = path.read_bytes()
+        assert XmlCodec.parse(data) == xmltodict.parse(data, dict_constructor=dict), path.name
+        report(
+            'parse ' + path.stem, args.number,
+            lambda: xmltodict.parse(data, dict_constructor=dict),
+            lambda: XmlCodec.parse(data),
+        )
+
+    for name, request in REQUESTS.items():
+        assert XmlCodec.unparse_request(request) == xmltodict.unparse({'request': request}).encode('utf-8'), name
+        report(
+            'unparse ' + name, args.number,
+            lambda: xmltodict.unparse({'request': request}).encode('utf-8'),
+            lambda: XmlCodec.unparse_request(request),
+        )
+
+    for content_type in CONTENT_TYPES:
+        assert XmlCodec.content_type_is_json(content_type) == email_content_type_is_json(content_type), content_type
+    report(
+        'content-type', args.number,
+        lambda: [email_content_type_is_json(content_type) for content_type in CONTENT_TYPES],
+        lambda: [XmlCodec.content_type_is_json(content_type) for content_type in CONTENT_TYPES],
+    )
+
+
+if __name__ == '__main__':
+    main()
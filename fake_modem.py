@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Simule un modem Huawei LTE (API HiLink) pour les tests et les benchmarks.
+
+Exemple d'utilisation :
+python3 fake_modem.py --port 8081 --password PASSWORD --latency 0.05 --inbox 40
+# Puis :
+# python3 sms_http_api.py http://127.0.0.1:8081/ --username admin --password PASSWORD
+
+Le serveur implémente la page d'accueil (jeton CSRF dans la balise meta),
+``webserver/SesTokInfo``, ``user/state-login``, ``user/login`` (SHA256 et base64),
+``user/logout``, ``user/heartbeat``, les endpoints SMS (liste, envoi, suppression,
+comptage) ainsi que quelques endpoints d'information (signal, statut, opérateur...).
+Une latence, une taille de boîte de réception et un taux d'erreurs
+(système occupé 100004, CSRF 125002) sont configurables.
+"""
+
+import base64
+import hashlib
+import logging
+import random
+import secrets
+import threading
+import time
+import urllib.parse
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+import xmltodict
+
+logger = logging.getLogger(__name__)
+
+ERROR_SYSTEM_BUSY = 100004
+ERROR_SYSTEM_NO_RIGHTS = 100003
+ERROR_SYSTEM_NO_SUPPORT = 100002
+ERROR_SYSTEM_CSRF = 125002
+ERROR_USERNAME_PWD_WRONG = 108006
+ERROR_USERNAME_PWD_OVERRUN = 108007
+
+PASSWORD_TYPE_BASE_64 = 0
+PASSWORD_TYPE_SHA256 = 4
+
+PUBLIC_ENDPOINTS = {
+    "webserver/SesTokInfo",
+    "webserver/token",
+    "webserver/publickey",
+    "user/state-login",
+    "user/login",
+    "user/heartbeat",
+    "device/signal",
+    "monitoring/status",
+    "monitoring/check-notifications",
+    "net/current-plmn",
+}
+
+
+def _xml_response(payload: Union[str, Dict[str, Any]]) -> bytes:
+    if isinstance(payload, str):
+        body = f"<response>{escape(payload)}</response>"
+        return ('<?xml version="1.0" encoding="UTF-8"?>' + body).encode("utf-8")
+    return xmltodict.unparse({"response": payload}).encode("utf-8")
+
+
+def _xml_error(code: int) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<error><code>{code}</code><message></message></error>"
+    ).encode("utf-8")
+
+
+def _sha256_b64(data: bytes) -> bytes:
+    return base64.b64encode(hashlib.sha256(data).hexdigest().encode("ascii"))
+
+
+class FakeModemSession:
+    """État d'une session HTTP côté modem (cookie ``SessionID``)."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.logged_in = False
+        self.tokens: List[str] = []
+        self.last_seen = time.monotonic()
+
+    def new_token(self) -> str:
+        token = secrets.token_hex(16)
+        self.tokens.append(token)
+        # Le firmware ne garde qu'une poignée de jetons valides
+        del self.tokens[:-8]
+        return token
+
+
+class FakeModem:
+    """Modèle de données du modem simulé, partagé entre les threads du serveur."""
+
+    def __init__(
+        self,
+        username: str = "admin",
+        password: str = "admin",
+        password_type: int = PASSWORD_TYPE_SHA256,
+        inbox_size: int = 20,
+        latency: float = 0.0,
+        busy_rate: float = 0.0,
+        csrf_rate: float = 0.0,
+        session_timeout: float = 300.0,
+        max_login_failures: int = 3,
+    ) -> None:
+        self.username = username
+        self.password = password
+        self.password_type = password_type
+        self.latency = latency
+        self.busy_rate = busy_rate
+        self.csrf_rate = csrf_rate
+        self.session_timeout = session_timeout
+        self.max_login_failures = max_login_failures
+        self.sessions: Dict[str, FakeModemSession] = {}
+        self.inbox: List[Dict[str, Any]] = []
+        self.outbox: List[Dict[str, Any]] = []
+        self.login_failures = 0
+        self.stats = {"requests": 0, "logins": 0, "sent": 0, "errors_injected": 0}
+        self.lock = threading.Lock()
+        now = datetime.now()
+        for i in range(inbox_size):
+            self.add_incoming(
+                f"+3361234{i:04d}",
+                f"Message de test numéro {i}",
+                now - timedelta(minutes=i),
+            )
+
+    def add_incoming(self, phone: str, content: str, date: Optional[datetime] = None) -> int:
+        with self.lock:
+            index = 40000 + len(self.inbox) + len(self.outbox)
+            self.inbox.insert(
+                0,
+                {
+                    "Smstat": "0",
+                    "Index": str(index),
+                    "Phone": phone,
+                    "Content": content,
+                    "Date": (date or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
+                    "Sca": None,
+                    "SaveType": "0",
+                    "Priority": "0",
+                    "SmsType": "1",
+                },
+            )
+            return index
+
+    def get_session(self, session_id: Optional[str]) -> FakeModemSession:
+        with self.lock:
+            session = self.sessions.get(session_id) if session_id else None
+            if session is None:
+                session = FakeModemSession(secrets.token_hex(32))
+                self.sessions[session.session_id] = session
+            elif time.monotonic() - session.last_seen > self.session_timeout:
+                session.logged_in = False
+            session.last_seen = time.monotonic()
+            return session
+
+    def check_password(self, username: str, encoded: str, password_type: int, token: str) -> bool:
+        if username != self.username:
+            return False
+        if password_type == PASSWORD_TYPE_SHA256:
+            expected = _sha256_b64(
+                username.encode("utf-8")
+                + _sha256_b64(self.password.encode("utf-8"))
+                + token.encode("utf-8")
+            )
+            return encoded.encode("ascii") == expected
+        return encoded == base64.b64encode(self.password.encode("utf-8")).decode("ascii")
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.stats[name] += value
+
+    def inject_error(self) -> Optional[int]:
+        """Retourne un code d'erreur simulé, ou ``None``."""
+        roll = random.random()
+        if roll < self.busy_rate:
+            self.count("errors_injected")
+            return ERROR_SYSTEM_BUSY
+        if roll < self.busy_rate + self.csrf_rate:
+            self.count("errors_injected")
+            return ERROR_SYSTEM_CSRF
+        return None
+
+
+class FakeModemHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, chaque
+    # réponse attendrait l'ACK retardé du client (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature imposée
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    @property
+    def modem(self) -> FakeModem:
+        assert isinstance(self.server, FakeModemServer)
+        return self.server.modem
+
+    def _session(self) -> FakeModemSession:
+        cookies: Dict[str, str] = {}
+        for part in self.headers.get("Cookie", "").split(";"):
+            if "=" in part:
+                name, value = part.strip().split("=", 1)
+                cookies[name] = value
+        return self.modem.get_session(cookies.get("SessionID"))
+
+    def _reply(self, session: FakeModemSession, body: bytes, content_type: str = "text/xml",
+               headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"SessionID={session.session_id}; path=/; HttpOnly;")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _endpoint(self) -> Tuple[Optional[str], str]:
+        path = urllib.parse.urlparse(self.path).path
+        if path.startswith("/api/"):
+            return "api", path[len("/api/"):]
+        if path.startswith("/config/"):
+            return "config", path[len("/config/"):]
+        return None, path
+
+    def do_GET(self) -> None:
+        self.modem.count("requests")
+        if self.modem.latency:
+            time.sleep(self.modem.latency)
+        session = self._session()
+        prefix, endpoint = self._endpoint()
+        if prefix is None:
+            tokens = [session.new_token(), session.new_token()]
+            body = (
+                "<!DOCTYPE html><html><head>"
+                + "".join(f'<meta name="csrf_token" content="{t}"/>' for t in tokens)
+                + "</head><body></body></html>"
+            ).encode("utf-8")
+            self._reply(session, body, content_type="text/html")
+            return
+        if prefix == "config":
+            if endpoint == "lan/config.xml":
+                config = {"dhcps": {"ipaddress": "192.168.8.1", "netmask": "255.255.255.0"}}
+                body = xmltodict.unparse({"config": config}).encode("utf-8")
+                self._reply(session, body)
+                return
+            self._reply(session, _xml_error(ERROR_SYSTEM_NO_SUPPORT))
+            return
+
+        if endpoint not in PUBLIC_ENDPOINTS and not session.logged_in:
+            self._reply(session, _xml_error(ERROR_SYSTEM_NO_RIGHTS))
+            return
+        error = self.modem.inject_error()
+        if error is not None:
+            self._reply(session, _xml_error(error))
+            return
+
+        payload = self._get_payload(session, endpoint)
+        if payload is None:
+            self._reply(session, _xml_error(ERROR_SYSTEM_NO_SUPPORT))
+        else:
+            self._reply(session, _xml_response(payload))
+
+    def _get_payload(self, session: FakeModemSession, endpoint: str) -> Optional[Dict[str, Any]]:
+        modem = self.modem
+        if endpoint == "webserver/SesTokInfo":
+            return {"SesInfo": f"SessionID={session.session_id}", "TokInfo": session.new_token()}
+        if endpoint == "user/state-login":
+            return {
+                "State": "0" if session.logged_in else "-1",
+                "Username": modem.username if session.logged_in else None,
+                "password_type": str(modem.password_type),
+                "extern_password_type": "1",
+                "firstlogin": "0",
+                "rsapadingtype": "1",
+            }
+        if endpoint == "user/heartbeat":
+            return {"userlevel": "2" if session.logged_in else "0"}
+        if endpoint == "sms/sms-count":
+            with modem.lock:
+                unread = sum(1 for m in modem.inbox if m["Smstat"] == "0")
+                return {
+                    "LocalUnread": str(unread),
+                    "LocalInbox": str(len(modem.inbox)),
+                    "LocalOutbox": str(len(modem.outbox)),
+                    "LocalDraft": "0",
+                    "LocalDeleted": "0",
+                    "SimUnread": "0",
+                    "SimInbox": "0",
+                    "SimOutbox": "0",
+                    "SimDraft": "0",
+                    "LocalMax": "500",
+                    "SimMax": "50",
+                    "SimUsed": "0",
+                    "NewMsg": "0",
+                }
+        if endpoint == "device/signal":
+            return {
+                "pci": "281",
+                "cell_id": "28612866",
+                "rssi": f"-{random.randint(60, 75)}dBm",
+                "rsrp": f"-{random.randint(85, 105)}dBm",
+                "rsrq": "-10.0dB",
+                "sinr": "8dB",
+                "mode": "7",
+            }
+        if endpoint == "device/information":
+            return {
+                "DeviceName": "E5576-320",
+                "SerialNumber": "FAKE0000000000",
+                "Imei": "860000000000000",
+                "HardwareVersion": "CL1E5573SM",
+                "SoftwareVersion": "21.110.99.02.00",
+                "WebUIVersion": "WEBUI 21.100.47.00.03",
+                "ProductFamily": "LTE",
+                "Classify": "mobile-wifi",
+                "workmode": "LTE",
+            }
+        if endpoint == "monitoring/status":
+            return {"ConnectionStatus": "901", "CurrentNetworkType": "19", "SignalIcon": "4"}
+        if endpoint == "monitoring/check-notifications":
+            with modem.lock:
+                unread = sum(1 for m in modem.inbox if m["Smstat"] == "0")
+            return {"UnreadMessage": str(unread), "SmsStorageFull": "0", "OnlineUpdateStatus": "10"}
+        if endpoint == "monitoring/traffic-statistics":
+            return {"CurrentUpload": "1024", "CurrentDownload": "4096", "TotalUpload": "1048576", "TotalDownload": "4194304"}
+        if endpoint == "net/current-plmn":
+            return {"State": "0", "FullName": "Orange F", "ShortName": "Orange", "Numeric": "20801", "Rat": "7"}
+        if endpoint == "webserver/publickey":
+            return {"encpubkeyn": "c" * 512, "encpubkeye": "010001"}
+        return None
+
+    def do_POST(self) -> None:
+        self.modem.count("requests")
+        if self.modem.latency:
+            time.sleep(self.modem.latency)
+        session = self._session()
+        _, endpoint = self._endpoint()
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+
+        token = self.headers.get("__RequestVerificationToken")
+        if token not in session.tokens:
+            self._reply(session, _xml_error(ERROR_SYSTEM_CSRF))
+            return
+        session.tokens.remove(token)
+
+        error = self.modem.inject_error()
+        if error is not None:
+            self._reply(session, _xml_error(error), headers={"__RequestVerificationToken": session.new_token()})
+            return
+
+        try:
+            data = (xmltodict.parse(raw) if raw else {}).get("request") or {}
+        except Exception:
+            data = {}
+
+        if endpoint == "user/login":
+            self._login(session, data, token)
+            return
+        if endpoint != "user/logout" and not session.logged_in:
+            self._reply(session, _xml_error(ERROR_SYSTEM_NO_RIGHTS), headers={"__RequestVerificationToken": session.new_token()})
+            return
+
+        result = self._post_result(session, endpoint, data)
+        if isinstance(result, int):
+            body = _xml_error(result)
+        else:
+            body = _xml_response(result)
+        self._reply(session, body, headers={"__RequestVerificationToken": session.new_token()})
+
+    def _login(self, session: FakeModemSession, data: Dict[str, Any], token: str) -> None:
+        modem = self.modem
+        if modem.login_failures >= modem.max_login_failures:
+            self._reply(session, _xml_error(ERROR_USERNAME_PWD_OVERRUN), headers={"__RequestVerificationToken": session.new_token()})
+            return
+        ok = modem.check_password(
+            data.get("Username") or "",
+            data.get("Password") or "",
+            int(data.get("password_type") or 0),
+            token,
+        )
+        if not ok:
+            modem.login_failures += 1
+            self._reply(session, _xml_error(ERROR_USERNAME_PWD_WRONG), headers={"__RequestVerificationToken": session.new_token()})
+            return
+        modem.login_failures = 0
+        modem.count("logins")
+        session.logged_in = True
+        session.tokens.clear()
+        self._reply(
+            session,
+            _xml_response("OK"),
+            headers={
+                "__RequestVerificationTokenone": session.new_token(),
+                "__RequestVerificationTokentwo": session.new_token(),
+            },
+        )
+
+    def _post_result(self, session: FakeModemSession, endpoint: str, data: Dict[str, Any]) -> Union[int, str, Dict[str, Any]]:
+        modem = self.modem
+        if endpoint == "user/logout":
+            if not session.logged_in:
+                return ERROR_SYSTEM_NO_RIGHTS
+            session.logged_in = False
+            return "OK"
+        if endpoint == "sms/sms-list":
+            page = max(int(data.get("PageIndex") or 1), 1)
+            count = max(int(data.get("ReadCount") or 20), 1)
+            with modem.lock:
+                box = modem.inbox if str(data.get("BoxType", "1")) == "1" else modem.outbox
+                chunk = [dict(m) for m in box[(page - 1) * count:page * count]]
+            return {"Count": str(len(chunk)), "Messages": {"Message": chunk} if chunk else None}
+        if endpoint == "sms/send-sms":
+            phones = (data.get("Phones") or {}).get("Phone") or []
+            if isinstance(phones, str):
+                phones = [phones]
+            with modem.lock:
+                modem.outbox.insert(0, {
+                    "Smstat": "3",
+                    "Index": str(50000 + len(modem.outbox)),
+                    "Phone": ";".join(phones),
+                    "Content": data.get("Content") or "",
+                    "Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "Sca": None,
+                    "SaveType": "0",
+                    "Priority": "0",
+                    "SmsType": "1",
+                })
+                modem.stats["sent"] += 1
+            return "OK"
+        if endpoint == "sms/delete-sms":
+            index = str(data.get("Index"))
+            with modem.lock:
+                modem.inbox = [m for m in modem.inbox if m["Index"] != index]
+                modem.outbox = [m for m in modem.outbox if m["Index"] != index]
+            return "OK"
+        if endpoint == "sms/set-read":
+            index = str(data.get("Index"))
+            with modem.lock:
+                for message in modem.inbox:
+                    if message["Index"] == index:
+                        message["Smstat"] = "1"
+            return "OK"
+        return ERROR_SYSTEM_NO_SUPPORT
+
+
+class FakeModemServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address: Tuple[str, int], modem: Optional[FakeModem] = None) -> None:
+        super().__init__(server_address, FakeModemHandler)
+        self.modem = modem or FakeModem()
+
+    @property
+    def url(self) -> str:
+        host, port = self.socket.getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> threading.Thread:
+        """Démarre le serveur dans un thread (utile dans les tests)."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--username", type=str, default="admin")
+    parser.add_argument("--password", type=str, default="admin")
+    parser.add_argument("--password-type", type=int, choices=[PASSWORD_TYPE_BASE_64, PASSWORD_TYPE_SHA256], default=PASSWORD_TYPE_SHA256)
+    parser.add_argument("--inbox", type=int, default=20, help="Nombre de SMS présents dans la boîte de réception")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence ajoutée à chaque requête (secondes)")
+    parser.add_argument("--busy-rate", type=float, default=0.0, help="Proportion de réponses 100004 (système occupé)")
+    parser.add_argument("--csrf-rate", type=float, default=0.0, help="Proportion de réponses 125002 (erreur CSRF)")
+    parser.add_argument("--session-timeout", type=float, default=300.0, help="Durée d'inactivité avant expiration de la session")
+    args = parser.parse_args()
+
+    modem = FakeModem(
+        username=args.username,
+        password=args.password,
+        password_type=args.password_type,
+        inbox_size=args.inbox,
+        latency=args.latency,
+        busy_rate=args.busy_rate,
+        csrf_rate=args.csrf_rate,
+        session_timeout=args.session_timeout,
+    )
+    server = FakeModemServer((args.host, args.port), modem)
+    logging.info("Modem simulé sur %s", server.url)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Relève les métriques d'une flotte de modems dans une base SQLite.
+
+Exemple d'utilisation :
+python3 fleet_poller.py flotte.json --db fleet.db --concurrency 50
+
+Le fichier de configuration liste les modems, avec des valeurs communes
+dans ``defaults`` :
+{
+    "defaults": {"username": "admin", "password": "PASSWORD", "interval": 60},
+    "modems": [
+        {"name": "site-paris", "url": "http://10.0.1.1/"},
+        {"name": "site-lyon", "url": "http://10.0.2.1/", "intervals": {"sms.sms_count": 300}}
+    ]
+}
+Les options de la ligne de commande (``concurrency``, ``timeout``…) peuvent
+aussi y figurer.
+
+Un seul processus et une seule boucle asyncio relèvent tous les modems ;
+nécessite ``aiohttp`` (``pip install huawei-lte-api[async]``).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+from argparse import ArgumentParser
+
+from sms_api.fleet import FleetPoller, MetricStore, ModemTarget
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = ArgumentParser()
+    parser.add_argument("config", type=str, help="Fichier JSON listant les modems")
+    parser.add_argument(
+        "--db",
+        default=os.getenv("FLEET_DB", "fleet.db"),
+        help="Base SQLite où enregistrer les relevés",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("FLEET_CONCURRENCY", "50")),
+        help="Nombre maximal de modems relevés en même temps",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=float(os.getenv("FLEET_TIMEOUT", "10")),
+        help="Délai en secondes d'un relevé",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=float(os.getenv("FLEET_JITTER", "0.1")),
+        help="Variation aléatoire des intervalles (0.1 pour ±10 %%)",
+    )
+    parser.add_argument(
+        "--max-backoff",
+        type=float,
+        default=float(os.getenv("FLEET_MAX_BACKOFF", "600")),
+        help="Attente maximale en secondes avant de réessayer un modem en échec",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=float,
+        default=float(os.getenv("FLEET_RETENTION_DAYS", "30")),
+        help="Durée de conservation des relevés en jours (0 pour tout garder)",
+    )
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    concurrency = int(config.get("concurrency", args.concurrency))
+    timeout = float(config.get("timeout", args.timeout))
+    jitter = float(config.get("jitter", args.jitter))
+    max_backoff = float(config.get("max_backoff", args.max_backoff))
+    retention_days = float(config.get("retention_days", args.retention_days))
+
+    defaults = config.get("defaults", {})
+    targets = [ModemTarget.from_config(entry, defaults) for entry in config.get("modems", [])]
+    if not targets:
+        parser.error("aucun modem dans le fichier de configuration")
+
+    store = MetricStore(args.db)
+    poller = FleetPoller(
+        targets,
+        store,
+        concurrency=concurrency,
+        timeout=timeout,
+        jitter=jitter,
+        max_backoff=max_backoff,
+        retention=retention_days * 86400 if retention_days else None,
+    )
+
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, poller.stop)
+            except NotImplementedError:  # pragma: no cover - Windows
+                pass
+        await poller.run()
+
+    try:
+        asyncio.run(run())
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
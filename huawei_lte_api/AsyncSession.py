@@ -0,0 +1,488 @@
+import asyncio
+import logging
+import time
+import urllib.parse
+from concurrent.futures import Executor
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Type, \
+    TypeVar, Union, cast
+
+from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import ResponseCache
+from huawei_lte_api.Session import EndpointSpec, GetResponseType, SetResponseType, Session
+from huawei_lte_api.TokenPool import TokenPool
+from huawei_lte_api.exceptions import \
+    ResponseErrorLoginCsrfException, \
+    ResponseErrorLoginRequiredException, \
+    ResponseErrorNotSupportedException
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None  # type: ignore
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar('T')
+S = TypeVar('S', bound='AsyncSession')
+
+
+def _try_or_renew_and_retry(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    async def wrapped(*args: Any, **kw: Any) -> T:
+        session = args[0]
+        endpoint = args[1] if len(args) > 1 else kw.get('endpoint', '')
+        generation = session.session_generation
+        if session.idle_timeout is not None and session.idle_time >= session.idle_timeout:
+            if await session._renew(endpoint, generation, 'idle'):
+                generation = session.session_generation
+        try:
+            return await fn(*args, **kw)
+        except ResponseErrorLoginCsrfException:
+            await session._renew(endpoint, generation, 'csrf')
+            return await fn(*args, **kw)
+        except ResponseErrorLoginRequiredException:
+            if not await session._renew(endpoint, generation, 'login'):
+                raise
+            return await fn(*args, **kw)
+
+    return wrapped
+
+
+class _CallRecorder:
+    """Stand-in session recording the requests an API method would issue."""
+
+    result = object()
+
+    def __init__(self, session: 'AsyncSession') -> None:
+        self.calls = []  # type: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]]
+        self.request_verification_tokens = session.request_verification_tokens
+
+    def _record(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        self.calls.append((name, args, kwargs))
+        return self.result
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._record('get', args, kwargs)
+
+    def post_get(self, *args: Any, **kwargs: Any) -> Any:
+        return self._record('post_get', args, kwargs)
+
+    def post_set(self, *args: Any, **kwargs: Any) -> Any:
+        return self._record('post_set', args, kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        raise AttributeError(name)
+
+
+class _SyncBridge:
+    """Session stand-in for worker threads: each request is sent by the AsyncSession on its event loop."""
+
+    def __init__(self, session: 'AsyncSession', loop: asyncio.AbstractEventLoop) -> None:
+        self._session = session
+        self._loop = loop
+
+    def _wait(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @property
+    def request_verification_tokens(self) -> List[str]:
+        return self._session.request_verification_tokens
+
+    def get(self, endpoint: str, params: Optional[dict] = None, prefix: str = 'api',
+            cache_ttl: Optional[float] = None) -> GetResponseType:
+        return self._wait(self._session.get(endpoint, params, prefix, cache_ttl))
+
+    def post_get(self, *args: Any, **kwargs: Any) -> GetResponseType:
+        return self._wait(self._session.post_get(*args, **kwargs))
+
+    def post_set(self, *args: Any, **kwargs: Any) -> SetResponseType:
+        return self._wait(self._session.post_set(*args, **kwargs))
+
+    def post_set_with_token(self, *args: Any, **kwargs: Any) -> SetResponseType:
+        return self._wait(self._session.post_set_with_token(*args, **kwargs))
+
+    def post_file(self, endpoint: str, files: dict, data: Optional[dict] = None, prefix: str = 'api') -> str:
+        return self._wait(self._session.post_file(endpoint, files, data, prefix))
+
+    def reload(self) -> None:
+        self._wait(self._session.reload())
+
+
+class AsyncSession:
+    """
+    asyncio counterpart of Session, on aiohttp (pip install huawei-lte-api[async]).
+
+    Requests are built and responses decoded and checked by the same code as Session.
+    GETs run concurrently; POSTs are sequenced so each one-time CSRF token is used once,
+    and a token is fetched when none is left. Expired sessions are renewed once for
+    all concurrent callers, as in Session.
+
+    API group methods are called through call_api (or AsyncClient): methods that boil
+    down to a single request are sent directly, anything else runs in a worker thread
+    whose requests are still sent from the event loop.
+
+    Usage example:
+    >>> async with AsyncSession('http://192.168.8.1/') as session:
+    ...     signal = await session.get('device/signal')
+    """
+
+    csrf_re = Session.csrf_re
+    session_endpoints = Session.session_endpoints
+
+    def __init__(self,
+                 url: str,
+                 timeout: Optional[float] = None,
+                 client_session: Optional['aiohttp.ClientSession'] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 idle_timeout: Optional[float] = None,
+                 max_connections: int = 4,
+                 executor: Optional[Executor] = None,
+                 ):
+        """
+        :param timeout: total timeout of each request, in seconds
+        :param client_session: aiohttp ClientSession to use; if not None, closing it is the caller's responsibility.
+                               Modems are usually reached by IP address, so its cookie jar must accept those
+                               (aiohttp.CookieJar(unsafe=True))
+        :param response_cache: cache for GET endpoints declaring a cache_ttl; None disables caching
+        :param idle_timeout: renew the session before a request when nothing succeeded for this many seconds
+        :param max_connections: maximum number of simultaneous HTTP connections to the modem
+        :param executor: executor running API methods that cannot be sent directly; None for the loop default
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncSession requires aiohttp, install huawei-lte-api[async]')
+        self.url = Session._clean_url(url)
+        self.timeout = timeout
+        self.response_cache = response_cache
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.executor = executor
+        self.csrf_tokens = TokenPool()
+        self.session_generation = 0
+        self.last_success = None  # type: Optional[float]
+        self.stats = {'reloads': 0, 'relogins': 0, 'direct_calls': 0, 'threaded_calls': 0}
+        self.encryption_key = None  # type: Optional[dict]
+        self._rsa_padding = None  # type: Optional[int]
+        self._http = client_session
+        self._custom_client_session = client_session is not None
+        # Created again in open(): before Python 3.10 asyncio locks bind to the loop current at creation
+        self._post_lock = asyncio.Lock()
+        self._renew_lock = asyncio.Lock()
+
+    async def open(self: S) -> S:
+        """
+        Create the HTTP session if needed and fetch the CSRF tokens
+        """
+        self._post_lock = asyncio.Lock()
+        self._renew_lock = asyncio.Lock()
+        if self._http is None:
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit_per_host=self.max_connections),
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+            )
+        try:
+            await self._initialize_csrf_tokens_and_session()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    @property
+    def http(self) -> 'aiohttp.ClientSession':
+        if self._http is None:
+            raise RuntimeError('AsyncSession is not open, use "async with" or await open()')
+        return self._http
+
+    @property
+    def request_verification_tokens(self) -> List[str]:
+        return self.csrf_tokens.snapshot()
+
+    @property
+    def idle_time(self) -> float:
+        return 0.0 if self.last_success is None else time.monotonic() - self.last_success
+
+    def _build_final_url(self, endpoint: str, prefix: str = 'api') -> str:
+        return urllib.parse.urljoin(self.url + '{}/'.format(prefix), endpoint)
+
+    async def reload(self) -> None:
+        async with self._post_lock:
+            if self.response_cache is not None:
+                self.response_cache.clear()
+            await self._initialize_csrf_tokens_and_session()
+            self.stats['reloads'] += 1
+
+    async def _renew(self, endpoint: str, generation: int, reason: str) -> bool:
+        """
+        Renew the session after an error or a long idle period; concurrent callers renew it once
+        :return: True when the session was renewed, or already renewed by another caller
+        """
+        if reason == 'login' or (reason == 'idle' and endpoint in self.session_endpoints):
+            return False
+        if endpoint in self.session_endpoints:
+            # May happen while the session is being renewed (e.g. logging in), which holds the renew lock
+            await self.reload()
+            return True
+        async with self._renew_lock:
+            if self.session_generation == generation:
+                _LOGGER.debug('Reloading session (%s on %s)', reason, endpoint)
+                await self.reload()
+        return True
+
+    async def _initialize_csrf_tokens_and_session(self) -> None:
+        self.csrf_tokens.reset()
+        self.encryption_key = None
+        self._rsa_padding = None
+
+        async with self.http.get(self.url) as response:
+            content = await response.read()
+        self.session_generation += 1
+        self.last_success = time.monotonic()
+
+        csrf_tokens = self.csrf_re.findall(content.decode('UTF-8', errors='replace'))
+        if csrf_tokens:
+            self.csrf_tokens.reset(csrf_tokens)
+        else:
+            token = await self._get_token()
+            if token is not None:
+                self.csrf_tokens.add([token])
+
+    async def _get_token(self) -> Optional[str]:
+        # Plain _get: this runs with the POST lock held, a retry could not reload
+        try:
+            return (await self._get('webserver/token'))['token']
+        except ResponseErrorNotSupportedException:
+            try:
+                return (await self._get('webserver/SesTokInfo'))['TokInfo']
+            except ResponseErrorNotSupportedException:
+                return None
+
+    async def _next_post_token(self) -> Optional[str]:
+        token = self.csrf_tokens.take()
+        if token is None:
+            token = await self._get_token()
+            if token is not None:
+                self.csrf_tokens.prefetched(token)
+        return token
+
+    async def _encrypt_data(self, data: bytes) -> bytes:
+        if not self.encryption_key:
+            self.encryption_key = await self._get('webserver/publickey')
+        if self._rsa_padding is None:
+            self._rsa_padding = Session._rsa_padding_from_state(await self._get('user/state-login'))
+        return Session._encrypt_with_key(self.encryption_key, data, self._rsa_padding)
+
+    async def post_get(self,
+                       endpoint: str,
+                       data: Union[dict, list, int, None] = None,
+                       refresh_csrf: bool = False,
+                       prefix: str = 'api',
+                       is_encrypted: bool = False,
+                       is_json: bool = False,
+                       ) -> GetResponseType:
+        return cast(GetResponseType, await self._post(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json))
+
+    async def post_set(self,
+                       endpoint: str,
+                       data: Union[dict, list, int, None] = None,
+                       refresh_csrf: bool = False,
+                       prefix: str = 'api',
+                       is_encrypted: bool = False,
+                       is_json: bool = False,
+                       ) -> SetResponseType:
+        return await self._post_set(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json)
+
+    async def post_set_with_token(self,
+                                  endpoint: str,
+                                  build_data: Callable[[Optional[str]], dict],
+                                  refresh_csrf: bool = False,
+                                  prefix: str = 'api',
+                                  ) -> SetResponseType:
+        """
+        See Session.post_set_with_token
+        """
+        return await self._post_set(endpoint, None, refresh_csrf, prefix, False, False, build_data)
+
+    async def _post_set(self,
+                        endpoint: str,
+                        data: Union[dict, list, int, None],
+                        refresh_csrf: bool,
+                        prefix: str,
+                        is_encrypted: bool,
+                        is_json: bool,
+                        build_data: Optional[Callable[[Optional[str]], dict]] = None,
+                        ) -> SetResponseType:
+        if endpoint in ('user/login', 'user/logout'):
+            # Public key and padding may differ between login states
+            self.encryption_key = None
+            self._rsa_padding = None
+        try:
+            return cast(SetResponseType, await self._post(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json,
+                                                          build_data))
+        finally:
+            # After the POST, see Session.post_set
+            if self.response_cache is not None:
+                self.response_cache.invalidate(endpoint)
+
+    @_try_or_renew_and_retry
+    async def _post(self,
+                    endpoint: str,
+                    data: Union[dict, list, int, None] = None,
+                    refresh_csrf: bool = False,
+                    prefix: str = 'api',
+                    is_encrypted: bool = False,
+                    is_json: bool = False,
+                    build_data: Optional[Callable[[Optional[str]], dict]] = None,
+                    ) -> Union[GetResponseType, SetResponseType]:
+        async with self._post_lock:
+            headers = Session._post_headers(is_encrypted)
+            token = await self._next_post_token()
+            if token is not None:
+                headers['__RequestVerificationToken'] = token
+            if build_data is not None:
+                data = build_data(token)
+
+            data_encoded = Session._encode_request_data(data, is_json)
+            if is_encrypted:
+                data_encoded = await self._encrypt_data(data_encoded)
+            async with self.http.post(self._build_final_url(endpoint, prefix), data=data_encoded,
+                                      headers=headers) as response:
+                response.raise_for_status()
+                content = await response.read()
+                Session._store_response_tokens(self.csrf_tokens, response.headers, refresh_csrf)
+                response_data = Session._decode_response(content, response.headers.get('Content-Type'),
+                                                         bool(response.history))
+
+        result = cast(str, Session._check_response_status(response_data))
+        self.last_success = time.monotonic()
+        return result
+
+    async def post_file(self,
+                        endpoint: str,
+                        files: dict,
+                        data: Optional[dict] = None,
+                        prefix: str = 'api',
+                        ) -> str:
+        if self.response_cache is not None:
+            self.response_cache.clear()
+
+        async with self._post_lock:
+            form = aiohttp.FormData()
+            token = self.csrf_tokens.first()
+            for name, value in dict(data or {}, **({'csrf_token': token} if token is not None else {})).items():
+                form.add_field(name, str(value))
+            for name, value in files.items():
+                form.add_field(name, value)
+            async with self.http.post(self._build_final_url(endpoint, prefix), data=form) as response:
+                response.raise_for_status()
+                content = await response.read()
+
+        return content.decode('UTF-8').lower()
+
+    async def get(self,
+                  endpoint: str,
+                  params: Optional[dict] = None,
+                  prefix: str = 'api',
+                  cache_ttl: Optional[float] = None,
+                  ) -> GetResponseType:
+        """
+        :param cache_ttl: seconds the response may be served from response_cache, if the session has one
+        """
+        if cache_ttl is None or self.response_cache is None or params is not None:
+            return await self._get_with_retry(endpoint, params, prefix)
+        hit, value = self.response_cache.get((prefix, endpoint))
+        if hit:
+            return cast(GetResponseType, value)
+        response = await self._get_with_retry(endpoint, params, prefix)
+        self.response_cache.put((prefix, endpoint), response, cache_ttl)
+        return response
+
+    @_try_or_renew_and_retry
+    async def _get_with_retry(self, endpoint: str, params: Optional[dict] = None, prefix: str = 'api') -> dict:
+        return await self._get(endpoint, params, prefix)
+
+    async def _get(self, endpoint: str, params: Optional[dict] = None, prefix: str = 'api') -> dict:
+        headers = {}
+        token = self.csrf_tokens.single()
+        if token is not None:
+            headers['__RequestVerificationToken'] = token
+
+        async with self.http.get(
+            self._build_final_url(endpoint, prefix),
+            # aiohttp only takes str and int query values
+            params={key: str(value) for key, value in params.items()} if params else None,
+            headers=headers,
+        ) as response:
+            content = await response.read()
+            response_data = Session._decode_response(content, response.headers.get('Content-Type'),
+                                                     bool(response.history))
+
+        result = cast(dict, Session._check_response_status(response_data))
+        self.last_success = time.monotonic()
+        return result
+
+    async def get_many(self,
+                       endpoints: Union[Iterable[str], Mapping[Hashable, EndpointSpec]],
+                       ) -> Dict[Hashable, Union[GetResponseType, Exception]]:
+        """
+        Fetch several read-only endpoints concurrently, see Session.get_many
+
+        :param endpoints: endpoint paths, or a mapping of result key to endpoint
+                          path or (endpoint, params, prefix) tuple
+        :return: result per key; failed endpoints map to the raised exception
+        """
+        if isinstance(endpoints, Mapping):
+            specs = dict(endpoints)
+        else:
+            specs = {endpoint: endpoint for endpoint in endpoints}
+
+        async def fetch(spec: EndpointSpec) -> Union[GetResponseType, Exception]:
+            endpoint, params, prefix, cache_ttl = Session._endpoint_spec(spec)
+            try:
+                return await self.get(endpoint, params, prefix, cache_ttl)
+            except Exception as e:  # pylint: disable=broad-except
+                return e
+
+        results = await asyncio.gather(*(fetch(spec) for spec in specs.values()))
+        return dict(zip(specs, results))
+
+    async def run_sync(self, func: Callable[[Session], T]) -> T:
+        """
+        Run synchronous code written against Session in a worker thread; its requests are sent by this session
+        """
+        loop = asyncio.get_running_loop()
+        bridge = cast(Session, _SyncBridge(self, loop))
+        return await loop.run_in_executor(self.executor, func, bridge)
+
+    async def call_api(self, group_class: Type[ApiGroup], method_name: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call an API group method, e.g. call_api(Device, 'signal')
+
+        The method is first run against a recording session: when it issues a single request and
+        returns its result unchanged, that request is sent directly. Otherwise the method runs in
+        a worker thread through run_sync.
+        """
+        recorder = _CallRecorder(self)
+        try:
+            recorded = getattr(group_class(cast(Session, recorder)), method_name)(*args, **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            recorded = None
+        if recorded is _CallRecorder.result and len(recorder.calls) == 1:
+            name, call_args, call_kwargs = recorder.calls[0]
+            self.stats['direct_calls'] += 1
+            return await getattr(self, name)(*call_args, **call_kwargs)
+
+        self.stats['threaded_calls'] += 1
+        return await self.run_sync(lambda session: getattr(group_class(session), method_name)(*args, **kwargs))
+
+    async def close(self) -> None:
+        if self._http is not None and not self._custom_client_session:
+            await self._http.close()
+            self._http = None
+
+    async def __aenter__(self: S) -> S:
+        return await self.open()
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]],
+                        exc_value: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        await self.close()
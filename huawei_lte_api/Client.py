@@ -1,150 +1,302 @@
-# Api imports
+import importlib
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union, \
+    cast, overload
+
+from huawei_lte_api.ApiGroup import ApiGroup
 from huawei_lte_api.Connection import Connection
-from huawei_lte_api.api.App import App
-from huawei_lte_api.api.Bluetooth import Bluetooth
-from huawei_lte_api.api.Cradle import Cradle
-from huawei_lte_api.api.Cwmp import Cwmp
-from huawei_lte_api.api.DDns import DDns
-from huawei_lte_api.api.Developer import Developer
-from huawei_lte_api.api.Device import Device
-from huawei_lte_api.api.Dhcp import Dhcp
-from huawei_lte_api.api.Diagnosis import Diagnosis
-from huawei_lte_api.api.DialUp import DialUp
-from huawei_lte_api.api.FileManager import FileManager
-from huawei_lte_api.api.Global import Global as Global_
-from huawei_lte_api.api.Host import Host
-from huawei_lte_api.api.Lan import Lan
-from huawei_lte_api.api.Language import Language
-from huawei_lte_api.api.Led import Led
-from huawei_lte_api.api.Log import Log
-from huawei_lte_api.api.MLog import MLog
-from huawei_lte_api.api.Monitoring import Monitoring
-from huawei_lte_api.api.Net import Net
-from huawei_lte_api.api.Ntwk import Ntwk
-from huawei_lte_api.api.OnlineUpdate import OnlineUpdate
-from huawei_lte_api.api.Ota import Ota
-from huawei_lte_api.api.Pb import Pb
-from huawei_lte_api.api.Pin import Pin
-from huawei_lte_api.api.Redirection import Redirection
-from huawei_lte_api.api.SNtp import SNtp
-from huawei_lte_api.api.SdCard import SdCard
-from huawei_lte_api.api.Security import Security
-from huawei_lte_api.api.Sms import Sms
-from huawei_lte_api.api.Staticroute import Staticroute
-from huawei_lte_api.api.Statistic import Statistic
-from huawei_lte_api.api.Syslog import Syslog
-from huawei_lte_api.api.System import System
-from huawei_lte_api.api.Time import Time
-from huawei_lte_api.api.TimeRule import TimeRule
-from huawei_lte_api.api.UsbPrinter import UsbPrinter
-from huawei_lte_api.api.UsbStorage import UsbStorage
-from huawei_lte_api.api.User import User
-from huawei_lte_api.api.VSim import VSim
-from huawei_lte_api.api.Voice import Voice as Voice_
-from huawei_lte_api.api.Vpn import Vpn
-from huawei_lte_api.api.WLan import WLan
-from huawei_lte_api.api.WebServer import WebServer
-from huawei_lte_api.api.Ussd import Ussd
-
-# Config imports
-from huawei_lte_api.config.Device import Device as DeviceConfig
-from huawei_lte_api.config.DeviceInformation import DeviceInformation
-from huawei_lte_api.config.DialUp import DialUp as DialUpConfig
-from huawei_lte_api.config.FastBoot import FastBoot as FastBootConfig
-from huawei_lte_api.config.Firewall import Firewall as FirewallConfig
-from huawei_lte_api.config.Global import Global as GlobalConfig
-from huawei_lte_api.config.IPv6 import IPv6 as IPv6Config
-from huawei_lte_api.config.Lan import Lan as LanConfig
-from huawei_lte_api.config.Network import Network as NetworkConfig
-from huawei_lte_api.config.Ota import Ota as OtaConfig
-from huawei_lte_api.config.Pb import Pb as PbConfig
-from huawei_lte_api.config.PcAssistant import PcAssistant as PcAssistantConfig
-from huawei_lte_api.config.Pincode import Pincode as PincodeConfig
-from huawei_lte_api.config.Sms import Sms as SmsConfig
-from huawei_lte_api.config.Sntp import Sntp as SntpConfig
-from huawei_lte_api.config.Statistic import Statistic as StatisticConfig
-from huawei_lte_api.config.Stk import Stk as StkConfig
-from huawei_lte_api.config.UPnp import UPnp as UPnpConfig
-from huawei_lte_api.config.Update import Update as UpdateConfig
-from huawei_lte_api.config.Ussd import Ussd as UssdConfig
-from huawei_lte_api.config.Voice import Voice as VoiceConfig
-from huawei_lte_api.config.WebSd import WebSd as WebSdConfig
-from huawei_lte_api.config.WebUICfg import WebUICfg as WebUICfgConfig
-from huawei_lte_api.config.Wifi import Wifi as WifiConfig
-
-# Usermanual imports
-from huawei_lte_api.usermanual.PublicSysResources import PublicSysResources as PublicSysResourcesUserManual
+from huawei_lte_api.Session import EndpointSpec, GetResponseType, Session
+
+if TYPE_CHECKING:
+    # Api imports
+    from huawei_lte_api.api.App import App
+    from huawei_lte_api.api.Bluetooth import Bluetooth
+    from huawei_lte_api.api.Cradle import Cradle
+    from huawei_lte_api.api.Cwmp import Cwmp
+    from huawei_lte_api.api.DDns import DDns
+    from huawei_lte_api.api.Developer import Developer
+    from huawei_lte_api.api.Device import Device
+    from huawei_lte_api.api.Dhcp import Dhcp
+    from huawei_lte_api.api.Diagnosis import Diagnosis
+    from huawei_lte_api.api.DialUp import DialUp
+    from huawei_lte_api.api.FileManager import FileManager
+    from huawei_lte_api.api.Global import Global as Global_
+    from huawei_lte_api.api.Host import Host
+    from huawei_lte_api.api.Lan import Lan
+    from huawei_lte_api.api.Language import Language
+    from huawei_lte_api.api.Led import Led
+    from huawei_lte_api.api.Log import Log
+    from huawei_lte_api.api.MLog import MLog
+    from huawei_lte_api.api.Monitoring import Monitoring
+    from huawei_lte_api.api.Net import Net
+    from huawei_lte_api.api.Ntwk import Ntwk
+    from huawei_lte_api.api.OnlineUpdate import OnlineUpdate
+    from huawei_lte_api.api.Ota import Ota
+    from huawei_lte_api.api.Pb import Pb
+    from huawei_lte_api.api.Pin import Pin
+    from huawei_lte_api.api.Redirection import Redirection
+    from huawei_lte_api.api.SNtp import SNtp
+    from huawei_lte_api.api.SdCard import SdCard
+    from huawei_lte_api.api.Security import Security
+    from huawei_lte_api.api.Sms import Sms
+    from huawei_lte_api.api.Staticroute import Staticroute
+    from huawei_lte_api.api.Statistic import Statistic
+    from huawei_lte_api.api.Syslog import Syslog
+    from huawei_lte_api.api.System import System
+    from huawei_lte_api.api.Time import Time
+    from huawei_lte_api.api.TimeRule import TimeRule
+    from huawei_lte_api.api.UsbPrinter import UsbPrinter
+    from huawei_lte_api.api.UsbStorage import UsbStorage
+    from huawei_lte_api.api.User import User
+    from huawei_lte_api.api.VSim import VSim
+    from huawei_lte_api.api.Voice import Voice as Voice_
+    from huawei_lte_api.api.Vpn import Vpn
+    from huawei_lte_api.api.WLan import WLan
+    from huawei_lte_api.api.WebServer import WebServer
+    from huawei_lte_api.api.Ussd import Ussd
+
+    # Config imports
+    from huawei_lte_api.config.Device import Device as DeviceConfig
+    from huawei_lte_api.config.DeviceInformation import DeviceInformation
+    from huawei_lte_api.config.DialUp import DialUp as DialUpConfig
+    from huawei_lte_api.config.FastBoot import FastBoot as FastBootConfig
+    from huawei_lte_api.config.Firewall import Firewall as FirewallConfig
+    from huawei_lte_api.config.Global import Global as GlobalConfig
+    from huawei_lte_api.config.IPv6 import IPv6 as IPv6Config
+    from huawei_lte_api.config.Lan import Lan as LanConfig
+    from huawei_lte_api.config.Network import Network as NetworkConfig
+    from huawei_lte_api.config.Ota import Ota as OtaConfig
+    from huawei_lte_api.config.Pb import Pb as PbConfig
+    from huawei_lte_api.config.PcAssistant import PcAssistant as PcAssistantConfig
+    from huawei_lte_api.config.Pincode import Pincode as PincodeConfig
+    from huawei_lte_api.config.Sms import Sms as SmsConfig
+    from huawei_lte_api.config.Sntp import Sntp as SntpConfig
+    from huawei_lte_api.config.Statistic import Statistic as StatisticConfig
+    from huawei_lte_api.config.Stk import Stk as StkConfig
+    from huawei_lte_api.config.UPnp import UPnp as UPnpConfig
+    from huawei_lte_api.config.Update import Update as UpdateConfig
+    from huawei_lte_api.config.Ussd import Ussd as UssdConfig
+    from huawei_lte_api.config.Voice import Voice as VoiceConfig
+    from huawei_lte_api.config.WebSd import WebSd as WebSdConfig
+    from huawei_lte_api.config.WebUICfg import WebUICfg as WebUICfgConfig
+    from huawei_lte_api.config.Wifi import Wifi as WifiConfig
+
+    # Usermanual imports
+    from huawei_lte_api.usermanual.PublicSysResources import PublicSysResources as PublicSysResourcesUserManual
+
+G = TypeVar('G', bound=ApiGroup)
+
+
+class _LazyGroup(Generic[G]):
+    """
+    Client attribute creating its ApiGroup on first access.
+
+    The group module is only imported then, and the instance is stored on the
+    client so later accesses are plain attribute lookups.
+    """
+
+    def __init__(self, module: str):
+        self.module = module
+        self.name = ''
+
+    def __set_name__(self, owner: Type['Client'], name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: Type['Client']) -> '_LazyGroup[G]':
+        ...
+
+    @overload
+    def __get__(self, instance: 'Client', owner: Type['Client']) -> G:
+        ...
+
+    def __get__(self, instance: Optional['Client'], owner: Type['Client']) -> Union['_LazyGroup[G]', G]:
+        if instance is None:
+            return self
+        group_class = getattr(importlib.import_module(self.module), self.module.rpartition('.')[2])
+        group = group_class(instance._connection)  # pylint: disable=protected-access
+        instance.__dict__[self.name] = group
+        return group
+
+
+class _NotRecordable(Exception):
+    pass
+
+
+class _EndpointRecorder:
+    """Stand-in session recording the single GET an API method would issue."""
+
+    result = object()
+
+    def __init__(self) -> None:
+        self.calls = []  # type: List[Tuple[str, Optional[dict], str, Optional[float]]]
+
+    def get(self,
+            endpoint: str,
+            params: Optional[dict] = None,
+            prefix: str = 'api',
+            cache_ttl: Optional[float] = None,
+            ) -> Any:
+        self.calls.append((endpoint, params, prefix, cache_ttl))
+        return self.result
+
+    def __getattr__(self, name: str) -> Any:
+        raise _NotRecordable(name)
+
+
+class _ReadOnlySession:
+    """Stand-in session letting an API method issue GET requests only."""
+
+    def __init__(self, session: Session) -> None:
+        self.get = session.get
+
+    def __getattr__(self, name: str) -> Any:
+        raise ValueError('Session.{} is not allowed in a read-only snapshot'.format(name))
+
+
+def _record_get(group_class: Type[ApiGroup], method_name: str, name: str) -> Optional[EndpointSpec]:
+    """
+    Record the request a read-only API method issues when called without arguments
+
+    :return: the endpoint when the method is a single GET returning the response unchanged, else None
+    :raises ValueError: the method uses something else than GET, e.g. post_set
+    """
+    recorder = _EndpointRecorder()
+    try:
+        recorded = getattr(group_class(cast(Session, recorder)), method_name)()
+    except _NotRecordable as e:
+        raise ValueError('Not a read-only API method: {} uses Session.{}'.format(name, e)) from None
+    except Exception:  # pylint: disable=broad-except
+        return None
+    if recorded is _EndpointRecorder.result and len(recorder.calls) == 1:
+        return recorder.calls[0]
+    return None
 
 
 class Client:
-    def __init__(self, connection: Connection):  # pylint: disable=too-many-statements
-        self.monitoring = Monitoring(connection)
-        self.security = Security(connection)
-        self.webserver = WebServer(connection)
-        self.global_ = Global_(connection)
-        self.wlan = WLan(connection)
-        self.cradle = Cradle(connection)
-        self.pin = Pin(connection)
-        self.config_dialup = DialUpConfig(connection)
-        self.config_global = GlobalConfig(connection)
-        self.config_lan = LanConfig(connection)
-        self.config_network = NetworkConfig(connection)
-        self.config_pincode = PincodeConfig(connection)
-        self.config_sms = SmsConfig(connection)
-        self.config_voice = VoiceConfig(connection)
-        self.config_wifi = WifiConfig(connection)
-        self.config_pc_assistant = PcAssistantConfig(connection)
-        self.config_device_information = DeviceInformation(connection)
-        self.config_web_ui_cfg = WebUICfgConfig(connection)
-        self.config_device = DeviceConfig(connection)
-        self.config_fast_boot = FastBootConfig(connection)
-        self.config_firewall = FirewallConfig(connection)
-        self.config_ipv6 = IPv6Config(connection)
-        self.config_ota = OtaConfig(connection)
-        self.config_pb = PbConfig(connection)
-        self.config_sntp = SntpConfig(connection)
-        self.config_statistic = StatisticConfig(connection)
-        self.config_stk = StkConfig(connection)
-        self.config_update = UpdateConfig(connection)
-        self.config_u_pnp = UPnpConfig(connection)
-        self.config_ussd = UssdConfig(connection)
-        self.config_web_sd = WebSdConfig(connection)
-        self.usermanual_public_sys_resources = PublicSysResourcesUserManual(connection)
-        self.ota = Ota(connection)
-        self.net = Net(connection)
-        self.dial_up = DialUp(connection)
-        self.sms = Sms(connection)
-        self.redirection = Redirection(connection)
-        self.v_sim = VSim(connection)
-        self.file_manager = FileManager(connection)
-        self.dhcp = Dhcp(connection)
-        self.d_dns = DDns(connection)
-        self.diagnosis = Diagnosis(connection)
-        self.s_ntp = SNtp(connection)
-        self.user = User(connection)
-        self.device = Device(connection)
-        self.online_update = OnlineUpdate(connection)
-        self.log = Log(connection)
-        self.time = Time(connection)
-        self.sd_card = SdCard(connection)
-        self.usb_storage = UsbStorage(connection)
-        self.usb_printer = UsbPrinter(connection)
-        self.vpn = Vpn(connection)
-        self.ntwk = Ntwk(connection)
-        self.pb = Pb(connection)
-        self.host = Host(connection)
-        self.language = Language(connection)
-        self.syslog = Syslog(connection)
-        self.voice = Voice_(connection)
-        self.cwmp = Cwmp(connection)
-        self.lan = Lan(connection)
-        self.led = Led(connection)
-        self.statistic = Statistic(connection)
-        self.timerule = TimeRule(connection)
-        self.bluetooth = Bluetooth(connection)
-        self.mlog = MLog(connection)
-        self.ussd = Ussd(connection)
-        self.staticroute = Staticroute(connection)
-        self.system = System(connection)
-        self.app = App(connection)
-        self.developer = Developer(connection)
+    monitoring: '_LazyGroup[Monitoring]' = _LazyGroup('huawei_lte_api.api.Monitoring')
+    security: '_LazyGroup[Security]' = _LazyGroup('huawei_lte_api.api.Security')
+    webserver: '_LazyGroup[WebServer]' = _LazyGroup('huawei_lte_api.api.WebServer')
+    global_: '_LazyGroup[Global_]' = _LazyGroup('huawei_lte_api.api.Global')
+    wlan: '_LazyGroup[WLan]' = _LazyGroup('huawei_lte_api.api.WLan')
+    cradle: '_LazyGroup[Cradle]' = _LazyGroup('huawei_lte_api.api.Cradle')
+    pin: '_LazyGroup[Pin]' = _LazyGroup('huawei_lte_api.api.Pin')
+    config_dialup: '_LazyGroup[DialUpConfig]' = _LazyGroup('huawei_lte_api.config.DialUp')
+    config_global: '_LazyGroup[GlobalConfig]' = _LazyGroup('huawei_lte_api.config.Global')
+    config_lan: '_LazyGroup[LanConfig]' = _LazyGroup('huawei_lte_api.config.Lan')
+    config_network: '_LazyGroup[NetworkConfig]' = _LazyGroup('huawei_lte_api.config.Network')
+    config_pincode: '_LazyGroup[PincodeConfig]' = _LazyGroup('huawei_lte_api.config.Pincode')
+    config_sms: '_LazyGroup[SmsConfig]' = _LazyGroup('huawei_lte_api.config.Sms')
+    config_voice: '_LazyGroup[VoiceConfig]' = _LazyGroup('huawei_lte_api.config.Voice')
+    config_wifi: '_LazyGroup[WifiConfig]' = _LazyGroup('huawei_lte_api.config.Wifi')
+    config_pc_assistant: '_LazyGroup[PcAssistantConfig]' = _LazyGroup('huawei_lte_api.config.PcAssistant')
+    config_device_information: '_LazyGroup[DeviceInformation]' = _LazyGroup('huawei_lte_api.config.DeviceInformation')
+    config_web_ui_cfg: '_LazyGroup[WebUICfgConfig]' = _LazyGroup('huawei_lte_api.config.WebUICfg')
+    config_device: '_LazyGroup[DeviceConfig]' = _LazyGroup('huawei_lte_api.config.Device')
+    config_fast_boot: '_LazyGroup[FastBootConfig]' = _LazyGroup('huawei_lte_api.config.FastBoot')
+    config_firewall: '_LazyGroup[FirewallConfig]' = _LazyGroup('huawei_lte_api.config.Firewall')
+    config_ipv6: '_LazyGroup[IPv6Config]' = _LazyGroup('huawei_lte_api.config.IPv6')
+    config_ota: '_LazyGroup[OtaConfig]' = _LazyGroup('huawei_lte_api.config.Ota')
+    config_pb: '_LazyGroup[PbConfig]' = _LazyGroup('huawei_lte_api.config.Pb')
+    config_sntp: '_LazyGroup[SntpConfig]' = _LazyGroup('huawei_lte_api.config.Sntp')
+    config_statistic: '_LazyGroup[StatisticConfig]' = _LazyGroup('huawei_lte_api.config.Statistic')
+    config_stk: '_LazyGroup[StkConfig]' = _LazyGroup('huawei_lte_api.config.Stk')
+    config_update: '_LazyGroup[UpdateConfig]' = _LazyGroup('huawei_lte_api.config.Update')
+    config_u_pnp: '_LazyGroup[UPnpConfig]' = _LazyGroup('huawei_lte_api.config.UPnp')
+    config_ussd: '_LazyGroup[UssdConfig]' = _LazyGroup('huawei_lte_api.config.Ussd')
+    config_web_sd: '_LazyGroup[WebSdConfig]' = _LazyGroup('huawei_lte_api.config.WebSd')
+    usermanual_public_sys_resources: '_LazyGroup[PublicSysResourcesUserManual]' = _LazyGroup('huawei_lte_api.usermanual.PublicSysResources')
+    ota: '_LazyGroup[Ota]' = _LazyGroup('huawei_lte_api.api.Ota')
+    net: '_LazyGroup[Net]' = _LazyGroup('huawei_lte_api.api.Net')
+    dial_up: '_LazyGroup[DialUp]' = _LazyGroup('huawei_lte_api.api.DialUp')
+    sms: '_LazyGroup[Sms]' = _LazyGroup('huawei_lte_api.api.Sms')
+    redirection: '_LazyGroup[Redirection]' = _LazyGroup('huawei_lte_api.api.Redirection')
+    v_sim: '_LazyGroup[VSim]' = _LazyGroup('huawei_lte_api.api.VSim')
+    file_manager: '_LazyGroup[FileManager]' = _LazyGroup('huawei_lte_api.api.FileManager')
+    dhcp: '_LazyGroup[Dhcp]' = _LazyGroup('huawei_lte_api.api.Dhcp')
+    d_dns: '_LazyGroup[DDns]' = _LazyGroup('huawei_lte_api.api.DDns')
+    diagnosis: '_LazyGroup[Diagnosis]' = _LazyGroup('huawei_lte_api.api.Diagnosis')
+    s_ntp: '_LazyGroup[SNtp]' = _LazyGroup('huawei_lte_api.api.SNtp')
+    user: '_LazyGroup[User]' = _LazyGroup('huawei_lte_api.api.User')
+    device: '_LazyGroup[Device]' = _LazyGroup('huawei_lte_api.api.Device')
+    online_update: '_LazyGroup[OnlineUpdate]' = _LazyGroup('huawei_lte_api.api.OnlineUpdate')
+    log: '_LazyGroup[Log]' = _LazyGroup('huawei_lte_api.api.Log')
+    time: '_LazyGroup[Time]' = _LazyGroup('huawei_lte_api.api.Time')
+    sd_card: '_LazyGroup[SdCard]' = _LazyGroup('huawei_lte_api.api.SdCard')
+    usb_storage: '_LazyGroup[UsbStorage]' = _LazyGroup('huawei_lte_api.api.UsbStorage')
+    usb_printer: '_LazyGroup[UsbPrinter]' = _LazyGroup('huawei_lte_api.api.UsbPrinter')
+    vpn: '_LazyGroup[Vpn]' = _LazyGroup('huawei_lte_api.api.Vpn')
+    ntwk: '_LazyGroup[Ntwk]' = _LazyGroup('huawei_lte_api.api.Ntwk')
+    pb: '_LazyGroup[Pb]' = _LazyGroup('huawei_lte_api.api.Pb')
+    host: '_LazyGroup[Host]' = _LazyGroup('huawei_lte_api.api.Host')
+    language: '_LazyGroup[Language]' = _LazyGroup('huawei_lte_api.api.Language')
+    syslog: '_LazyGroup[Syslog]' = _LazyGroup('huawei_lte_api.api.Syslog')
+    voice: '_LazyGroup[Voice_]' = _LazyGroup('huawei_lte_api.api.Voice')
+    cwmp: '_LazyGroup[Cwmp]' = _LazyGroup('huawei_lte_api.api.Cwmp')
+    lan: '_LazyGroup[Lan]' = _LazyGroup('huawei_lte_api.api.Lan')
+    led: '_LazyGroup[Led]' = _LazyGroup('huawei_lte_api.api.Led')
+    statistic: '_LazyGroup[Statistic]' = _LazyGroup('huawei_lte_api.api.Statistic')
+    timerule: '_LazyGroup[TimeRule]' = _LazyGroup('huawei_lte_api.api.TimeRule')
+    bluetooth: '_LazyGroup[Bluetooth]' = _LazyGroup('huawei_lte_api.api.Bluetooth')
+    mlog: '_LazyGroup[MLog]' = _LazyGroup('huawei_lte_api.api.MLog')
+    ussd: '_LazyGroup[Ussd]' = _LazyGroup('huawei_lte_api.api.Ussd')
+    staticroute: '_LazyGroup[Staticroute]' = _LazyGroup('huawei_lte_api.api.Staticroute')
+    system: '_LazyGroup[System]' = _LazyGroup('huawei_lte_api.api.System')
+    app: '_LazyGroup[App]' = _LazyGroup('huawei_lte_api.api.App')
+    developer: '_LazyGroup[Developer]' = _LazyGroup('huawei_lte_api.api.Developer')
+
+    def __init__(self, connection: Connection):
+        self._connection = connection
+
+    def _resolve(self, name: str) -> Callable[[], Any]:
+        group_name, _, method_name = name.partition('.')
+        group = getattr(self, group_name, None)
+        method = getattr(group, method_name, None) if method_name else None
+        if group is None or not callable(method):
+            raise ValueError('Unknown API method: {}'.format(name))
+        return method
+
+    def snapshot(self,
+                 names: Iterable[str],
+                 max_workers: int = 8,
+                 ) -> Dict[str, Union[GetResponseType, Exception]]:
+        """
+        Call several read-only API methods concurrently.
+
+        Methods that boil down to a single GET are fetched in parallel through
+        Session.get_many; other GET-only methods are called one at a time.
+        Methods that POST (post_set, post_get, post_file...) are refused, so a
+        snapshot can never change the modem state.
+
+        :param names: methods as "group.method", e.g. ["device.signal", "monitoring.status"]
+        :param max_workers: maximum number of requests in flight
+        :return: result per name; failed calls map to the raised exception
+        :raises ValueError: a name is unknown or is not a read-only method
+
+        Usage example:
+        >>> client = Client(connection)
+        >>> data = client.snapshot(['device.information', 'device.signal'])
+        """
+        plain = {}  # type: Dict[str, EndpointSpec]
+        direct = {}  # type: Dict[str, Callable[[], Any]]
+        for name in names:
+            method = self._resolve(name)
+            group_class = type(method.__self__)  # type: ignore[attr-defined]
+            spec = _record_get(group_class, method.__name__, name)
+            if spec is not None:
+                plain[name] = spec
+            else:
+                # Cannot be told apart from its recording alone: run it on a session
+                # that refuses anything but GET
+                read_only = cast(Session, _ReadOnlySession(self._connection))
+                direct[name] = getattr(group_class(read_only), method.__name__)
+
+        results = {}  # type: Dict[str, Union[GetResponseType, Exception]]
+        if plain:
+            fetched = self._connection.get_many(plain, max_workers=max_workers)
+            results.update((str(key), value) for key, value in fetched.items())
+        for name, method in direct.items():
+            try:
+                results[name] = method()
+            except Exception as e:  # pylint: disable=broad-except
+                results[name] = e
+        return results
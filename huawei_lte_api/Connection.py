@@ -1,3 +1,5 @@
+import dataclasses
+import time
 import warnings
 from types import TracebackType
 from typing import Optional, Tuple, Union, Type
@@ -6,12 +8,27 @@ from urllib.parse import urlparse
 import logging
 import requests
 
+from huawei_lte_api.ResponseCache import ResponseCache
 from huawei_lte_api.Session import Session
-from huawei_lte_api.api.User import UserSession, DEFAULT_USERNAME
+from huawei_lte_api.SessionStore import SessionStore
+from huawei_lte_api.api.User import User, UserSession, DEFAULT_USERNAME
+from huawei_lte_api.enums.user import LoginStateEnum
+from huawei_lte_api.exceptions import ResponseErrorException
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass
+class ConnectionOptions:
+    # File to persist the logged-in session to; a session saved there that is still valid on the modem
+    # is resumed instead of logging in, and close() saves the session instead of logging out
+    session_file: Optional[str] = None
+    # Allow sharing the connection between threads, see Session
+    thread_safe: bool = False
+    # Log in again before a request when nothing succeeded for this many seconds, see Session
+    idle_timeout: Optional[float] = None
+
+
 class Connection(Session):
     user_session: Optional[UserSession] = None
 
@@ -21,10 +38,16 @@ class Connection(Session):
                  password: Optional[str] = None,
                  login_on_demand: bool = False,
                  timeout: Union[float, Tuple[float, float], None] = None,
-                 requests_session: Optional[requests.Session] = None
+                 requests_session: Optional[requests.Session] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 options: Optional[ConnectionOptions] = None,
                  ):
         """
         :param requests_session: requests Session to use; if not None, closing it is the caller's responsibility
+        :param response_cache: cache for GET endpoints declaring a cache_ttl; None disables caching
+        :param options: session persistence, thread safety and idle timeout, see ConnectionOptions
+
+        A request failing because the modem session expired (login required) logs in again and is retried once.
         """
         parsed_url = urlparse(url)
 
@@ -36,13 +59,26 @@ class Connection(Session):
         _LOGGER.debug("Username: %s", username)
         _LOGGER.debug("Password: %s", password)
 
-        super().__init__(url, timeout=timeout, requests_session=requests_session)
+        options = options or ConnectionOptions()
+        self.session_store = SessionStore(options.session_file) if options.session_file else None
+        self._username = username or DEFAULT_USERNAME
+        self._password = password
+        # time.monotonic() of the last login (or resume), None when not logged in
+        self.login_time = None  # type: Optional[float]
+
+        super().__init__(url, timeout=timeout, requests_session=requests_session, response_cache=response_cache,
+                         thread_safe=options.thread_safe, idle_timeout=options.idle_timeout)
         if username or password:
+            resumed = self._resume_session()
             self.user_session = UserSession(
                 self,
-                username or DEFAULT_USERNAME,
-                password
+                self._username,
+                password,
+                login=not resumed,
             )
+            if not resumed:
+                self.save_session()
+            self.login_time = time.monotonic()
 
         if login_on_demand:
             warnings.warn(
@@ -50,8 +86,88 @@ class Connection(Session):
                 DeprecationWarning
             )
 
+    def _resume_session(self) -> bool:
+        """
+        Load the session saved in session_file and check it is still logged in
+        :return: True when the saved session was resumed
+        """
+        if self.session_store is None:
+            return False
+        state = self.session_store.load(self.url, self._username)
+        if state is None:
+            return False
+
+        tokens = self.session_store.restore(state, self.requests_session.cookies)
+        if tokens:
+            self.request_verification_tokens = tokens
+        try:
+            state_login = User(self).state_login()
+            logged_in = LoginStateEnum(int(state_login['State'])) == LoginStateEnum.LOGGED_IN
+        except (ResponseErrorException, requests.exceptions.RequestException, KeyError, ValueError) as e:
+            _LOGGER.debug('Saved session check failed: %s', e)
+            logged_in = False
+
+        if logged_in:
+            _LOGGER.debug('Resumed saved session from %s', self.session_store.path)
+            return True
+
+        # Expired: get fresh CSRF tokens for the login that follows
+        _LOGGER.debug('Saved session expired, logging in')
+        self.reload()
+        return False
+
+    @property
+    def session_age(self) -> Optional[float]:
+        """
+        Seconds since the last login, None when not logged in
+        """
+        return None if self.login_time is None else time.monotonic() - self.login_time
+
+    def relogin(self) -> bool:
+        """
+        Reload CSRF tokens and log in again with the credentials given to the constructor
+        :return: True when logged in
+        """
+        with self._renew_lock:
+            self.reload()
+            if self.user_session is None:
+                return False
+            result = self.user_session.user.login(self._username, self._password, True)
+            self.login_time = time.monotonic()
+            self.stats['relogins'] += 1
+            self.save_session()
+        return result
+
+    def _renew(self, endpoint: str, generation: int, reason: str) -> bool:
+        if reason == 'csrf' or self.user_session is None or endpoint in self.session_endpoints:
+            return super()._renew(endpoint, generation, reason)
+        with self._renew_lock:
+            if self.session_generation == generation:
+                _LOGGER.info('Modem session expired (%s on %s), logging in again', reason, endpoint)
+                self.relogin()
+        return True
+
+    def save_session(self) -> None:
+        """
+        Save the current session cookies and CSRF tokens to session_file, if any
+        """
+        if self.session_store is None:
+            return
+        try:
+            self.session_store.save(
+                self.url,
+                self._username,
+                self.requests_session.cookies,
+                self.request_verification_tokens,
+            )
+        except OSError as e:
+            _LOGGER.warning('Failed to save session to %s: %s', self.session_store.path, e)
+
     def close(self) -> None:
-        if self.user_session:
+        if self.user_session and self.session_store is not None:
+            # Keep the modem session alive for the next process
+            self.save_session()
+        elif self.user_session:
             try:
                 self.user_session.close()
             except:  # noqa: E722
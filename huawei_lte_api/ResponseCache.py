@@ -0,0 +1,75 @@
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# TTL policies used by ApiGroup methods (seconds)
+FIRMWARE_TTL = 3600.0  # config/*.xml, public key, supported modes: fixed by the firmware
+DEVICE_TTL = 300.0  # device information: changes only with work mode or SIM
+
+CacheKey = Tuple[str, str]
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache of GET responses, keyed by (prefix, endpoint).
+
+    Values are deep-copied on the way in and out, so callers may mutate
+    what they get back without corrupting the cache.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data = {}  # type: Dict[CacheKey, Tuple[Any, float]]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > self._clock():
+                self.hits += 1
+                value = entry[0]
+            else:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return False, None
+        return True, copy.deepcopy(value)
+
+    def put(self, key: CacheKey, value: Any, ttl: float) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (value, self._clock() + ttl)
+
+    def invalidate(self, endpoint: Optional[str] = None) -> int:
+        """
+        Drop cached responses related to endpoint, i.e. sharing its first
+        path segment under any prefix ('net/net-mode' drops 'net/net-mode-list').
+        Drops everything when endpoint is None.
+        """
+        with self._lock:
+            if endpoint is None:
+                keys = list(self._data)
+            else:
+                segment = endpoint.strip('/').split('/', 1)[0]
+                keys = [key for key in self._data if key[1].strip('/').split('/', 1)[0] == segment]
+            for key in keys:
+                del self._data[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'size': len(self._data),
+            }
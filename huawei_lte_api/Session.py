@@ -1,14 +1,18 @@
-from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import json
 import logging
 import re
+import threading
+import time
 import urllib.parse
 from types import TracebackType
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, Type, cast
+from typing import Any, Callable, ContextManager, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, TypeVar, \
+    Union, Type, cast
 from urllib.parse import urlparse, urlunparse
 
 import requests
-import xmltodict
+from requests.adapters import HTTPAdapter
 
 from huawei_lte_api.enums.client import ResponseCodeEnum
 from huawei_lte_api.exceptions import \
@@ -19,21 +23,37 @@ from huawei_lte_api.exceptions import \
     ResponseErrorLoginCsrfException, \
     ResponseErrorWrongSessionToken, \
     RequestFormatException
+from huawei_lte_api.ResponseCache import ResponseCache
+from huawei_lte_api.TokenPool import TokenPool
 from huawei_lte_api.Tools import Tools
+from huawei_lte_api.XmlCodec import XmlCodec
 
 _LOGGER = logging.getLogger(__name__)
 
 T = TypeVar("T")
 GetResponseType = Dict[str, Any]
 SetResponseType = str
+# Endpoint for get_many: 'device/signal', ('lan/config.xml', params, 'config')
+# or ('lan/config.xml', params, 'config', cache_ttl)
+EndpointSpec = Union[str, Tuple[str, Optional[dict], str], Tuple[str, Optional[dict], str, Optional[float]]]
 
 
 def _try_or_reload_and_retry(fn: Callable[..., T]) -> Callable[..., T]:
     def wrapped(*args: Any, **kw: Any) -> T:
+        session = args[0]
+        endpoint = args[1] if len(args) > 1 else kw.get('endpoint', '')
+        generation = session.session_generation
+        if session.idle_timeout is not None and session.idle_time >= session.idle_timeout:
+            if session._renew(endpoint, generation, 'idle'):
+                generation = session.session_generation
         try:
             return fn(*args, **kw)
         except ResponseErrorLoginCsrfException:
-            args[0].reload()
+            session._renew(endpoint, generation, 'csrf')
+            return fn(*args, **kw)
+        except ResponseErrorLoginRequiredException:
+            if not session._renew(endpoint, generation, 'login'):
+                raise
             return fn(*args, **kw)
 
 
@@ -41,23 +61,49 @@ def _try_or_reload_and_retry(fn: Callable[..., T]) -> Callable[..., T]:
 
 
 class Session:
-    encryption_key = None
     csrf_re = re.compile(r'name="csrf_token"\s+content="(\S+)"')
-    request_verification_tokens = []  # type: List[str]
+    # Endpoints managing the session itself: never renewed on idle or login errors, to avoid loops
+    session_endpoints = (
+        'user/login',
+        'user/logout',
+        'user/state-login',
+        'user/heartbeat',
+        'webserver/token',
+        'webserver/SesTokInfo',
+    )
 
     def __init__(self,
                  url: str,
                  timeout: Union[float, Tuple[float, float], None] = None,
-                 requests_session: Optional[requests.Session] = None
+                 requests_session: Optional[requests.Session] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 thread_safe: bool = False,
+                 idle_timeout: Optional[float] = None,
                  ):
-
-        # Auth info embedded in the URL may reportedly cause problems, strip it
-        parsed_url = urlparse(url)
-        clear_url = urlunparse((
-            parsed_url.scheme,
-            parsed_url.netloc.rpartition("@")[-1],
-            *parsed_url[2:]
-        ))
+        """
+        :param response_cache: cache for GET endpoints declaring a cache_ttl; None disables caching
+        :param thread_safe: allow sharing the session between threads: POSTs and reloads are serialized so
+                            each one-time CSRF token is used once, and a token is fetched when none is left
+        :param idle_timeout: renew the session before a request when nothing succeeded for this many seconds,
+                             e.g. the modem's own session timeout; None to renew only after an error
+        """
+        self.response_cache = response_cache
+        self.csrf_tokens = TokenPool()
+        self.thread_safe = thread_safe
+        self.idle_timeout = idle_timeout
+        self._post_lock = threading.RLock() if thread_safe else contextlib.nullcontext()  # type: ContextManager[Any]
+        # Single-flight guard: concurrent callers failing on the same session renew it once
+        self._renew_lock = threading.RLock()
+        # Incremented on every reload, so a failed request can tell whether the session was renewed since
+        self.session_generation = 0
+        # time.monotonic() of the last successful exchange with the modem
+        self.last_success = None  # type: Optional[float]
+        self.stats = {'reloads': 0, 'relogins': 0}
+        # Encryption parameters, fetched on first encrypted request and kept until reload or login change
+        self.encryption_key = None  # type: Optional[dict]
+        self._rsa_padding = None  # type: Optional[int]
+        # Connections the HTTP pool holds per host, requests' default until get_many needs more
+        self._pool_size = 10
 
         if requests_session:
             self.requests_session = requests_session
@@ -66,9 +112,7 @@ class Session:
             self.requests_session = requests.Session()
             self._custom_requests_session = False
 
-        if not clear_url.endswith('/'):
-            clear_url += '/'
-        self.url = clear_url
+        self.url = self._clean_url(url)
         self.timeout = timeout
 
         # Try catch to close session correctly when _initialize_csrf_tokens_and_session fails
@@ -79,34 +123,116 @@ class Session:
                 self.requests_session.close()
             raise
 
+    @property
+    def request_verification_tokens(self) -> List[str]:
+        """
+        Copy of the CSRF tokens currently held, see csrf_tokens
+        """
+        return self.csrf_tokens.snapshot()
+
+    @request_verification_tokens.setter
+    def request_verification_tokens(self, tokens: List[str]) -> None:
+        self.csrf_tokens.reset(tokens)
+
+    @property
+    def idle_time(self) -> float:
+        """
+        Seconds since the last successful exchange with the modem
+        """
+        return 0.0 if self.last_success is None else time.monotonic() - self.last_success
+
     def reload(self) -> None:
-        self._initialize_csrf_tokens_and_session()
+        with self._post_lock:
+            if self.response_cache is not None:
+                self.response_cache.clear()
+            self._initialize_csrf_tokens_and_session()
+            self.stats['reloads'] += 1
+
+    def _renew(self, endpoint: str, generation: int, reason: str) -> bool:
+        """
+        Renew the session after an error or a long idle period; concurrent callers renew it once
+        :param endpoint: endpoint about to be (re)tried
+        :param generation: session_generation seen before the failed request
+        :param reason: 'csrf', 'login' or 'idle'
+        :return: True when the session was renewed, or already renewed by another caller
+        """
+        if reason == 'login' or (reason == 'idle' and endpoint in self.session_endpoints):
+            # No credentials to log in with
+            return False
+        with self._renew_lock:
+            if self.session_generation == generation:
+                _LOGGER.debug('Reloading session (%s on %s)', reason, endpoint)
+                self.reload()
+        return True
+
+    @staticmethod
+    def _clean_url(url: str) -> str:
+        # Auth info embedded in the URL may reportedly cause problems, strip it
+        parsed_url = urlparse(url)
+        clear_url = urlunparse((
+            parsed_url.scheme,
+            parsed_url.netloc.rpartition("@")[-1],
+            *parsed_url[2:]
+        ))
+        if not clear_url.endswith('/'):
+            clear_url += '/'
+        return clear_url
 
     @staticmethod
     def _create_request_xml(data: Union[dict, list, int]) -> bytes:
-        wrapped_in_request = {
-            'request': data
-        }
+        return XmlCodec.unparse_request(data)
 
-        return xmltodict.unparse(wrapped_in_request).encode('utf-8')
+    @staticmethod
+    def _encode_request_data(data: Union[dict, list, int, None], is_json: bool) -> bytes:
+        if not data:
+            return b''
+        return json.dumps(data).encode() if is_json else Session._create_request_xml(data)
+
+    @staticmethod
+    def _post_headers(is_encrypted: bool) -> Dict[str, str]:
+        if is_encrypted:
+            return {
+                'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8;enc',
+                'encrypt_transmit': 'encrypt_transmit',
+            }
+        return {'Content-Type': 'application/xml'}
+
+    @staticmethod
+    def _store_response_tokens(tokens: TokenPool, headers: Mapping[str, str], refresh_csrf: bool) -> None:
+        """
+        Keep the CSRF tokens a POST response hands out for the next POSTs
+        """
+        if refresh_csrf:
+            tokens.reset()
+
+        if '__RequestVerificationTokenone' in headers:
+            new_tokens = [headers['__RequestVerificationTokenone']]
+            if '__RequestVerificationTokentwo' in headers:
+                new_tokens.append(headers['__RequestVerificationTokentwo'])
+            tokens.add(new_tokens)
+        elif '__RequestVerificationToken' in headers:
+            tokens.add([headers['__RequestVerificationToken']])
+        else:
+            _LOGGER.debug('Failed to get CSRF from POST response headers')
 
     @staticmethod
     def _process_response_data(response: requests.Response) -> dict:
-        data = response.content
-
-        is_json = None
-        content_type = response.headers.get('Content-Type')
-        if content_type:
-            # Weed out Content-Type parameters with EmailMessage
-            # (cgi.parse_header is deprecated as of Python 3.11)
-            msg = EmailMessage()
-            msg['Content-Type'] = content_type
-            content_type = msg.get_content_type()
-            if content_type.endswith('/json') or content_type.endswith('+json'):
-                is_json = True
-            elif content_type.endswith('/xml') or content_type.endswith('+xml'):
-                is_json = False
-            # Others are not conclusive, e.g. text/html may have JSON or XML
+        return Session._decode_response(
+            response.content,
+            response.headers.get('Content-Type'),
+            bool(response.history),
+        )
+
+    @staticmethod
+    def _decode_response(data: bytes, content_type: Optional[str], redirected: bool) -> dict:
+        """
+        :param data: response body
+        :param content_type: Content-Type header of the response
+        :param redirected: whether the response followed a redirect
+        """
+        # Content types other than JSON or XML are not conclusive,
+        # e.g. text/html may have JSON or XML
+        is_json = XmlCodec.content_type_is_json(content_type)
 
         # Resort to content sniffing if Content-Type wasn't conclusive
         if is_json is None and data and data[0:1] in (b'{', b'['):
@@ -121,9 +247,9 @@ class Session:
         # such cases, and return a generated "not supported" error
         # instead of letting the XML parse error pass through.
         try:
-            return xmltodict.parse(data, dict_constructor=dict) if data else {}
+            return XmlCodec.parse(data) if data else {}
         except:  # noqa: E722
-            if response.history:
+            if redirected:
                 return {'error': {'code': ResponseCodeEnum.ERROR_SYSTEM_NO_SUPPORT, 'message': ''}}
             raise
 
@@ -166,26 +292,31 @@ class Session:
 
     def _initialize_csrf_tokens_and_session(self) -> None:
         # Reset
-        self.request_verification_tokens = []
+        self.csrf_tokens.reset()
+        self._reset_encryption()
 
         # Lets try to parse csrf_token from homepage html head meta[name="csrf_token"]
         response = self.requests_session.get(self.url, timeout=self.timeout)
+        self.session_generation += 1
+        self.last_success = time.monotonic()
 
         csrf_tokens = self.csrf_re.findall(response.content.decode('UTF-8'))
         if csrf_tokens:
-            self.request_verification_tokens = csrf_tokens
+            self.csrf_tokens.reset(csrf_tokens)
         else:
             # If we did not find anything in HTML, lets try to ask API for it
             token = self._get_token()
             if token is not None:
-                self.request_verification_tokens.append(token)
+                self.csrf_tokens.add([token])
 
     def _build_final_url(self, endpoint: str, prefix: str = 'api') -> str:
         return urllib.parse.urljoin(self.url + '{}/'.format(prefix), endpoint)
 
     def _encrypt_data(self, data: bytes) -> bytes:
-        rsa_padding = self._get_rsa_padding()
-        pubkey_data = self._get_encryption_key()
+        return self._encrypt_with_key(self._get_encryption_key(), data, self._get_rsa_padding())
+
+    @staticmethod
+    def _encrypt_with_key(pubkey_data: dict, data: bytes, rsa_padding: int) -> bytes:
         rsa_e = pubkey_data.get('encpubkeye')
         rsa_n = pubkey_data.get('encpubkeyn')
         if not rsa_n or not rsa_e:
@@ -217,10 +348,45 @@ class Session:
                  is_json: bool = False,
                  ) -> SetResponseType:
         _LOGGER.debug("Sending XML request to endpoint %s: %s", endpoint, data)
-        response = cast(
-            SetResponseType,
-            self._post(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json)
-        )
+        return self._post_set(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json)
+
+    def post_set_with_token(self,
+                            endpoint: str,
+                            build_data: Callable[[Optional[str]], dict],
+                            refresh_csrf: bool = False,
+                            prefix: str = 'api',
+                            ) -> SetResponseType:
+        """
+        POST data depending on the CSRF token it is sent with, e.g. a login password hashed with that token
+        :param build_data: called with the token, None when there is none; a thread safe session calls it with
+                           the POST lock held so that no other request uses the token first, and a retry calls it
+                           again with the new token
+        """
+        _LOGGER.debug("Sending XML request to endpoint %s", endpoint)
+        return self._post_set(endpoint, None, refresh_csrf, prefix, False, False, build_data)
+
+    def _post_set(self,
+                  endpoint: str,
+                  data: Union[dict, list, int, None],
+                  refresh_csrf: bool,
+                  prefix: str,
+                  is_encrypted: bool,
+                  is_json: bool,
+                  build_data: Optional[Callable[[Optional[str]], dict]] = None,
+                  ) -> SetResponseType:
+        if endpoint in ('user/login', 'user/logout'):
+            # Public key and padding may differ between login states
+            self._reset_encryption()
+        try:
+            response = cast(
+                SetResponseType,
+                self._post(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json, build_data)
+            )
+        finally:
+            # After the POST, even a failed one: a GET running concurrently could otherwise
+            # cache the old state again before the modem applied the change
+            if self.response_cache is not None:
+                self.response_cache.invalidate(endpoint)
         _LOGGER.debug("Received XML response from endpoint %s: %s", endpoint, response)
         return response
 
@@ -232,26 +398,38 @@ class Session:
               prefix: str = 'api',
               is_encrypted: bool = False,
               is_json: bool = False,
+              build_data: Optional[Callable[[Optional[str]], dict]] = None,
               ) -> Union[GetResponseType, SetResponseType]:
+        with self._post_lock:
+            return self._post_locked(endpoint, data, refresh_csrf, prefix, is_encrypted, is_json, build_data)
 
-        headers = {}
-
-        if is_encrypted:
-            headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=UTF-8;enc'
-            headers['encrypt_transmit'] = 'encrypt_transmit'
-        else:
-            headers['Content-Type'] = 'application/xml'
-
-        if self.request_verification_tokens:
-            if len(self.request_verification_tokens) > 1:
-                headers['__RequestVerificationToken'] = self.request_verification_tokens.pop(0)
-            else:
-                headers['__RequestVerificationToken'] = self.request_verification_tokens[0]
-
-        if data:
-            data_encoded = json.dumps(data).encode() if is_json else self._create_request_xml(data)
-        else:
-            data_encoded = b''
+    def _next_post_token(self) -> Optional[str]:
+        token = self.csrf_tokens.take()
+        if token is None and self.thread_safe:
+            # Ran out of one-time tokens: fetch one rather than failing with a CSRF error
+            token = self._get_token()
+            if token is not None:
+                self.csrf_tokens.prefetched(token)
+        return token
+
+    def _post_locked(self,
+                     endpoint: str,
+                     data: Union[dict, list, int, None],
+                     refresh_csrf: bool,
+                     prefix: str,
+                     is_encrypted: bool,
+                     is_json: bool,
+                     build_data: Optional[Callable[[Optional[str]], dict]] = None,
+                     ) -> Union[GetResponseType, SetResponseType]:
+        headers = self._post_headers(is_encrypted)
+
+        token = self._next_post_token()
+        if token is not None:
+            headers['__RequestVerificationToken'] = token
+        if build_data is not None:
+            data = build_data(token)
+
+        data_encoded = self._encode_request_data(data, is_json)
         response = self.requests_session.post(
             self._build_final_url(endpoint, prefix),
             data=self._encrypt_data(data_encoded) if is_encrypted else data_encoded,
@@ -260,19 +438,10 @@ class Session:
         )
         response.raise_for_status()
 
-        if refresh_csrf:
-            self.request_verification_tokens = []
-
-        if '__RequestVerificationTokenone' in response.headers:
-            self.request_verification_tokens.append(response.headers['__RequestVerificationTokenone'])
-            if '__RequestVerificationTokentwo' in response.headers:
-                self.request_verification_tokens.append(response.headers['__RequestVerificationTokentwo'])
-        elif '__RequestVerificationToken' in response.headers:
-            self.request_verification_tokens.append(response.headers['__RequestVerificationToken'])
-        else:
-            _LOGGER.debug('Failed to get CSRF from POST response headers')
+        self._store_response_tokens(self.csrf_tokens, response.headers, refresh_csrf)
 
         response_data = cast(str, self._check_response_status(self._process_response_data(response)))
+        self.last_success = time.monotonic()
 
         return response_data
 
@@ -283,26 +452,53 @@ class Session:
                   prefix: str = 'api',
                   ) -> str:
 
-        if self.request_verification_tokens:
-            if data is None:
-                data = {}
-            data['csrf_token'] = self.request_verification_tokens[0]
+        if self.response_cache is not None:
+            self.response_cache.clear()
 
-        response = self.requests_session.post(
-            self._build_final_url(endpoint, prefix),
-            files=files,
-            data=data,
-            timeout=self.timeout
-        )
+        with self._post_lock:
+            token = self.csrf_tokens.first()
+            if token is not None:
+                if data is None:
+                    data = {}
+                data['csrf_token'] = token
+
+            response = self.requests_session.post(
+                self._build_final_url(endpoint, prefix),
+                files=files,
+                data=data,
+                timeout=self.timeout
+            )
         response.raise_for_status()
 
         return response.content.decode('UTF-8').lower()
 
+    def get(self,
+            endpoint: str,
+            params: Optional[dict] = None,
+            prefix: str = 'api',
+            cache_ttl: Optional[float] = None,
+            ) -> dict:
+        """
+        :param cache_ttl: seconds the response may be served from response_cache, if the session has one
+        """
+        if cache_ttl is None or self.response_cache is None or params is not None:
+            return self._get_with_retry(endpoint, params, prefix)
+        hit, value = self.response_cache.get((prefix, endpoint))
+        if hit:
+            return cast(dict, value)
+        response = self._get_with_retry(endpoint, params, prefix)
+        self.response_cache.put((prefix, endpoint), response, cache_ttl)
+        return response
+
     @_try_or_reload_and_retry
-    def get(self, endpoint: str, params: Optional[dict] = None, prefix: str = 'api') -> dict:
+    def _get_with_retry(self, endpoint: str, params: Optional[dict] = None, prefix: str = 'api') -> dict:
+        return self._get(endpoint, params, prefix)
+
+    def _get(self, endpoint: str, params: Optional[dict] = None, prefix: str = 'api') -> dict:
         headers = {}
-        if len(self.request_verification_tokens) == 1:
-            headers['__RequestVerificationToken'] = self.request_verification_tokens[0]
+        token = self.csrf_tokens.single()
+        if token is not None:
+            headers['__RequestVerificationToken'] = token
 
         response = self.requests_session.get(
             self._build_final_url(endpoint, prefix),
@@ -311,26 +507,113 @@ class Session:
             timeout=self.timeout,
         )
 
-        return cast(dict, self._check_response_status(self._process_response_data(response)))
+        response_data = cast(dict, self._check_response_status(self._process_response_data(response)))
+        self.last_success = time.monotonic()
+        return response_data
+
+    @staticmethod
+    def _endpoint_spec(spec: EndpointSpec) -> Tuple[str, Optional[dict], str, Optional[float]]:
+        if isinstance(spec, str):
+            return spec, None, 'api', None
+        if len(spec) == 3:
+            endpoint, params, prefix = spec
+            return endpoint, params, prefix, None
+        return spec
+
+    def _ensure_pool_size(self, size: int) -> None:
+        """Make sure the HTTP connection pool can hold `size` concurrent connections."""
+        if self._custom_requests_session or size <= self._pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        self.requests_session.mount(urlparse(self.url).scheme + '://', adapter)
+        self._pool_size = size
+
+    def get_many(self,
+                 endpoints: Union[Iterable[str], Mapping[Hashable, EndpointSpec]],
+                 max_workers: int = 8,
+                 ) -> Dict[Hashable, Union[GetResponseType, Exception]]:
+        """
+        Fetch several read-only endpoints concurrently.
+
+        GET requests do not consume CSRF tokens, so they can share the current
+        token. Endpoints failing with a CSRF or login-required error trigger a
+        single session renewal, after which they are retried once.
+
+        :param endpoints: endpoint paths, or a mapping of result key to endpoint
+                          path or (endpoint, params, prefix) tuple
+        :param max_workers: maximum number of requests in flight
+        :return: result per key; failed endpoints map to the raised exception
+        """
+        if isinstance(endpoints, Mapping):
+            specs = dict(endpoints)
+        else:
+            specs = {endpoint: endpoint for endpoint in endpoints}
+        if not specs:
+            return {}
+
+        def fetch(spec: EndpointSpec) -> Union[GetResponseType, Exception]:
+            endpoint, params, prefix, cache_ttl = self._endpoint_spec(spec)
+            cache = self.response_cache if cache_ttl is not None and params is None else None
+            if cache is not None:
+                hit, value = cache.get((prefix, endpoint))
+                if hit:
+                    return cast(GetResponseType, value)
+            try:
+                response = self._get(endpoint, params, prefix)
+            except Exception as e:  # pylint: disable=broad-except
+                return e
+            if cache is not None and cache_ttl is not None:
+                cache.put((prefix, endpoint), response, cache_ttl)
+            return response
+
+        def run(keys: List[Hashable]) -> Dict[Hashable, Union[GetResponseType, Exception]]:
+            workers = max(1, min(max_workers, len(keys)))
+            self._ensure_pool_size(workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='huawei-lte-get') as executor:
+                return dict(zip(keys, executor.map(fetch, [specs[key] for key in keys])))
+
+        generation = self.session_generation
+        results = run(list(specs))
+        csrf_failed = [key for key, value in results.items() if isinstance(value, ResponseErrorLoginCsrfException)]
+        login_failed = [key for key, value in results.items() if isinstance(value, ResponseErrorLoginRequiredException)]
+        if login_failed and self._renew(self._endpoint_spec(specs[login_failed[0]])[0], generation, 'login'):
+            results.update(run(csrf_failed + login_failed))
+        elif csrf_failed:
+            _LOGGER.debug('CSRF error on %s, reloading session', csrf_failed)
+            self._renew(self._endpoint_spec(specs[csrf_failed[0]])[0], generation, 'csrf')
+            results.update(run(csrf_failed))
+        return results
 
     def _get_token(self) -> Optional[str]:
+        # Plain _get: this runs with the POST lock held, a retry would take the renew lock after it
         try:
-            data = self.get('webserver/token')
+            data = self._get('webserver/token')
             return data['token']
         except ResponseErrorNotSupportedException:
             try:
-                data = self.get('webserver/SesTokInfo')
+                data = self._get('webserver/SesTokInfo')
                 return data['TokInfo']
             except ResponseErrorNotSupportedException:
                 return None
 
+    def _reset_encryption(self) -> None:
+        self.encryption_key = None
+        self._rsa_padding = None
+
     def _get_encryption_key(self) -> dict:
-        if not self.encryption_key:
-            self.encryption_key = self.get('webserver/publickey')
-        return self.encryption_key
+        encryption_key = self.encryption_key
+        if not encryption_key:
+            encryption_key = self.encryption_key = self.get('webserver/publickey')
+        return encryption_key
 
     def _get_rsa_padding(self) -> int:
-        state_login = self.get('user/state-login')
+        rsa_padding = self._rsa_padding
+        if rsa_padding is None:
+            rsa_padding = self._rsa_padding = self._rsa_padding_from_state(self.get('user/state-login'))
+        return rsa_padding
+
+    @staticmethod
+    def _rsa_padding_from_state(state_login: dict) -> int:
         return int(state_login['rsapadingtype']) if 'rsapadingtype' in state_login else 0
 
     def close(self) -> None:
@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    Persists a logged-in modem session (cookies and CSRF tokens) to a local file,
+    so a new process can resume it instead of logging in again.
+
+    The file holds a live session cookie: it is written with 0600 permissions.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, url: str, username: str) -> Optional[Dict[str, Any]]:
+        """
+        :param url: modem URL the session must have been saved for
+        :param username: user the session must have been saved for
+        :return: saved state, or None if missing, unreadable or saved for another modem/user
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _LOGGER.warning('Ignoring unreadable session file %s: %s', self.path, e)
+            return None
+        if not isinstance(state, dict) or state.get('url') != url or state.get('username') != username:
+            return None
+        return state
+
+    def save(self, url: str, username: str, cookies: requests.cookies.RequestsCookieJar, tokens: List[str]) -> None:
+        state = {
+            'url': url,
+            'username': username,
+            'saved_at': time.time(),
+            'cookies': [
+                {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path}
+                for cookie in cookies
+            ],
+            'tokens': list(tokens),
+        }
+        # Write to a private temporary file, then atomically replace
+        tmp_path = '{}.tmp'.format(self.path)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def restore(self, state: Dict[str, Any], cookies: requests.cookies.RequestsCookieJar) -> List[str]:
+        """
+        Put saved cookies into a cookie jar
+        :return: saved CSRF tokens
+        """
+        for cookie in state.get('cookies', []):
+            cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        return [str(token) for token in state.get('tokens', [])]
+
+    def clear(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
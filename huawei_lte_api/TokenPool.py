@@ -0,0 +1,88 @@
+import collections
+import threading
+from typing import Deque, Dict, Iterable, List, Optional
+
+
+class TokenPool:
+    """
+    Per-session store of CSRF (__RequestVerificationToken) tokens.
+
+    Depending on the firmware, the modem either hands out one long-lived token
+    (from the home page or webserver/token), or a fresh one-time token with every
+    POST response (two of them, __RequestVerificationTokenone/two, after login).
+    One-time tokens are consumed in order; the last one is kept and reused, as
+    the web UI does.
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self._tokens = collections.deque(tokens)  # type: Deque[str]
+        self._lock = threading.Lock()
+        self._stats = {
+            'taken': 0,
+            'reused': 0,
+            'received': 0,
+            'exhausted': 0,
+            'prefetched': 0,
+            'resets': 0,
+        }
+
+    def reset(self, tokens: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._tokens.extend(tokens)
+            self._stats['resets'] += 1
+
+    def add(self, tokens: Iterable[str]) -> None:
+        with self._lock:
+            for token in tokens:
+                self._tokens.append(token)
+                self._stats['received'] += 1
+
+    def take(self) -> Optional[str]:
+        """
+        Token for the next POST: consumes it unless it is the last one
+        :return: token, None when the pool is empty
+        """
+        with self._lock:
+            if len(self._tokens) > 1:
+                self._stats['taken'] += 1
+                return self._tokens.popleft()
+            if self._tokens:
+                self._stats['reused'] += 1
+                return self._tokens[0]
+            self._stats['exhausted'] += 1
+            return None
+
+    def first(self) -> Optional[str]:
+        with self._lock:
+            return self._tokens[0] if self._tokens else None
+
+    def single(self) -> Optional[str]:
+        """
+        The token when exactly one is held (GET requests send it only then)
+        """
+        with self._lock:
+            return self._tokens[0] if len(self._tokens) == 1 else None
+
+    def prefetched(self, token: str) -> None:
+        """
+        Record a token fetched because the pool ran dry
+        """
+        with self._lock:
+            self._tokens.append(token)
+            self._stats['prefetched'] += 1
+
+    def snapshot(self) -> List[str]:
+        with self._lock:
+            return list(self._tokens)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tokens)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            data = dict(self._stats)
+            data['available'] = len(self._tokens)
+            return data
@@ -1,5 +1,6 @@
 import datetime
-from typing import Optional, Tuple, Iterator, TypeVar, Iterable
+import functools
+from typing import Any, Optional, Tuple, Iterator, TypeVar, Iterable
 
 from binascii import hexlify
 import math
@@ -33,10 +34,12 @@ class Tools:
         return data
 
     @staticmethod
-    def rsa_encrypt(rsa_e: str, rsa_n: str, data: bytes, rsa_padding: int = 0) -> bytes:
-        b64data = base64.b64encode(data)
-        pubkey = construct((int(rsa_n, 16), int(rsa_e, 16)))
-
+    @functools.lru_cache(maxsize=8)
+    def rsa_cipher(rsa_e: str, rsa_n: str, rsa_padding: int = 0) -> Tuple[Any, int]:
+        """
+        Build the cipher for a modem public key, cached per (key, padding)
+        :return: cipher object and plaintext block size
+        """
         cipher_module = {
             0: PKCS1_v1_5,
             1: PKCS1_OAEP
@@ -50,7 +53,13 @@ class Tools:
         if not cipher_module or not num:
             raise ValueError('Unknown rsa_padding value {}'.format(rsa_padding))
 
-        cipher = cipher_module.new(pubkey)
+        pubkey = construct((int(rsa_n, 16), int(rsa_e, 16)))
+        return cipher_module.new(pubkey), num
+
+    @staticmethod
+    def rsa_encrypt(rsa_e: str, rsa_n: str, data: bytes, rsa_padding: int = 0) -> bytes:
+        b64data = base64.b64encode(data)
+        cipher, num = Tools.rsa_cipher(rsa_e, rsa_n, rsa_padding)
 
         blocks = int(math.ceil(len(b64data) / float(num)))
         result_chunks = []
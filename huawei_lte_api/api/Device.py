@@ -1,5 +1,6 @@
 import warnings
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import DEVICE_TTL
 from huawei_lte_api.Session import GetResponseType, SetResponseType
 from huawei_lte_api.enums.device import AntennaTypeEnum, ControlModeEnum, ModeEnum
 
@@ -16,7 +17,7 @@ class Device(ApiGroup):
         >>> info = device.information()
         >>> print(info)
         """
-        return self._session.get('device/information')
+        return self._session.get('device/information', cache_ttl=DEVICE_TTL)
 
     def autorun_version(self) -> GetResponseType:
         """
@@ -2,6 +2,7 @@ from collections import OrderedDict
 from typing import Union
 
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType, SetResponseType
 from huawei_lte_api.enums.net import NetworkModeEnum
 
@@ -133,7 +134,7 @@ class Net(ApiGroup):
         >>> net_mode_list = net.net_mode_list()
         >>> print(net_mode_list)
         """
-        return self._session.get('net/net-mode-list')
+        return self._session.get('net/net-mode-list', cache_ttl=FIRMWARE_TTL)
 
     def plmn_list(self) -> GetResponseType:
         """
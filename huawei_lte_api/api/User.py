@@ -23,9 +23,18 @@ DEFAULT_USERNAME = 'admin'
 
 
 class UserSession:
-    def __init__(self, session: Session, username: str = DEFAULT_USERNAME, password: Optional[str] = None):
+    def __init__(self,
+                 session: Session,
+                 username: str = DEFAULT_USERNAME,
+                 password: Optional[str] = None,
+                 login: bool = True,
+                 ):
+        """
+        :param login: False when session is already logged in, e.g. resumed from a SessionStore
+        """
         self.user = User(session)
-        self.user.login(username, password, True)
+        if login:
+            self.user.login(username, password, True)
 
     def close(self) -> None:
         try:
@@ -65,7 +74,11 @@ class User(ApiGroup):
 
         raise ResponseErrorException(message="Tries exhausted", code=0)
 
-    def _encode_password(self, username: str, password: Optional[str], password_type: PasswordTypeEnum = PasswordTypeEnum.BASE_64) -> bytes:
+    def _encode_password(self, username: str, password: Optional[str], password_type: PasswordTypeEnum = PasswordTypeEnum.BASE_64,
+                         token: Optional[str] = None) -> bytes:
+        """
+        :param token: CSRF token the login request is sent with, the first token held when None
+        """
         if not password:
             return b''
 
@@ -73,20 +86,24 @@ class User(ApiGroup):
             concentrated = b''.join([
                 username.encode('UTF-8'),
                 base64.b64encode(hashlib.sha256(password.encode('UTF-8')).hexdigest().encode('ascii')),
-                self._session.request_verification_tokens[0].encode('UTF-8')
+                (self._session.request_verification_tokens[0] if token is None else token).encode('UTF-8')
             ])
             return base64.b64encode(hashlib.sha256(concentrated).hexdigest().encode('ascii'))
 
         return base64.b64encode(password.encode('UTF-8'))
 
     def _login(self, username: str, password: Optional[str], password_type: PasswordTypeEnum = PasswordTypeEnum.BASE_64) -> bool:
-        password_encoded = self._encode_password(username, password, password_type)
-        try:
-            result = self._session.post_set('user/login', {
+        def build_data(token: Optional[str]) -> dict:
+            # The SHA256 password is hashed with the CSRF token the login request is sent with
+            password_encoded = self._encode_password(username, password, password_type, token or '')
+            return {
                 'Username': username,
                 'Password': password_encoded.decode('UTF-8'),
                 'password_type': password_type.value
-            }, refresh_csrf=True)
+            }
+
+        try:
+            result = self._session.post_set_with_token('user/login', build_data, refresh_csrf=True)
         except ResponseErrorException as e:
             error_code_to_message = {
                 LoginErrorEnum.USERNAME_WRONG.value: 'Username wrong',
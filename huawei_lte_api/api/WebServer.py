@@ -1,10 +1,11 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class WebServer(ApiGroup):
     def publickey(self) -> GetResponseType:
-        return self._session.get('webserver/publickey')
+        return self._session.get('webserver/publickey', cache_ttl=FIRMWARE_TTL)
 
     def token(self) -> GetResponseType:
         return self._session.get('webserver/token')
@@ -1,7 +1,8 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class Device(ApiGroup):
     def config(self) -> GetResponseType:
-        return self._session.get('device/config.xml', prefix='config')
+        return self._session.get('device/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
@@ -1,8 +1,9 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class DeviceInformation(ApiGroup):
     def config(self) -> GetResponseType:
         return self._session.get(
-            'deviceinformation/config.xml', prefix='config')
+            'deviceinformation/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
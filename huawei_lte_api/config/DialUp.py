@@ -1,16 +1,17 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class DialUp(ApiGroup):
     def config(self) -> GetResponseType:
-        return self._session.get('dialup/config.xml', prefix='config')
+        return self._session.get('dialup/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def connectmode(self) -> GetResponseType:
-        return self._session.get('dialup/connectmode.xml', prefix='config')
+        return self._session.get('dialup/connectmode.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def profileswitch(self) -> GetResponseType:
-        return self._session.get('dialup/profileswitch.xml', prefix='config')
+        return self._session.get('dialup/profileswitch.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def lmt_auto_mode_disconnect(self) -> GetResponseType:
-        return self._session.get('dialup/lmt_auto_mode_disconnect.xml', prefix='config')
+        return self._session.get('dialup/lmt_auto_mode_disconnect.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
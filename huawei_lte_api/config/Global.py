@@ -1,13 +1,14 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class Global(ApiGroup):
     def languagelist(self) -> GetResponseType:
-        return self._session.get('global/languagelist.xml', prefix='config')
+        return self._session.get('global/languagelist.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def config(self) -> GetResponseType:
-        return self._session.get('global/config.xml', prefix='config')
+        return self._session.get('global/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def net_type(self) -> GetResponseType:
-        return self._session.get('global/net-type.xml', prefix='config')
+        return self._session.get('global/net-type.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
@@ -1,19 +1,20 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class Network(ApiGroup):
     def net_mode(self) -> GetResponseType:
-        return self._session.get('network/net-mode.xml', prefix='config')
+        return self._session.get('network/net-mode.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def networkmode(self) -> GetResponseType:
-        return self._session.get('network/networkmode.xml', prefix='config')
+        return self._session.get('network/networkmode.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def config(self) -> GetResponseType:
-        return self._session.get('network/config.xml', prefix='config')
+        return self._session.get('network/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def networkband_null(self) -> GetResponseType:
-        return self._session.get('network/networkband_null.xml', prefix='config')
+        return self._session.get('network/networkband_null.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def set_only_4g(self) -> GetResponseType:
-        return self._session.get('network/setOnly4g.xml', prefix='config')
+        return self._session.get('network/setOnly4g.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
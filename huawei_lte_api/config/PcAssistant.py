@@ -1,10 +1,11 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class PcAssistant(ApiGroup):
     def config(self) -> GetResponseType:
-        return self._session.get('pcassistant/config.xml', prefix='config')
+        return self._session.get('pcassistant/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def updateautorun(self) -> GetResponseType:
-        return self._session.get('pcassistant/updateautorun.xml', prefix='config')
+        return self._session.get('pcassistant/updateautorun.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
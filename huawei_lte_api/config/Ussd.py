@@ -1,10 +1,11 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class Ussd(ApiGroup):
     def prepaidussd(self) -> GetResponseType:
-        return self._session.get('ussd/prepaidussd.xml', prefix='config')
+        return self._session.get('ussd/prepaidussd.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def postpaidussd(self) -> GetResponseType:
-        return self._session.get('ussd/postpaidussd.xml', prefix='config')
+        return self._session.get('ussd/postpaidussd.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
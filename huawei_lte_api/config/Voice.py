@@ -1,10 +1,11 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class Voice(ApiGroup):
     def config(self) -> GetResponseType:
-        return self._session.get('voice/config.xml', prefix='config')
+        return self._session.get('voice/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def country(self) -> GetResponseType:
-        return self._session.get('voice/country.xml', prefix='config')
+        return self._session.get('voice/country.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
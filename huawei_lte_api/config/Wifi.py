@@ -1,16 +1,17 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class Wifi(ApiGroup):
     def config(self) -> GetResponseType:
-        return self._session.get('wifi/config.xml', prefix='config')
+        return self._session.get('wifi/config.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def configure(self) -> GetResponseType:
-        return self._session.get('wifi/configure.xml', prefix='config')
+        return self._session.get('wifi/configure.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def country_channel(self) -> GetResponseType:
-        return self._session.get('wifi/countryChannel.xml', prefix='config')
+        return self._session.get('wifi/countryChannel.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
 
     def channel_auto_match_hardware(self) -> GetResponseType:
-        return self._session.get('wifi/channelAutoMatchHardware.xml', prefix='config')
+        return self._session.get('wifi/channelAutoMatchHardware.xml', prefix='config', cache_ttl=FIRMWARE_TTL)
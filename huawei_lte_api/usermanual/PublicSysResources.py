@@ -1,7 +1,8 @@
 from huawei_lte_api.ApiGroup import ApiGroup
+from huawei_lte_api.ResponseCache import FIRMWARE_TTL
 from huawei_lte_api.Session import GetResponseType
 
 
 class PublicSysResources(ApiGroup):
     def config(self) -> GetResponseType:
-        return self._session.get('public_sys-resources/config.xml', prefix='usermanual')
+        return self._session.get('public_sys-resources/config.xml', prefix='usermanual', cache_ttl=FIRMWARE_TTL)
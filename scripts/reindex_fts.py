@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sms_api.storage import Storage  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Construit ou reconstruit l'index plein texte de l'historique des SMS"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.getenv("SMS_API_DB", "sms_api.db"),
+        help="Base SQLite du serveur (défaut : SMS_API_DB ou sms_api.db)",
+    )
+    args = parser.parse_args()
+
+    storage = Storage(args.db)
+    start = time.monotonic()
+    try:
+        if not storage.rebuild_fts():
+            raise SystemExit("FTS5 indisponible dans cette version de SQLite")
+        count = storage.count_logs()
+    finally:
+        storage.close()
+    print(f"{count} entrées indexées en {time.monotonic() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
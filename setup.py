@@ -16,6 +16,9 @@ setup(
         'xmltodict',
         'pycryptodomex'
     ],
+    extras_require={
+        'async': ['aiohttp'],
+    },
     tests_require=[
         'tox'
     ],
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LookupFailed(Exception):
+    """Levée par une recherche qui n'a pas abouti (erreur, délai dépassé).
+
+    Contrairement à une valeur vide (numéro introuvable), l'échec n'est pas
+    mis en cache : la recherche suivante interroge de nouveau la source.
+    """
+
+
+class LookupCache:
+    """Cache LRU borné avec expiration, pour les recherches de numéros.
+
+    Une valeur vide (numéro introuvable) est conservée ``negative_ttl``
+    secondes seulement, afin qu'un numéro ajouté dans l'annuaire soit vite visible.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, negative_ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "negative_hits": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key):
+        """Retourne ``(trouvé, valeur)``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            value, expires = entry
+            if expires <= self._clock():
+                del self._data[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return False, None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            if not value:
+                self._stats["negative_hits"] += 1
+            return True, value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if value else self.negative_ttl
+        with self._lock:
+            self._data[key] = (value, self._clock() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_or_load(self, key, loader):
+        """Retourne la valeur en cache ou celle de ``loader()``, qui peut lever ``LookupFailed``."""
+        found, value = self.get(key)
+        if found:
+            return value
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def purge(self, namespace=None) -> int:
+        """Vide le cache, ou seulement les clés ``(namespace, ...)``."""
+        with self._lock:
+            if namespace is None:
+                count = len(self._data)
+                self._data.clear()
+                return count
+            keys = [k for k in self._data if isinstance(k, tuple) and k and k[0] == namespace]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            data.update(size=len(self._data), maxsize=self.maxsize, ttl=self.ttl, negative_ttl=self.negative_ttl)
+        return data
+
+
+__all__ = ["LookupCache", "LookupFailed"]
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class RouteBusy(Exception):
+    """Levée lorsqu'aucune place ne se libère à temps pour une catégorie de routes."""
+
+
+class RouteLimiter:
+    """Limite le nombre de requêtes simultanées par catégorie de routes.
+
+    ``limits`` associe un nom de catégorie (``"modem"``, ``"lookup"``...) à un
+    nombre maximal de requêtes en cours ; ``None`` signifie sans limite.
+    """
+
+    def __init__(self, limits=None):
+        self._limits = dict(limits or {})
+        self._lock = threading.Lock()
+        self._semaphores = {
+            kind: threading.BoundedSemaphore(limit)
+            for kind, limit in self._limits.items()
+            if limit
+        }
+        self._active = {}
+        self._waiting = {}
+
+    def _incr(self, counter, kind, delta):
+        with self._lock:
+            counter[kind] = counter.get(kind, 0) + delta
+
+    @contextmanager
+    def slot(self, kind, timeout=None):
+        semaphore = self._semaphores.get(kind)
+        if semaphore is not None:
+            self._incr(self._waiting, kind, 1)
+            try:
+                acquired = semaphore.acquire(timeout=timeout)
+            finally:
+                self._incr(self._waiting, kind, -1)
+            if not acquired:
+                raise RouteBusy(kind)
+        self._incr(self._active, kind, 1)
+        try:
+            yield
+        finally:
+            self._incr(self._active, kind, -1)
+            if semaphore is not None:
+                semaphore.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds = set(self._limits) | set(self._active) | set(self._waiting)
+            return {
+                kind: {
+                    "limit": self._limits.get(kind),
+                    "active": self._active.get(kind, 0),
+                    "waiting": self._waiting.get(kind, 0),
+                }
+                for kind in sorted(kinds)
+            }
+
+
+class SingleFlight:
+    """Regroupe les appels identiques simultanés.
+
+    Tant qu'un appel pour ``key`` est en cours, les appelants suivants
+    attendent son résultat (ou son exception) au lieu d'en relancer un.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"calls": 0, "shared": 0}
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats["calls"] += 1
+            else:
+                self.stats["shared"] += 1
+        if not leader:
+            return future.result()
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+__all__ = ["RouteBusy", "RouteLimiter", "SingleFlight"]
@@ -0,0 +1,85 @@
+import itertools
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """File d'événements d'un client ``/events``."""
+
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.closed = False
+
+    def get(self, timeout):
+        """Retourne ``(id, nom, données)``, ou ``None`` si rien n'est arrivé à temps."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroker:
+    """Diffuse les événements du serveur (compteur, SMS reçus, statuts d'envoi)
+    à tous les navigateurs abonnés.
+
+    Un client trop lent dont la file déborde est déconnecté ; son
+    ``EventSource`` se reconnecte de lui-même.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event, data):
+        with self._lock:
+            item = (next(self._ids), event, data)
+            self._published += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(item)
+            except queue.Full:
+                logger.warning("Client /events trop lent, déconnexion")
+                subscription.closed = True
+                self.unsubscribe(subscription)
+                with self._lock:
+                    self._dropped += 1
+
+    def close(self):
+        """Termine tous les flux ouverts (arrêt du serveur)."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscription in subscribers:
+            subscription.closed = True
+            try:
+                subscription.queue.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self._published,
+                "dropped": self._dropped,
+            }
+
+
+__all__ = ["EventBroker", "Subscription"]
@@ -2,6 +2,8 @@ import requests
 import logging
 from typing import Optional
 
+from .cache import LookupFailed
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,7 +16,10 @@ def get_phone_from_api(initials: str, base_url: str, api_key: Optional[str] = No
         api_key: Optionnel, clé API à envoyer dans l'en-tête ``X-API-KEY``.
 
     Returns:
-        Le numéro de téléphone ou une chaîne vide si introuvable ou en cas d'erreur.
+        Le numéro de téléphone ou une chaîne vide si introuvable.
+
+    Raises:
+        LookupFailed: l'API n'a pas répondu ou a renvoyé une erreur.
     """
     if not base_url:
         logger.warning("Aucune URL d'API fournie, recherche impossible")
@@ -29,6 +34,9 @@ def get_phone_from_api(initials: str, base_url: str, api_key: Optional[str] = No
     try:
         resp = requests.get(url, headers=headers, timeout=5)
         logger.debug("Réponse %s: %s", resp.status_code, resp.text[:200])
+        if resp.status_code == 404:
+            logger.warning("Personne inconnue de l'API pour %s", initials)
+            return ""
         resp.raise_for_status()
         data = resp.json()
         if isinstance(data, list):
@@ -39,7 +47,7 @@ def get_phone_from_api(initials: str, base_url: str, api_key: Optional[str] = No
                     return phone
     except Exception as exc:
         logger.error("Erreur lors de l'appel à l'API externe: %s", exc)
-        return ""
+        raise LookupFailed(f"API externe en erreur: {exc}") from exc
 
     logger.warning("Numéro introuvable via API pour %s", initials)
     return ""
@@ -0,0 +1,315 @@
+import asyncio
+import logging
+import random
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+from huawei_lte_api.AsyncClient import AsyncClient
+from huawei_lte_api.AsyncConnection import AsyncConnection
+
+from .storage import DEFAULT_PRAGMAS
+
+logger = logging.getLogger(__name__)
+
+# Méthodes du client relevées par défaut sur chaque modem
+DEFAULT_METRICS = (
+    "device.signal",
+    "monitoring.status",
+    "monitoring.traffic_statistics",
+    "sms.sms_count",
+)
+
+# Valeur numérique en tête de champ : "-92dBm", "8dB", "1048576"
+_NUMBER_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS samples ("
+    "ts REAL NOT NULL,"
+    "modem TEXT NOT NULL,"
+    "metric TEXT NOT NULL,"
+    "field TEXT NOT NULL,"
+    "value REAL,"
+    "text TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_samples_series ON samples(modem, metric, field, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_samples_ts ON samples(ts)",
+    "CREATE TABLE IF NOT EXISTS polls ("
+    "ts REAL NOT NULL,"
+    "modem TEXT NOT NULL,"
+    "ok INTEGER NOT NULL,"
+    "duration REAL,"
+    "error TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_polls_modem ON polls(modem, ts)",
+)
+
+
+def flatten_sample(ts, modem, metric, data):
+    """Transforme la réponse d'une méthode en lignes (ts, modem, métrique, champ, valeur, texte)."""
+    rows = []
+
+    def walk(prefix, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(f"{prefix}.{key}" if prefix else str(key), item)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                walk(f"{prefix}.{index}" if prefix else str(index), item)
+        else:
+            text = None if value is None else str(value)
+            match = _NUMBER_RE.match(text) if text is not None else None
+            rows.append((ts, modem, metric, prefix or "value", float(match.group(1)) if match else None, text))
+
+    walk("", data)
+    return rows
+
+
+class MetricStore:
+    """Série temporelle SQLite des relevés de la flotte.
+
+    Une ligne par champ relevé (valeur numérique extraite quand il y en a
+    une, texte brut sinon) et une ligne par relevé dans ``polls`` pour
+    suivre les échecs. Utilisée depuis un seul thread d'écriture.
+    """
+
+    def __init__(self, db_path, pragmas=DEFAULT_PRAGMAS):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        for name, value in pragmas:
+            self._conn.execute(f"PRAGMA {name}={value}")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def insert(self, samples, polls):
+        with self._conn:
+            self._conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?)", samples)
+            self._conn.executemany("INSERT INTO polls VALUES (?, ?, ?, ?, ?)", polls)
+
+    def prune(self, older_than) -> int:
+        """Supprime les relevés antérieurs au timestamp ``older_than``."""
+        with self._conn:
+            deleted = self._conn.execute("DELETE FROM samples WHERE ts < ?", (older_than,)).rowcount
+            self._conn.execute("DELETE FROM polls WHERE ts < ?", (older_than,))
+        return deleted
+
+    def series(self, modem, metric, field, since=0):
+        return self._conn.execute(
+            "SELECT ts, value, text FROM samples WHERE modem = ? AND metric = ? AND field = ? AND ts >= ? ORDER BY ts",
+            (modem, metric, field, since),
+        ).fetchall()
+
+    def close(self):
+        self._conn.close()
+
+
+class ModemTarget:
+    """Un modem de la flotte et l'état de son planning."""
+
+    def __init__(self, name, url, interval=60, metrics=DEFAULT_METRICS, intervals=None, username=None, password=None):
+        self.name = name
+        self.url = url
+        self.username = username
+        self.password = password
+        self.interval = interval
+        # Intervalle propre à certaines métriques, ex. {"sms.sms_count": 300}
+        self.intervals = {metric: (intervals or {}).get(metric, interval) for metric in metrics}
+        self.connection = None
+        self.failures = 0
+        self.next_due = {}
+        self.last_success = None
+        self.last_error = None
+        self.polls = 0
+
+    @classmethod
+    def from_config(cls, entry, defaults):
+        options = dict(defaults)
+        options.update(entry)
+        return cls(
+            # Nom par défaut : l'hôte, sans les identifiants éventuels de l'URL
+            options.get("name") or urlparse(options["url"]).netloc.rpartition("@")[2],
+            options["url"],
+            interval=float(options.get("interval", 60)),
+            metrics=tuple(options.get("metrics", DEFAULT_METRICS)),
+            intervals=options.get("intervals"),
+            username=options.get("username"),
+            password=options.get("password"),
+        )
+
+    def status(self):
+        now = time.monotonic()
+        return {
+            "connected": self.connection is not None,
+            "failures": self.failures,
+            "polls": self.polls,
+            "last_success_age": None if self.last_success is None else now - self.last_success,
+            "last_error": self.last_error,
+            "next_poll_in": max(0.0, min(self.next_due.values()) - now) if self.next_due else None,
+        }
+
+
+class FleetPoller:
+    """Relève périodiquement les métriques de nombreux modems depuis une seule boucle asyncio.
+
+    Chaque modem a sa coroutine et son planning (intervalle par métrique,
+    départ étalé et ``jitter`` à chaque relevé pour éviter les rafales) ;
+    au plus ``concurrency`` relevés sont en cours à la fois, chacun borné par
+    ``timeout``. Un modem en échec est reconnecté après une attente doublée
+    à chaque échec (``min_backoff`` à ``max_backoff`` secondes). Les
+    résultats sont écrits dans ``store`` par un unique thread d'écriture.
+    """
+
+    def __init__(self, targets, store, concurrency=50, timeout=10, jitter=0.1, min_backoff=5, max_backoff=600,
+                 retention=None):
+        self.targets = list(targets)
+        self.store = store
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.jitter = jitter
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        # Durée de conservation des relevés en secondes, None pour tout garder
+        self.retention = retention
+        self.stats = {"polls": 0, "failures": 0, "samples": 0}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fleet-store")
+        self._semaphore = None
+        self._stop = None
+
+    def _jittered(self, delay):
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _backoff(self, failures):
+        return self._jittered(min(self.max_backoff, self.min_backoff * 2 ** (failures - 1)))
+
+    async def _connect(self, target):
+        connection = AsyncConnection(
+            target.url,
+            username=target.username,
+            password=target.password,
+            timeout=self.timeout,
+        )
+        return await asyncio.wait_for(connection.open(), self.timeout * 2)
+
+    async def _disconnect(self, target):
+        connection, target.connection = target.connection, None
+        if connection is not None:
+            try:
+                await asyncio.wait_for(connection.close(), self.timeout)
+            except Exception as exc:  # pragma: no cover - log seulement
+                logger.debug("Fermeture de la session %s en erreur: %s", target.name, exc)
+
+    async def poll(self, target, metrics):
+        """Relève ``metrics`` sur un modem et enregistre le résultat ; renvoie True si au moins une a répondu."""
+        started = time.monotonic()
+        ts = time.time()
+        samples = []
+        error = None
+        try:
+            if target.connection is None:
+                target.connection = await self._connect(target)
+            results = await asyncio.wait_for(AsyncClient(target.connection).snapshot(metrics), self.timeout)
+            errors = {name: result for name, result in results.items() if isinstance(result, Exception)}
+            for name, result in results.items():
+                if name not in errors:
+                    samples.extend(flatten_sample(ts, target.name, name, result))
+            if errors:
+                error = "; ".join(f"{name}: {exc!r}" for name, exc in errors.items())
+            ok = len(errors) < len(results)
+        except asyncio.TimeoutError:
+            error = f"délai de {self.timeout} s dépassé"
+            ok = False
+        except Exception as exc:
+            error = repr(exc)
+            ok = False
+
+        target.polls += 1
+        self.stats["polls"] += 1
+        if ok:
+            target.failures = 0
+            target.last_success = time.monotonic()
+        else:
+            target.failures += 1
+            self.stats["failures"] += 1
+            logger.warning("Relevé de %s en échec (%s d'affilée): %s", target.name, target.failures, error)
+            await self._disconnect(target)
+        target.last_error = error
+        self.stats["samples"] += len(samples)
+
+        poll_row = (ts, target.name, 1 if ok else 0, time.monotonic() - started, error)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self.store.insert, samples, [poll_row])
+        return ok
+
+    async def _run_target(self, target):
+        now = time.monotonic()
+        # Départ étalé sur le premier intervalle : pas de rafale au démarrage
+        for metric, interval in target.intervals.items():
+            target.next_due[metric] = now + random.uniform(0, interval)
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [metric for metric, when in target.next_due.items() if when <= now]
+            if not due:
+                delay = min(target.next_due.values()) - now
+                try:
+                    await asyncio.wait_for(self._stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            async with self._semaphore:
+                ok = await self.poll(target, due)
+
+            now = time.monotonic()
+            if ok:
+                for metric in due:
+                    target.next_due[metric] = now + self._jittered(target.intervals[metric])
+            else:
+                # Le modem ne répond plus : aucune métrique n'est relevée avant la fin de l'attente
+                retry_at = now + self._backoff(target.failures)
+                for metric in target.next_due:
+                    target.next_due[metric] = max(target.next_due[metric], retry_at)
+
+        await self._disconnect(target)
+
+    async def _prune_loop(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            deleted = await loop.run_in_executor(self._writer, self.store.prune, time.time() - self.retention)
+            if deleted:
+                logger.info("%s relevés de plus de %s s supprimés", deleted, self.retention)
+            try:
+                await asyncio.wait_for(self._stop.wait(), 3600)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Relève la flotte jusqu'à ``stop()``."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._stop = asyncio.Event()
+        logger.info("Relevé de %s modems (%s en parallèle au plus)", len(self.targets), self.concurrency)
+        tasks = [asyncio.ensure_future(self._run_target(target)) for target in self.targets]
+        if self.retention:
+            tasks.append(asyncio.ensure_future(self._prune_loop()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for target in self.targets:
+                await self._disconnect(target)
+            self._writer.shutdown(wait=True)
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    def status(self):
+        data: Dict[str, Any] = dict(self.stats)
+        data["modems"] = {target.name: target.status() for target in self.targets}
+        return data
+
+
+__all__ = ["DEFAULT_METRICS", "FleetPoller", "MetricStore", "ModemTarget", "flatten_sample"]
@@ -1,6 +1,5 @@
 import json
 import os
-import sqlite3
 import urllib.parse
 from http.server import BaseHTTPRequestHandler
 import html
@@ -8,15 +7,10 @@ import threading
 import subprocess
 import logging
 
-from huawei_lte_api.Connection import Connection
-from huawei_lte_api.Client import Client
-from huawei_lte_api.enums.client import ResponseEnum
-
+from .cache import LookupFailed
+from .concurrency import RouteBusy
+from .outbox import STATUS_QUEUED
 from .utils import (
-    parse_dbm,
-    get_signal_level,
-    ensure_logs_table,
-    log_request,
     validate_request,
     footer_html,
     get_phone_from_kafka,
@@ -26,41 +20,6 @@ OPENAPI_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "openapi.json"
 
 logger = logging.getLogger(__name__)
 
-SIGNAL_LEVELS = {
-    0: "     ",
-    1: "▂    ",
-    2: "▂▃   ",
-    3: "▂▃▄  ",
-    4: "▂▃▄▅ ",
-    5: "▂▃▄▅▇",
-}
-
-NETWORK_TYPE_MAP = {
-    "0": "No Service",
-    "1": "GSM",
-    "2": "GPRS",
-    "3": "EDGE",
-    "4": "WCDMA",
-    "5": "HSDPA",
-    "6": "HSUPA",
-    "7": "HSPA",
-    "8": "TDSCDMA",
-    "9": "HSPA+",
-    "10": "EVDO Rev.0",
-    "11": "EVDO Rev.A",
-    "12": "EVDO Rev.B",
-    "13": "1xRTT",
-    "14": "UMB",
-    "15": "1xEVDV",
-    "16": "3xRTT",
-    "17": "HSPA+ 64QAM",
-    "18": "HSPA+ MIMO",
-    "19": "LTE",
-    "41": "LTE CA",
-    "101": "NR5G NSA",
-    "102": "NR5G SA",
-}
-
 NAVBAR_TEMPLATE = """
     <nav class='navbar navbar-dark bg-company'>
       <div class='container-fluid'>
@@ -91,40 +50,36 @@ NAVBAR_TEMPLATE = """
     </div>
 """
 
+# Catégories de routes pour la limitation de concurrence : les routes
+# "modem" sont sérialisées, les recherches d'annuaire sont bornées et les
+# pages statiques / SQLite passent en parallèle. /readsms et /health n'y
+# figurent pas : leurs lectures simultanées sont regroupées en un seul
+# appel (SingleFlight) et /health est servi depuis le dernier relevé.
+ROUTE_CLASSES = {
+    "/readsms/delete": "modem",
+    "/phone": "lookup",
+    "/phone_api": "lookup",
+    "/events": "stream",
+}
+
+# Intervalle des commentaires envoyés sur /events pour garder la connexion ouverte
+EVENTS_PING_INTERVAL = 15
+
+
+def route_class(path: str) -> str:
+    return ROUTE_CLASSES.get(path, "default")
+
 
 class SMSHandler(BaseHTTPRequestHandler):
     def _get_sms_count(self) -> int:
-        try:
-            with Connection(
-                self.server.modem_url,
-                username=self.server.username,
-                password=self.server.password,
-                timeout=self.server.timeout,
-            ) as connection:
-                client = Client(connection)
-                info = client.sms.sms_count()
-                return int(info.get("LocalInbox", 0))
-        except Exception:
-            return 0
+        # Valeur tenue à jour par le thread InboxPoller, sans accès modem
+        return self.server.inbox_poller.count or 0
 
     def _get_sent_count(self) -> int:
-        conn = sqlite3.connect(self.server.db_path)
-        ensure_logs_table(conn)
-        count = conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
-        conn.close()
-        return int(count)
+        return self.server.storage.count_logs()
 
     def _get_last_sender(self) -> str:
-        conn = sqlite3.connect(self.server.db_path)
-        conn.row_factory = sqlite3.Row
-        ensure_logs_table(conn)
-        row = conn.execute(
-            "SELECT sender FROM logs WHERE sender IS NOT NULL AND sender != '' ORDER BY id DESC LIMIT 1"
-        ).fetchone()
-        conn.close()
-        if row:
-            return row["sender"]
-        return ""
+        return self.server.storage.last_sender()
 
     def _serve_dashboard(self):
         data = {
@@ -144,22 +99,30 @@ class SMSHandler(BaseHTTPRequestHandler):
         if not baudin_id:
             self._json_error(400, "id manquant")
             return
-        cfg = {
-            "kafka_client_id": self.server.kafka_client_id,
-            "kafka_url": self.server.kafka_url,
-            "kafka_group_id": self.server.kafka_group_id,
-            "kafka_username": self.server.kafka_username,
-            "kafka_password": self.server.kafka_password,
-            "kafka_ca_cert": self.server.kafka_ca_cert,
-            "kafka_privkey": self.server.kafka_privkey,
-            "kafka_cert": self.server.kafka_cert,
-        }
-        phone = get_phone_from_kafka(
-            baudin_id,
-            cfg,
-            producer=self.server.kafka_producer,
-            consumer=self.server.kafka_consumer,
-        )
+        cfg = self.server.kafka_config()
+        if not cfg["kafka_url"]:
+            self._json_error(404, "Numero introuvable")
+            return
+        clients = self.server.kafka.clients()
+        if clients is None:
+            self._json_error(503, "Kafka indisponible, reessayez plus tard")
+            return
+        producer, consumer, dispatcher = clients
+        try:
+            phone = self.server.phone_cache.get_or_load(
+                ("kafka", baudin_id.upper()),
+                lambda: get_phone_from_kafka(
+                    baudin_id,
+                    cfg,
+                    producer=producer,
+                    consumer=consumer,
+                    dispatcher=dispatcher,
+                ),
+            )
+        except LookupFailed as exc:
+            logger.warning("Recherche Kafka en échec pour %s: %s", baudin_id, exc)
+            self._json_error(503, "Kafka n'a pas repondu, reessayez plus tard")
+            return
         if phone:
             self._send_json(200, {"phone": phone})
         else:
@@ -175,11 +138,19 @@ class SMSHandler(BaseHTTPRequestHandler):
         from .external_api import get_phone_from_api
 
         logger.info("Recherche du numéro via l'API externe pour %s", initials)
-        phone = get_phone_from_api(
-            initials,
-            self.server.sms_api_url,
-            self.server.sms_api_key,
-        )
+        try:
+            phone = self.server.phone_cache.get_or_load(
+                ("api", initials),
+                lambda: get_phone_from_api(
+                    initials,
+                    self.server.sms_api_url,
+                    self.server.sms_api_key,
+                ),
+            )
+        except LookupFailed as exc:
+            logger.warning("Recherche via l'API externe en échec pour %s: %s", initials, exc)
+            self._json_error(503, "API externe indisponible, reessayez plus tard")
+            return
         if phone:
             logger.info("Numéro obtenu via l'API pour %s: %s", initials, phone)
         else:
@@ -200,7 +171,12 @@ class SMSHandler(BaseHTTPRequestHandler):
             "async function checkUpdate(){try{const r=await fetch('/check_update');"
             "const j=await r.json();if(j.update_available){document.getElementById('updateBtn').classList.remove('d-none');}}catch(e){}}"
             "function promptUpdate(){if(confirm('Lancer la mise à jour ?')){fetch('/update',{method:'POST'}).then(()=>alert('Mise à jour lancée'));}}"
-            "updateSmsBadge();setInterval(updateSmsBadge,5000);checkUpdate();"
+            "function pollSmsBadge(){if(!window.smsPoll){updateSmsBadge();window.smsPoll=setInterval(updateSmsBadge,5000);}}"
+            "function startSmsEvents(){if(!window.EventSource){pollSmsBadge();return;}"
+            "const es=new EventSource('/events');window.smsEvents=es;"
+            "es.addEventListener('sms_count',e=>{document.getElementById('smsBadge').textContent=JSON.parse(e.data).count;});"
+            "es.onerror=()=>{if(es.readyState===EventSource.CLOSED){pollSmsBadge();}};}"
+            "startSmsEvents();checkUpdate();"
             "</script>"
         )
         return NAVBAR_TEMPLATE.replace("{SMS_BADGE}", badge) + script
@@ -216,9 +192,88 @@ class SMSHandler(BaseHTTPRequestHandler):
     def _json_error(self, status, message):
         self._send_json(status, {"error": message})
 
-    def do_GET(self):
+    def _run_limited(self, dispatch):
         path = urllib.parse.urlparse(self.path).path
+        kind = route_class(path)
+        # Pas d'attente pour un flux : le navigateur repasse en interrogation
+        timeout = 0 if kind == "stream" else self.server.route_wait_timeout
+        try:
+            with self.server.route_limiter.slot(kind, timeout=timeout):
+                dispatch(path)
+        except RouteBusy:
+            logger.warning("Trop de requêtes en attente pour %s", path)
+            self._json_error(503, "Serveur occupe, reessayez plus tard")
+
+    def _serve_sms_status(self, message_id):
+        if self.server.api_key is not None:
+            if self.headers.get("X-API-KEY") != self.server.api_key:
+                self._json_error(401, "Invalid API key")
+                return
+        message = self.server.outbox.get(message_id)
+        if message is None:
+            self._json_error(404, "SMS introuvable")
+            return
+        self._send_json(200, message)
 
+    def _serve_cache_stats(self):
+        self._send_json(200, self.server.phone_cache.stats())
+
+    def _purge_cache(self):
+        query = urllib.parse.urlparse(self.path).query
+        namespace = urllib.parse.parse_qs(query).get("source", [None])[0]
+        purged = self.server.phone_cache.purge(namespace)
+        logger.info("Cache des numéros purgé (%s entrées)", purged)
+        self._send_json(200, {"purged": purged})
+
+    def _serve_events(self):
+        if not self.server.event_streams:
+            self._json_error(503, "Flux indisponible en mode serie")
+            return
+        subscription = self.server.events.subscribe()
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            count = self.server.inbox_poller.count
+            self.wfile.write(b"retry: 3000\n\n")
+            if count is not None:
+                self._write_event(None, "sms_count", {"count": count})
+            self.wfile.flush()
+            while not subscription.closed:
+                item = subscription.get(EVENTS_PING_INTERVAL)
+                if item is None:
+                    if subscription.closed:
+                        break
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    self._write_event(*item)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            logger.debug("Client /events déconnecté")
+        finally:
+            self.server.events.unsubscribe(subscription)
+
+    def _write_event(self, event_id, event, data):
+        lines = []
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"event: {event}")
+        lines.append(f"data: {json.dumps(data)}")
+        self.wfile.write(("\n".join(lines) + "\n\n").encode("utf-8"))
+
+    def _serve_stats(self):
+        self._send_json(200, self.server.stats())
+
+    def do_GET(self):
+        self._run_limited(self._dispatch_get)
+
+    def do_POST(self):
+        self._run_limited(self._dispatch_post)
+
+    def _dispatch_get(self, path):
         if path == "/":
             self._serve_index()
             return
@@ -231,6 +286,9 @@ class SMSHandler(BaseHTTPRequestHandler):
         if path == "/logs":
             self._serve_logs()
             return
+        if path == "/logs/search":
+            self._serve_logs_search()
+            return
         if path == "/admin":
             self._serve_admin()
             return
@@ -258,62 +316,42 @@ class SMSHandler(BaseHTTPRequestHandler):
         if path == "/sms_count":
             self._serve_sms_count()
             return
+        if path == "/events":
+            self._serve_events()
+            return
         if path == "/phone":
             self._serve_phone()
             return
         if path == "/phone_api":
             self._serve_phone_api()
             return
+        if path == "/stats":
+            self._serve_stats()
+            return
+        if path == "/admin/cache":
+            self._serve_cache_stats()
+            return
+        if path.startswith("/sms/"):
+            self._serve_sms_status(path[len("/sms/"):])
+            return
         if path.startswith("/readsms"):
             self._serve_readsms()
             return
-        if path != "/health":
-            self.send_error(404, "Not found")
-
+        if path == "/health":
+            self._serve_health()
             return
+        self.send_error(404, "Not found")
 
+    def _serve_health(self):
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        fresh = params.get("fresh", ["0"])[0] not in ("", "0", "false")
         try:
-            with Connection(
-                self.server.modem_url,
-                username=self.server.username,
-                password=self.server.password,
-                timeout=self.server.timeout,
-            ) as connection:
-                client = Client(connection)
-                device_info = client.device.information()
-                signal_info = client.device.signal()
-                status_info = client.monitoring.status()
-                network_type_raw = str(status_info.get("CurrentNetworkType", "0"))
-                plmn_info = client.net.current_plmn()
-                config = client.config_lan.config()
-
-            rsrp = parse_dbm(signal_info.get("rsrp"))
-            level = get_signal_level(rsrp)
-
-            health = {
-                "device_info": device_info,
-                "signal": signal_info,
-                "operator_name": plmn_info.get("FullName")
-                or plmn_info.get("ShortName")
-                or "Unknown",
-                "network_type": NETWORK_TYPE_MAP.get(
-                    network_type_raw, f"Unknown ({network_type_raw})"
-                ),
-                "ip_address": config.get("config", {})
-                .get("dhcps", {})
-                .get("ipaddress"),
-                "signal_level": level,
-                "signal_bars": SIGNAL_LEVELS.get(level),
-            }
-
-            body = json.dumps(health).encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+            health = self.server.health.snapshot(fresh=fresh)
         except Exception as exc:
-            self._json_error(500, str(exc))
+            self._send_json(500, {"error": str(exc), "kafka": self.server.kafka.status()})
+            return
+        health["kafka"] = self.server.kafka.status()
+        self._send_json(200, health)
 
     def _serve_index(self):
         html = """
@@ -346,7 +384,24 @@ class SMSHandler(BaseHTTPRequestHandler):
                     const networkInfo = `${health.operator_name.toUpperCase()} ${health.network_type} ${health.signal_bars}`;
                     document.getElementById('networkInfo').textContent = networkInfo;
                 }
-                window.onload = loadData;
+                function listenEvents() {
+                    if (!window.smsEvents) {
+                        return;
+                    }
+                    window.smsEvents.addEventListener('sms_count', e => {
+                        document.getElementById('receivedCount').textContent = JSON.parse(e.data).count;
+                    });
+                    window.smsEvents.addEventListener('sms_status', e => {
+                        const status = JSON.parse(e.data);
+                        // Statuts finaux : chacun ajoute une ligne à l'historique compté par sent_total
+                        if (['sent', 'failed', 'unknown'].includes(status.status)) {
+                            const sent = document.getElementById('sentCount');
+                            sent.textContent = (parseInt(sent.textContent, 10) || 0) + 1;
+                            document.getElementById('lastSender').textContent = status.from || 'N/A';
+                        }
+                    });
+                }
+                window.onload = () => { loadData(); listenEvents(); };
             </script>
         </head>
         <body class='container-fluid px-3 py-4'>
@@ -387,13 +442,56 @@ class SMSHandler(BaseHTTPRequestHandler):
         self.wfile.write(body)
 
     def _serve_logs(self):
-        conn = sqlite3.connect(self.server.db_path)
-        conn.row_factory = sqlite3.Row
-        ensure_logs_table(conn)
-        rows = conn.execute(
-            "SELECT id, timestamp, sender, phone, message, response FROM logs ORDER BY id DESC"
-        ).fetchall()
-        conn.close()
+        parsed = urllib.parse.urlparse(self.path)
+        params = urllib.parse.parse_qs(parsed.query, keep_blank_values=True)
+        want_json = (
+            "json" in params
+            or params.get("format", [""])[0] == "json"
+            or "application/json" in self.headers.get("Accept", "")
+        )
+        filters = {
+            name: params.get(name, [""])[0].strip()
+            for name in ("since", "until", "sender", "phone", "status")
+        }
+        try:
+            before = int(params["before"][0]) if params.get("before", [""])[0] else None
+            limit = int(params.get("limit", ["100"])[0] or 100)
+        except ValueError:
+            self._json_error(400, "before et limit doivent etre des entiers")
+            return
+        rows, next_before = self.server.storage.list_logs(
+            before=before, limit=limit, **{k: v or None for k, v in filters.items()}
+        )
+
+        if want_json:
+            self._send_json(
+                200,
+                {"items": [dict(row) for row in rows], "next_before": next_before},
+            )
+            return
+
+        def _page_link(cursor):
+            query = {k: v for k, v in filters.items() if v}
+            if cursor is not None:
+                query["before"] = cursor
+            if limit != 100:
+                query["limit"] = limit
+            return "/logs?" + urllib.parse.urlencode(query) if query else "/logs"
+
+        status_options = "".join(
+            f"<option value='{value}'{' selected' if filters['status'] == value else ''}>{label}</option>"
+            for value, label in (("", "Tous"), ("ok", "Envoyés"), ("failed", "En échec"))
+        )
+        filter_form = (
+            "<form method='get' action='/logs' class='row g-2 mb-3'>"
+            f"<div class='col-md-2'><input type='date' name='since' class='form-control' value='{html.escape(filters['since'])}' title='Depuis'></div>"
+            f"<div class='col-md-2'><input type='date' name='until' class='form-control' value='{html.escape(filters['until'])}' title='Jusqu&#39;au'></div>"
+            f"<div class='col-md-2'><input type='text' name='sender' class='form-control' placeholder='Expéditeur' value='{html.escape(filters['sender'])}'></div>"
+            f"<div class='col-md-2'><input type='text' name='phone' class='form-control' placeholder='Destinataire' value='{html.escape(filters['phone'])}'></div>"
+            f"<div class='col-md-2'><select name='status' class='form-select'>{status_options}</select></div>"
+            "<div class='col-md-2'><button type='submit' class='btn btn-company w-100'>Filtrer</button></div>"
+            "</form>"
+        )
 
         html_lines = [
             "<html><head><meta charset='utf-8'><title>Historique SMS</title>",
@@ -410,6 +508,12 @@ class SMSHandler(BaseHTTPRequestHandler):
             "<h1 class='display-6 text-company mb-0'>Historique des SMS</h1>",
             "</div>",
             "<div class='container'>",
+            (
+                "<form method='get' action='/logs/search' class='input-group mb-3'>"
+                "<input type='search' name='q' class='form-control' placeholder='Rechercher dans les messages'>"
+                "<button type='submit' class='btn btn-outline-secondary'>Rechercher</button></form>"
+            ),
+            filter_form,
             "<form method='post' action='/logs/delete'>",
             "<table class='table table-striped'>",
             "<tr><th></th><th>Date/Heure</th><th>Expéditeur</th><th>Destinataire(s)</th><th>Message</th><th>Réponse</th></tr>",
@@ -436,6 +540,14 @@ class SMSHandler(BaseHTTPRequestHandler):
                     "Sélectionner tout</button> <button type='submit' class='btn btn-danger'>Supprimer</button></p>"
                 ),
                 "</form>",
+                "<nav><ul class='pagination'>",
+                f"<li class='page-item'><a class='page-link' href='{html.escape(_page_link(None))}'>Plus récents</a></li>",
+                (
+                    f"<li class='page-item'><a class='page-link' href='{html.escape(_page_link(next_before))}'>Page suivante</a></li>"
+                    if next_before is not None
+                    else ""
+                ),
+                "</ul></nav>",
                 "</div>" + footer_html() + "</body></html>",
             ]
         )
@@ -446,6 +558,69 @@ class SMSHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(body)
 
+    def _serve_logs_search(self):
+        parsed = urllib.parse.urlparse(self.path)
+        params = urllib.parse.parse_qs(parsed.query, keep_blank_values=True)
+        want_json = (
+            "json" in params
+            or params.get("format", [""])[0] == "json"
+            or "application/json" in self.headers.get("Accept", "")
+        )
+        text = params.get("q", [""])[0].strip()
+        try:
+            limit = int(params.get("limit", ["50"])[0] or 50)
+        except ValueError:
+            self._json_error(400, "limit doit etre un entier")
+            return
+        results = self.server.storage.search_logs(text, limit=limit) if text else []
+
+        if want_json:
+            self._send_json(200, {"query": text, "items": results})
+            return
+
+        html_lines = [
+            "<html><head><meta charset='utf-8'><title>Recherche SMS</title>",
+            "<link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css'>",
+            "<link rel='stylesheet' href='baudin.css'>",
+            "<script src='https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js'></script>",
+            "<script src='theme.js'></script>",
+            "<style>.bg-company{background-color:#0060ac;}.btn-company{background-color:#0060ac;border-color:#0060ac;}.text-company{color:#0060ac;}</style>",
+            "</head><body class='container-fluid px-3 py-4'>",
+            self._navbar_html(),
+            "<div class='p-5 mb-4 bg-body-tertiary rounded-3 text-center'>",
+            "<h1 class='display-6 text-company mb-0'>Recherche dans l'historique</h1>",
+            "</div>",
+            "<div class='container'>",
+            "<form method='get' action='/logs/search' class='input-group mb-3'>",
+            f"<input type='search' name='q' class='form-control' value='{html.escape(text)}' autofocus>",
+            "<button type='submit' class='btn btn-company text-white'>Rechercher</button></form>",
+        ]
+        if text:
+            html_lines.append(f"<p>{len(results)} résultat(s)</p>")
+            html_lines.append(
+                "<table class='table table-striped'>"
+                "<tr><th>Date/Heure</th><th>Expéditeur</th><th>Destinataire(s)</th><th>Message</th><th>Réponse</th></tr>"
+            )
+            for row in results:
+                html_lines.append(
+                    "<tr>"
+                    f"<td>{html.escape(row['timestamp'] or '')}</td>"
+                    f"<td>{html.escape(row['sender'] or '')}</td>"
+                    f"<td>{html.escape(row['phone'] or '')}</td>"
+                    f"<td>{row['snippet']}</td>"
+                    f"<td>{html.escape(row['response'] or '')}</td>"
+                    "</tr>"
+                )
+            html_lines.append("</table>")
+        html_lines.append("<p><a href='/logs'>Retour à l'historique</a></p>")
+        html_lines.append("</div>" + footer_html() + "</body></html>")
+        body = "".join(html_lines).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def _serve_readsms(self):
         parsed = urllib.parse.urlparse(self.path)
         params = urllib.parse.parse_qs(parsed.query)
@@ -456,14 +631,12 @@ class SMSHandler(BaseHTTPRequestHandler):
         )
 
         try:
-            with Connection(
-                self.server.modem_url,
-                username=self.server.username,
-                password=self.server.password,
-                timeout=self.server.timeout,
-            ) as connection:
-                client = Client(connection)
-                messages = [m.to_dict() for m in client.sms.get_messages()]
+            messages = self.server.modem_reads.do(
+                "sms.get_messages",
+                lambda: self.server.modem_pool.call(
+                    lambda client: [m.to_dict() for m in client.sms.get_messages()]
+                ),
+            )
         except Exception as exc:
             if want_json:
                 self._json_error(500, str(exc))
@@ -497,7 +670,7 @@ class SMSHandler(BaseHTTPRequestHandler):
             "<div class='container'>",
 
             "<form method='post' action='/readsms/delete'>",
-            "<table class='table table-striped'>",
+            "<table id='inbox' class='table table-striped'>",
             "<tr><th></th><th>Date/Heure</th><th>Expéditeur</th><th>Message</th></tr>",
         ]
         for m in messages:
@@ -519,7 +692,16 @@ class SMSHandler(BaseHTTPRequestHandler):
                 "Sélectionner tout</button> <button type='submit' class='btn btn-danger'>Supprimer</button></p>"
             ),
             "</form>",
-            "</div>" + footer_html() + "</body></html>",
+            "</div>",
+            (
+                "<script>if(window.smsEvents){window.smsEvents.addEventListener('sms',e=>{"
+                "const m=JSON.parse(e.data);const t=document.getElementById('inbox');"
+                "const row=t.insertRow(1);const box=document.createElement('input');"
+                "box.type='checkbox';box.className='rowchk';box.name='ids';box.value=m.Index;"
+                "row.insertCell().appendChild(box);"
+                "[m.Date,m.Phone,m.Content||''].forEach(v=>{row.insertCell().textContent=v;});});}</script>"
+            ),
+            footer_html() + "</body></html>",
         ])
 
         body = "".join(html_lines).encode("utf-8")
@@ -602,7 +784,8 @@ class SMSHandler(BaseHTTPRequestHandler):
                         body: JSON.stringify(payload)
                     });
                     if (resp.ok) {
-                        alert('SMS envoyé');
+                        const j = await resp.json();
+                        alert("SMS mis en file d'envoi (id " + j.id + ")");
                     } else {
                         const msg = await resp.text();
                         alert('Erreur: ' + msg);
@@ -863,6 +1046,13 @@ class SMSHandler(BaseHTTPRequestHandler):
         self.server.kafka_ca_cert = cfg['kafka_ca_cert']
         self.server.kafka_privkey = cfg['kafka_privkey']
         self.server.kafka_cert = cfg['kafka_cert']
+        self.server.phone_cache.purge()
+        self.server.kafka.reconfigure(self.server.kafka_config())
+        self.server.modem_pool.reconfigure(
+            self.server.modem_url,
+            self.server.username,
+            self.server.password,
+        )
         self.send_response(303)
         self.send_header('Location', '/admin')
         self.end_headers()
@@ -951,13 +1141,19 @@ class SMSHandler(BaseHTTPRequestHandler):
                                 <pre>{"to": ["+33612345678"], "from": "expediteur", "text": "message"}</pre>
                                 <small>En-tête <code>X-API-KEY</code> requis</small>
                             </td>
-                            <td>200 OK avec <code>OK</code> ou JSON <code>{"error": str}</code></td>
+                            <td>202 JSON <code>{"id": str, "status": "queued"}</code> ou JSON <code>{"error": str}</code></td>
+                        </tr>
+                        <tr>
+                            <td>GET</td>
+                            <td><code>/sms/{id}</code></td>
+                            <td><small>En-tête <code>X-API-KEY</code> requis</small></td>
+                            <td>200 JSON avec <code>status</code> : <code>queued</code>, <code>sending</code>, <code>sent</code>, <code>failed</code> ou <code>unknown</code> (envoi interrompu, le SMS a pu partir)</td>
                         </tr>
                         <tr>
                             <td>GET</td>
                             <td><code>/health</code></td>
-                            <td>-</td>
-                            <td>200 JSON sur l\'état du modem</td>
+                            <td>Ajouter <code>?fresh=1</code> pour forcer une relève</td>
+                            <td>200 JSON sur l\'état du modem (dernier relevé, âge en secondes dans <code>age</code>)</td>
                         </tr>
                         <tr>
                             <td>GET</td>
@@ -974,8 +1170,8 @@ class SMSHandler(BaseHTTPRequestHandler):
                         <tr>
                             <td>GET</td>
                             <td><code>/logs</code></td>
-                            <td>-</td>
-                            <td>200 HTML</td>
+                            <td>Paramètres <code>before</code>, <code>limit</code>, <code>since</code>, <code>until</code>, <code>sender</code>, <code>phone</code>, <code>status=ok|failed</code>, <code>json</code></td>
+                            <td>200 HTML ou JSON <code>{"items": [...], "next_before": 42}</code></td>
                         </tr>
                         <tr>
                             <td>POST</td>
@@ -983,6 +1179,36 @@ class SMSHandler(BaseHTTPRequestHandler):
                             <td>Formulaire <code>ids=1&amp;ids=2...</code></td>
                             <td>303 redirige vers <code>/logs</code></td>
                         </tr>
+                        <tr>
+                            <td>GET</td>
+                            <td><code>/stats</code></td>
+                            <td>-</td>
+                            <td>200 JSON : workers occupés, file en attente, limites par route</td>
+                        </tr>
+                        <tr>
+                            <td>GET</td>
+                            <td><code>/admin/cache</code></td>
+                            <td>-</td>
+                            <td>200 JSON : statistiques du cache des numéros (hits, misses, évictions)</td>
+                        </tr>
+                        <tr>
+                            <td>POST</td>
+                            <td><code>/admin/cache/purge</code></td>
+                            <td><code>?source=kafka</code> ou <code>?source=api</code> (optionnel)</td>
+                            <td>200 JSON <code>{"purged": int}</code></td>
+                        </tr>
+                        <tr>
+                            <td>GET</td>
+                            <td><code>/logs/search</code></td>
+                            <td>Paramètres <code>q</code>, <code>limit</code>, <code>json</code></td>
+                            <td>200 HTML ou JSON <code>{"query": "...", "items": [...]}</code> (résultats classés par pertinence)</td>
+                        </tr>
+                        <tr>
+                            <td>GET</td>
+                            <td><code>/events</code></td>
+                            <td>-</td>
+                            <td>Flux <code>text/event-stream</code> : <code>sms_count</code>, <code>sms</code> (SMS reçu), <code>sms_status</code> (statut d envoi) ; 503 si tous les flux sont occupés</td>
+                        </tr>
                     </tbody>
                 </table>
             </div>
@@ -1128,17 +1354,8 @@ class SMSHandler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length).decode("utf-8")
         params = urllib.parse.parse_qs(body)
         ids = params.get("ids", [])
-        conn = sqlite3.connect(self.server.db_path)
-        conn.row_factory = sqlite3.Row
-        ensure_logs_table(conn)
         if ids:
-            # Use executemany with parameterized queries to avoid SQL injection
-            conn.executemany(
-                "DELETE FROM logs WHERE id = ?",
-                [(log_id,) for log_id in ids],
-            )
-            conn.commit()
-        conn.close()
+            self.server.storage.delete_logs(ids)
         self.send_response(303)
         self.send_header("Location", "/logs")
         self.end_headers()
@@ -1150,13 +1367,7 @@ class SMSHandler(BaseHTTPRequestHandler):
         ids = params.get("ids", [])
 
         try:
-            with Connection(
-                self.server.modem_url,
-                username=self.server.username,
-                password=self.server.password,
-                timeout=self.server.timeout,
-            ) as connection:
-                client = Client(connection)
+            with self.server.modem_pool.client() as client:
                 for sms_id in ids:
                     try:
                         client.sms.delete_sms(int(sms_id))
@@ -1164,13 +1375,13 @@ class SMSHandler(BaseHTTPRequestHandler):
                         pass
         except Exception:
             pass
+        self.server.inbox_poller.notify()
 
         self.send_response(303)
         self.send_header("Location", "/readsms")
         self.end_headers()
 
-    def do_POST(self):
-        path = urllib.parse.urlparse(self.path).path
+    def _dispatch_post(self, path):
         if path == "/logs/delete":
             self._delete_logs()
             return
@@ -1183,6 +1394,9 @@ class SMSHandler(BaseHTTPRequestHandler):
         if path == "/admin/restart":
             self._restart_service()
             return
+        if path == "/admin/cache/purge":
+            self._purge_cache()
+            return
         if path == "/update":
             self._run_update()
             return
@@ -1214,28 +1428,6 @@ class SMSHandler(BaseHTTPRequestHandler):
 
             return
 
-        try:
-
-            with Connection(
-                self.server.modem_url,
-                username=self.server.username,
-                password=self.server.password,
-                timeout=self.server.timeout,
-            ) as connection:
-                client = Client(connection)
-                resp = client.sms.send_sms(recipients, text)
-            log_request(self.server.db_path, recipients, sender, text, str(resp))
-
-            if resp == ResponseEnum.OK.value:
-                self.send_response(200)
-                self.end_headers()
-                self.wfile.write(b"OK")
-            else:
-
-                self._json_error(500, "Failed to send SMS")
-
-        except Exception as exc:
-
-            log_request(self.server.db_path, recipients, sender, text, str(exc))
-
-            self._json_error(500, str(exc))
+        message_id = self.server.outbox.enqueue(recipients, sender, text)
+        self.server.outbox_sender.notify()
+        self._send_json(202, {"id": message_id, "status": STATUS_QUEUED})
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+
+from .utils import parse_dbm, get_signal_level
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_LEVELS = {
+    0: "     ",
+    1: "▂    ",
+    2: "▂▃   ",
+    3: "▂▃▄  ",
+    4: "▂▃▄▅ ",
+    5: "▂▃▄▅▇",
+}
+
+NETWORK_TYPE_MAP = {
+    "0": "No Service",
+    "1": "GSM",
+    "2": "GPRS",
+    "3": "EDGE",
+    "4": "WCDMA",
+    "5": "HSDPA",
+    "6": "HSUPA",
+    "7": "HSPA",
+    "8": "TDSCDMA",
+    "9": "HSPA+",
+    "10": "EVDO Rev.0",
+    "11": "EVDO Rev.A",
+    "12": "EVDO Rev.B",
+    "13": "1xRTT",
+    "14": "UMB",
+    "15": "1xEVDV",
+    "16": "3xRTT",
+    "17": "HSPA+ 64QAM",
+    "18": "HSPA+ MIMO",
+    "19": "LTE",
+    "41": "LTE CA",
+    "101": "NR5G NSA",
+    "102": "NR5G SA",
+}
+
+# Méthode du client modem lue pour chaque champ de /health
+FIELDS = {
+    "device_info": "device.information",
+    "signal": "device.signal",
+    "status": "monitoring.status",
+    "plmn": "net.current_plmn",
+    "lan": "config_lan.config",
+}
+
+# Intervalle de rafraîchissement en secondes : le signal bouge souvent,
+# les informations de l'appareil presque jamais.
+DEFAULT_INTERVALS = {
+    "device_info": 3600,
+    "signal": 10,
+    "status": 10,
+    "plmn": 300,
+    "lan": 3600,
+}
+
+
+class HealthCollector:
+    """Relève l'état du modem en tâche de fond, champ par champ.
+
+    ``/health`` est servi depuis le dernier relevé ; ``snapshot(fresh=True)``
+    force une relève complète (partagée entre appels simultanés).
+    """
+
+    def __init__(self, modem_pool, singleflight, intervals=None, tick=1.0):
+        self.modem_pool = modem_pool
+        self.singleflight = singleflight
+        self.intervals = dict(DEFAULT_INTERVALS)
+        self.intervals.update(intervals or {})
+        self.tick = tick
+        self._values = {}
+        self._updated = {}
+        self._errors = {}
+        # Dernière tentative et échecs consécutifs par champ : un champ en
+        # échec est retenté après une attente doublée à chaque échec, bornée
+        # par son intervalle, plutôt qu'à chaque tour de boucle.
+        self._attempted = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="sms-health", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _wait(self, name):
+        failures = self._failures.get(name, 0)
+        if not failures:
+            return self.intervals[name]
+        return min(self.intervals[name], self.tick * 2 ** failures)
+
+    def _due(self, now):
+        with self._lock:
+            return [
+                name
+                for name in FIELDS
+                if now - self._attempted.get(name, float("-inf")) >= self._wait(name)
+            ]
+
+    def _record_errors(self, errors, now):
+        # Appelé avec self._lock
+        for name, error in errors.items():
+            self._errors[name] = error
+            self._attempted[name] = now
+            self._failures[name] = self._failures.get(name, 0) + 1
+
+    def refresh(self, names=None):
+        names = list(names or FIELDS)
+        key = "health:" + ",".join(names)
+        self.singleflight.do(key, lambda: self._collect(names))
+
+    def _collect(self, names):
+        results = {}
+        errors = {}
+        # Les champs dus sont lus en parallèle sur la même session
+        with self.modem_pool.client() as client:
+            fetched = client.snapshot([FIELDS[name] for name in names])
+        for name in names:
+            value = fetched[FIELDS[name]]
+            if isinstance(value, Exception):
+                errors[name] = str(value)
+            else:
+                results[name] = value
+        now = time.time()
+        with self._lock:
+            for name, value in results.items():
+                self._values[name] = value
+                self._updated[name] = now
+                self._attempted[name] = now
+                self._errors.pop(name, None)
+                self._failures.pop(name, None)
+            self._record_errors(errors, now)
+
+    def _loop(self):
+        while self._running:
+            names = self._due(time.time())
+            if names:
+                try:
+                    self.refresh(names)
+                except Exception as exc:
+                    with self._lock:
+                        self._record_errors({name: str(exc) for name in names}, time.time())
+                    logger.warning("Relève de l'état du modem en erreur: %s", exc)
+            time.sleep(self.tick)
+
+    def snapshot(self, fresh=False) -> dict:
+        with self._lock:
+            complete = all(name in self._values for name in FIELDS)
+        if fresh or not complete:
+            self.refresh()
+        now = time.time()
+        with self._lock:
+            missing = [name for name in FIELDS if name not in self._values]
+            if missing:
+                raise RuntimeError(
+                    "; ".join(self._errors.get(name, name) for name in missing)
+                )
+            values = dict(self._values)
+            ages = {name: round(now - self._updated[name], 1) for name in FIELDS}
+            errors = dict(self._errors)
+
+        signal_info = values["signal"]
+        network_type_raw = str(values["status"].get("CurrentNetworkType", "0"))
+        plmn_info = values["plmn"]
+        level = get_signal_level(parse_dbm(signal_info.get("rsrp")))
+        health = {
+            "device_info": values["device_info"],
+            "signal": signal_info,
+            "operator_name": plmn_info.get("FullName")
+            or plmn_info.get("ShortName")
+            or "Unknown",
+            "network_type": NETWORK_TYPE_MAP.get(
+                network_type_raw, f"Unknown ({network_type_raw})"
+            ),
+            "ip_address": values["lan"].get("config", {})
+            .get("dhcps", {})
+            .get("ipaddress"),
+            "signal_level": level,
+            "signal_bars": SIGNAL_LEVELS.get(level),
+            # Âge du plus ancien des deux relevés affichés : le signal peut
+            # être frais alors que le statut réseau ne l'est plus
+            "age": max(ages["signal"], ages["status"]),
+            "ages": ages,
+        }
+        if errors:
+            health["errors"] = errors
+        return health
+
+
+__all__ = [
+    "HealthCollector",
+    "FIELDS",
+    "DEFAULT_INTERVALS",
+    "NETWORK_TYPE_MAP",
+    "SIGNAL_LEVELS",
+]
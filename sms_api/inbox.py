@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class InboxPoller:
+    """Tient à jour en mémoire le nombre de SMS reçus.
+
+    Un seul thread interroge le modem toutes les ``interval`` secondes ;
+    les pages et le badge de la barre de navigation lisent la valeur
+    conservée au lieu d'ouvrir chacun une session modem. Avec ``events``,
+    les changements du compteur et les nouveaux SMS sont diffusés.
+    """
+
+    def __init__(self, modem_pool, singleflight, interval=10, events=None):
+        self.modem_pool = modem_pool
+        self.singleflight = singleflight
+        self.interval = interval
+        self.events = events
+        self._seen = None
+        self.count = None
+        self.updated_at = None
+        self.error = None
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="sms-inbox-poller", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def notify(self):
+        """Demande un rafraîchissement immédiat (après une suppression par exemple)."""
+        self._wakeup.set()
+
+    def refresh(self):
+        info = self.singleflight.do(
+            "sms.sms_count", lambda: self.modem_pool.call(lambda client: client.sms.sms_count())
+        )
+        count = int(info.get("LocalInbox", 0))
+        previous, self.count = self.count, count
+        self.updated_at = time.time()
+        self.error = None
+        if self.events is not None:
+            if count != previous:
+                self.events.publish("sms_count", {"count": count})
+            if self._seen is None or (previous is not None and count > previous):
+                self._detect_new_messages()
+        return count
+
+    def _detect_new_messages(self):
+        messages = self.singleflight.do(
+            "sms.get_messages",
+            lambda: self.modem_pool.call(
+                lambda client: [m.to_dict() for m in client.sms.get_messages()]
+            ),
+        )
+        indexes = {m["Index"] for m in messages}
+        if self._seen is not None:
+            for message in messages:
+                if message["Index"] not in self._seen:
+                    self.events.publish("sms", message)
+        self._seen = indexes
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
+
+    def _loop(self):
+        while self._running:
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.error = str(exc)
+                logger.warning("Lecture du nombre de SMS en erreur: %s", exc)
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+
+__all__ = ["InboxPoller"]
@@ -0,0 +1,142 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from .cache import LookupFailed
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TOPIC = "matrix.person.phone-number"
+REPLY_TOPIC = "matrix.person.phone-number.reply"
+
+
+class KafkaReplyDispatcher:
+    """Consomme le topic de réponse dans un thread unique et distribue les
+    messages aux requêtes en attente selon leur ``kafka_correlationId``.
+
+    Le consommateur Kafka n'étant pas thread-safe, ce thread doit être le
+    seul à appeler ``poll`` : créer le consommateur avec
+    ``create_kafka_clients(cfg, heartbeat=False)``.
+    """
+
+    def __init__(self, consumer, poll_timeout_ms=500):
+        self.consumer = consumer
+        self.poll_timeout_ms = poll_timeout_ms
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._stopping = threading.Event()
+        self._thread = None
+        self.ready = threading.Event()
+        # Nombre de poll en erreur d'affilée (surveillé par KafkaManager)
+        self.poll_errors = 0
+
+    def start(self):
+        self._running = True
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="kafka-replies", daemon=True)
+        self._thread.start()
+        return self
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=2):
+        self._running = False
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.cancel()
+
+    def _loop(self):
+        while self._running:
+            try:
+                records = self.consumer.poll(timeout_ms=self.poll_timeout_ms)
+            except Exception as exc:  # pragma: no cover - log seulement
+                self.poll_errors += 1
+                logger.debug("Poll Kafka en erreur: %s", exc)
+                # Un poll en échec rend la main aussitôt : sans attente, la
+                # boucle tournerait à vide (jusqu'à 1 s, interrompue par stop())
+                self._stopping.wait(min(self.poll_errors, 10) * 0.1)
+                continue
+            self.poll_errors = 0
+            if not self.ready.is_set():
+                self._on_first_assignment()
+            for messages in (records or {}).values():
+                for message in messages:
+                    self._dispatch(message)
+
+    def _on_first_assignment(self):
+        try:
+            parts = self.consumer.assignment()
+            if not parts:
+                return
+            self.consumer.seek_to_end(*parts)
+        except Exception as exc:  # pragma: no cover - log seulement
+            logger.debug("Seek_to_end en erreur: %s", exc)
+        self.ready.set()
+        logger.info("Consommateur Kafka prêt (%s partition(s))", len(parts))
+
+    def _dispatch(self, message):
+        headers = dict(message.headers or [])
+        msg_id = headers.get("kafka_correlationId")
+        if not msg_id:
+            logger.debug("Message reçu sans correlation id : %s", message.value)
+            return
+        correlation_id = msg_id.decode("utf-8")
+        with self._lock:
+            future = self._pending.pop(correlation_id, None)
+        if future is None:
+            logger.debug("Message ignoré (correlation id %s inconnu)", correlation_id)
+            return
+        logger.debug(
+            "Message reçu avec kafka_correlationId %s : %s", correlation_id, message.value
+        )
+        if not future.done():
+            future.set_result(message.value or "")
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def request(self, producer, baudin_id: str, timeout=30) -> str:
+        """Publie une demande de numéro et attend la réponse correspondante.
+
+        Une réponse vide signifie numéro introuvable ; sans réponse dans le
+        délai, ``LookupFailed`` est levée.
+        """
+        correlation_id = str(uuid.uuid4())
+        future = Future()
+        with self._lock:
+            self._pending[correlation_id] = future
+        try:
+            producer.send(
+                REQUEST_TOPIC,
+                key=None,
+                value=baudin_id.upper(),
+                headers=[
+                    ("kafka_correlationId", correlation_id.encode("utf-8")),
+                    ("kafka_replyTopic", REPLY_TOPIC.encode("utf-8")),
+                    ("kafka_replyPartition", b"0"),
+                ],
+            )
+            producer.flush()
+            logger.debug(
+                "Message envoyé pour %s avec kafka_correlationId %s",
+                baudin_id.upper(),
+                correlation_id,
+            )
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.warning("Kafka n'a pas retourné de numéro pour %s", baudin_id)
+            raise LookupFailed(f"pas de réponse de Kafka en {timeout} s") from None
+        finally:
+            with self._lock:
+                self._pending.pop(correlation_id, None)
+
+
+__all__ = ["KafkaReplyDispatcher", "REQUEST_TOPIC", "REPLY_TOPIC"]
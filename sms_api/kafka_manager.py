@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+
+from .kafka_dispatcher import KafkaReplyDispatcher
+from .utils import create_kafka_clients
+
+logger = logging.getLogger(__name__)
+
+# Nombre de poll en erreur d'affilée au-delà duquel les clients sont recréés
+MAX_POLL_ERRORS = 20
+
+
+class KafkaManager:
+    """Crée les clients Kafka en tâche de fond et les recrée après une panne.
+
+    Le serveur HTTP n'attend plus le broker pour démarrer : tant que le
+    consommateur n'a pas reçu ses partitions, ``clients()`` renvoie ``None``
+    et ``/phone`` répond 503. Les échecs de connexion sont retentés avec une
+    attente doublée à chaque fois (``min_backoff`` à ``max_backoff`` secondes).
+    """
+
+    def __init__(self, cfg, min_backoff=1, max_backoff=60, check_interval=5):
+        self.cfg = dict(cfg)
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.check_interval = check_interval
+        self.producer = None
+        self.consumer = None
+        self.dispatcher = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._state = "disabled"
+        self._generation = 0
+        self._attempts = 0
+        self._connections = 0
+        self._last_error = None
+        self._since = time.time()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="kafka-manager", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._close_clients()
+
+    def reconfigure(self, cfg):
+        """Change la configuration ; les clients existants sont fermés et recréés."""
+        with self._lock:
+            self.cfg = dict(cfg)
+            self._generation += 1
+        self._close_clients()
+        self._wake.set()
+
+    def clients(self):
+        """Retourne ``(producteur, consommateur, dispatcher)`` ou ``None`` si Kafka n'est pas prêt."""
+        with self._lock:
+            dispatcher = self.dispatcher
+            if dispatcher is None or not dispatcher.ready.is_set():
+                return None
+            return self.producer, self.consumer, dispatcher
+
+    def status(self) -> dict:
+        with self._lock:
+            state = self._state
+            if state == "connected" and self.dispatcher is not None and self.dispatcher.ready.is_set():
+                state = "ready"
+            data = {
+                "state": state,
+                "ready": state == "ready",
+                "since": round(time.time() - self._since, 1),
+                "attempts": self._attempts,
+                "connections": self._connections,
+            }
+            if self._last_error:
+                data["last_error"] = self._last_error
+            if self.dispatcher is not None:
+                data["pending"] = self.dispatcher.pending_count()
+        return data
+
+    def _set_state(self, state, error=None):
+        with self._lock:
+            if state != self._state:
+                self._since = time.time()
+            self._state = state
+            if error is not None:
+                self._last_error = error
+
+    def _connect(self, cfg, generation) -> bool:
+        with self._lock:
+            self._attempts += 1
+        try:
+            # Le dispatcher est le seul à appeler poll : pas de heartbeat concurrent
+            producer, consumer = create_kafka_clients(cfg, heartbeat=False)
+        except Exception as exc:
+            self._set_state("error", str(exc) or exc.__class__.__name__)
+            logger.warning("Connexion à Kafka impossible: %s", exc)
+            return False
+        if producer is None or consumer is None:
+            self._set_state("error", "Aucun broker Kafka disponible")
+            return False
+        dispatcher = KafkaReplyDispatcher(consumer).start()
+        with self._lock:
+            # Configuration changée ou arrêt pendant la connexion : clients obsolètes
+            stale = generation != self._generation or not self._running
+            if not stale:
+                self.producer, self.consumer, self.dispatcher = producer, consumer, dispatcher
+        if stale:
+            self._close(producer, consumer, dispatcher)
+            return False
+        with self._lock:
+            self._connections += 1
+            self._attempts = 0
+            self._last_error = None
+        self._set_state("connected")
+        logger.info("Clients Kafka créés sur %s", cfg["kafka_url"])
+        return True
+
+    def _healthy(self) -> bool:
+        with self._lock:
+            dispatcher = self.dispatcher
+        if dispatcher is None:
+            return False
+        if not dispatcher.is_alive():
+            self._set_state("error", "Thread de réception Kafka arrêté")
+            return False
+        if dispatcher.poll_errors >= MAX_POLL_ERRORS:
+            self._set_state("error", f"{dispatcher.poll_errors} poll Kafka en erreur d'affilée")
+            return False
+        return True
+
+    def _close_clients(self):
+        with self._lock:
+            producer, consumer, dispatcher = self.producer, self.consumer, self.dispatcher
+            self.producer = self.consumer = self.dispatcher = None
+        self._close(producer, consumer, dispatcher)
+
+    @staticmethod
+    def _close(producer, consumer, dispatcher):
+        if dispatcher is not None:
+            dispatcher.stop()
+        for client in (producer, consumer):
+            if client is None:
+                continue
+            try:
+                client.close()
+            except Exception as exc:  # pragma: no cover - log seulement
+                logger.debug("Fermeture du client Kafka en erreur: %s", exc)
+
+    def _loop(self):
+        backoff = self.min_backoff
+        while self._running:
+            self._wake.clear()
+            with self._lock:
+                cfg = dict(self.cfg)
+                generation = self._generation
+                connected = self.dispatcher is not None
+            if not cfg.get("kafka_url"):
+                self._close_clients()
+                self._set_state("disabled")
+                self._wake.wait()
+                continue
+            if connected:
+                if self._healthy():
+                    self._wake.wait(self.check_interval)
+                    continue
+                logger.warning("Clients Kafka en panne, reconnexion")
+                self._close_clients()
+            self._set_state("connecting")
+            if self._connect(cfg, generation):
+                backoff = self.min_backoff
+                continue
+            if generation != self._generation:
+                continue
+            logger.info("Nouvelle tentative de connexion à Kafka dans %ss", backoff)
+            self._wake.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+__all__ = ["KafkaManager", "MAX_POLL_ERRORS"]
@@ -0,0 +1,170 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Politique d'écriture disque appliquée à la connexion du thread d'écriture :
+# "full" force un fsync à chaque lot, "normal" (WAL) ne synchronise qu'aux
+# checkpoints, "off" laisse le système décider (perte possible en cas de coupure).
+SYNC_MODES = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+
+class LogWriter:
+    """Écrit l'historique des envois par lots depuis un thread dédié.
+
+    Les threads d'envoi ne font que déposer la ligne dans une file ; le
+    thread d'écriture regroupe jusqu'à ``batch_size`` lignes (ou ce qui est
+    arrivé en ``flush_interval`` secondes) dans une seule transaction.
+
+    Seul l'historique passe par cette file : l'état des messages de la file
+    d'envoi reste écrit de façon synchrone (voir ``OutboxSender``).
+    """
+
+    def __init__(self, storage, batch_size=500, flush_interval=0.5, sync="normal", max_queue=100000):
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Politique de synchronisation inconnue : {sync}")
+        self.storage = storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sync = sync
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._running = False
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"written": 0, "batches": 0, "errors": 0, "dropped": 0}
+
+    def start(self):
+        self._running = True
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="sms-log-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def write(self, recipients, sender, text, response):
+        row = (datetime.utcnow().isoformat(), ",".join(recipients), sender, text, response)
+        if not self._running:
+            # Pas de thread d'écriture (arrêt en cours) : écriture directe
+            self.storage.insert_logs([row])
+            return
+        try:
+            self._queue.put(row, timeout=self.flush_interval * 4)
+        except queue.Full:
+            logger.error("File d'écriture de l'historique pleine, écriture directe")
+            self.storage.insert_logs([row])
+
+    def flush(self, timeout=5) -> bool:
+        """Attend que toutes les lignes déjà déposées soient écrites."""
+        if not self._running:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout=5):
+        if not self._running:
+            return
+        self._running = False
+        self._stopping.set()
+        try:
+            # Réveille le thread d'écriture ; file pleine : il verra l'arrêt au prochain lot
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("Thread d'écriture de l'historique toujours actif après %ss", timeout)
+                return
+        # Lignes déposées pendant l'arrêt, après la dernière lecture de la file
+        rows, waiters = self._drain()
+        if rows:
+            self._write(rows)
+        for waiter in waiters:
+            waiter.set()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            data = dict(self._stats)
+        data.update(queued=self._queue.qsize(), batch_size=self.batch_size, sync=self.sync)
+        return data
+
+    def _drain(self):
+        """Retire sans attendre tout ce qui reste dans la file."""
+        rows = []
+        waiters = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows, waiters
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                rows.append(item)
+
+    def _loop(self):
+        self.storage.connection().execute(f"PRAGMA synchronous={SYNC_MODES[self.sync]}")
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+            rows = []
+            waiters = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                # None ne sert qu'à réveiller le thread lors de l'arrêt
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not None:
+                    rows.append(item)
+                if self._stopping.is_set() or waiters or len(rows) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = self._stopping.is_set()
+            if stopping:
+                # Vide ce qui reste avant de s'arrêter
+                more_rows, more_waiters = self._drain()
+                rows.extend(more_rows)
+                waiters.extend(more_waiters)
+            if rows:
+                self._write(rows)
+            for waiter in waiters:
+                waiter.set()
+            if stopping:
+                return
+
+    def _write(self, rows):
+        for attempt in range(3):
+            try:
+                self.storage.insert_logs(rows)
+            except sqlite3.Error as exc:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                logger.warning("Écriture de %s lignes d'historique en erreur: %s", len(rows), exc)
+                time.sleep(0.2 * (attempt + 1))
+                continue
+            with self._stats_lock:
+                self._stats["written"] += len(rows)
+                self._stats["batches"] += 1
+            return
+        with self._stats_lock:
+            self._stats["dropped"] += len(rows)
+        logger.error("%s lignes d'historique perdues après plusieurs échecs", len(rows))
+
+
+__all__ = ["LogWriter", "SYNC_MODES"]
@@ -0,0 +1,303 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from huawei_lte_api.Client import Client
+from huawei_lte_api.Connection import Connection, ConnectionOptions
+from huawei_lte_api.KeepAlive import KeepAlive
+from huawei_lte_api.ResponseCache import ResponseCache
+from huawei_lte_api.enums.user import LoginStateEnum
+from huawei_lte_api.exceptions import (
+    ResponseErrorLoginCsrfException,
+    ResponseErrorLoginRequiredException,
+    ResponseErrorWrongSessionToken,
+)
+
+logger = logging.getLogger(__name__)
+
+# Erreurs indiquant que la session modem doit être rouverte
+SESSION_ERRORS = (
+    ResponseErrorLoginRequiredException,
+    ResponseErrorLoginCsrfException,
+    ResponseErrorWrongSessionToken,
+)
+
+# Compteurs relevés sur chaque connexion pour token_stats() et session_stats()
+CONNECTION_STATS = {
+    "csrf": lambda connection: connection.csrf_tokens.stats,
+    "sessions": lambda connection: dict(connection.stats),
+}
+# Valeurs instantanées, non cumulées après la fermeture d'une connexion
+GAUGE_STATS = ("available",)
+
+
+class PooledConnection:
+    """Connexion authentifiée conservée par le pool."""
+
+    def __init__(self, connection: Connection, generation: int, slot: int = 0, keepalive_interval=0):
+        self.connection = connection
+        self.client = Client(connection)
+        self.generation = generation
+        self.slot = slot
+        self.last_used = time.monotonic()
+        # Tenu pendant l'emprunt : le keep-alive ne touche pas une connexion en service
+        self.lock = threading.Lock()
+        self.keepalive = None
+        if keepalive_interval and connection.user_session is not None:
+            self.keepalive = KeepAlive(connection, interval=keepalive_interval, lock=self.lock).start()
+
+    def idle_for(self) -> float:
+        """Secondes depuis le dernier échange réussi avec le modem."""
+        return min(time.monotonic() - self.last_used, self.connection.idle_time)
+
+
+class ModemPool:
+    """Pool de connexions authentifiées au modem, réutilisées entre les requêtes.
+
+    Les connexions sont ouvertes à la demande (jusqu'à ``size``), vérifiées
+    par un ``user/state-login`` si elles sont restées inactives plus de
+    ``health_check_interval`` secondes, et reconnectées automatiquement
+    lorsque le modem signale une session expirée ou une erreur CSRF.
+    Les réponses statiques (configuration, informations de l'appareil) sont
+    partagées entre les connexions via ``response_cache``.
+
+    Avec ``keepalive_interval``, chaque connexion inactive envoie un
+    ``user/heartbeat`` à cet intervalle et se reconnecte d'elle-même si la
+    session a expiré, au lieu d'échouer à la requête suivante.
+
+    Les connexions se reconnectent d'elles-mêmes (une seule fois pour les
+    requêtes concurrentes) quand le modem répond que la session a expiré ;
+    avec ``idle_timeout``, elles le font avant la requête si elles sont
+    restées inactives plus longtemps que ce délai.
+
+    Avec ``session_file``, chaque connexion du pool enregistre sa session
+    (``session_file``, ``session_file.1``…) et la reprend au démarrage
+    suivant sans se reconnecter, si le modem la considère encore valide.
+    """
+
+    def __init__(self, modem_url, username, password, timeout=5, size=1, health_check_interval=30,
+                 session_file=None, keepalive_interval=0, idle_timeout=0):
+        self.modem_url = modem_url
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.size = max(1, int(size))
+        self.health_check_interval = health_check_interval
+        self.session_file = session_file or None
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._free_slots = list(range(self.size - 1, -1, -1))
+        self._opened = 0
+        self._generation = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"logins": 0, "relogins": 0, "checkouts": 0, "discarded": 0}
+        self.response_cache = ResponseCache()
+        # Connexions ouvertes (inactives ou empruntées) et compteurs des
+        # connexions déjà fermées : les totaux ne diminuent jamais
+        self._live = set()
+        self._retired_stats = {kind: {} for kind in CONNECTION_STATS}
+
+    def _session_path(self, slot: int):
+        if not self.session_file:
+            return None
+        return self.session_file if slot == 0 else f"{self.session_file}.{slot}"
+
+    def _open(self, generation: int, slot: int) -> PooledConnection:
+        logger.debug("Ouverture d'une nouvelle session modem sur %s", self.modem_url)
+        connection = Connection(
+            self.modem_url,
+            username=self.username,
+            password=self.password,
+            timeout=self.timeout,
+            response_cache=self.response_cache,
+            options=ConnectionOptions(
+                session_file=self._session_path(slot),
+                thread_safe=True,
+                idle_timeout=self.idle_timeout or None,
+            ),
+        )
+        self.stats["logins"] += 1
+        pooled = PooledConnection(connection, generation, slot, keepalive_interval=self.keepalive_interval)
+        with self._cond:
+            self._live.add(pooled)
+        return pooled
+
+    def _relogin(self, pooled: PooledConnection) -> None:
+        """Recharge les jetons CSRF et rouvre la session utilisateur."""
+        logger.info("Session modem expirée, reconnexion")
+        pooled.connection.relogin()
+        self.stats["relogins"] += 1
+
+    def _health_check(self, pooled: PooledConnection) -> None:
+        if pooled.idle_for() < self.health_check_interval:
+            return
+        if pooled.connection.user_session is None:
+            return
+        state = pooled.client.user.state_login()
+        if LoginStateEnum(int(state.get("State", LoginStateEnum.LOGGED_OUT))) != LoginStateEnum.LOGGED_IN:
+            self._relogin(pooled)
+
+    def checkout(self, timeout=None) -> PooledConnection:
+        """Emprunte une connexion au pool (bloque si toutes sont utilisées)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Pool de connexions modem fermé")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+                if self._opened < self.size:
+                    self._opened += 1
+                    pooled = None
+                    generation = self._generation
+                    slot = self._free_slots.pop()
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Aucune connexion modem disponible")
+                self._cond.wait(remaining)
+
+        try:
+            if pooled is None:
+                pooled = self._open(generation, slot)
+                pooled.lock.acquire()
+            else:
+                slot = pooled.slot
+                pooled.lock.acquire()
+                try:
+                    self._health_check(pooled)
+                except Exception as exc:
+                    logger.info("Connexion modem invalide (%s), réouverture", exc)
+                    pooled.lock.release()
+                    self._close_connection(pooled, logout=False)
+                    pooled = self._open(pooled.generation, slot)
+                    pooled.lock.acquire()
+        except BaseException:
+            with self._cond:
+                self._opened -= 1
+                self._free_slots.append(slot)
+                self._cond.notify()
+            raise
+        self.stats["checkouts"] += 1
+        return pooled
+
+    def checkin(self, pooled: PooledConnection, discard=False) -> None:
+        """Rend une connexion au pool, ou la ferme si ``discard`` est vrai."""
+        pooled.lock.release()
+        with self._cond:
+            stale = pooled.generation != self._generation or self._closed
+            if not discard and not stale:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+            self._opened -= 1
+            self._free_slots.append(pooled.slot)
+            self._cond.notify()
+        self.stats["discarded"] += 1
+        self._close_connection(pooled, logout=not discard)
+
+    def _close_connection(self, pooled: PooledConnection, logout=True) -> None:
+        if pooled.keepalive is not None:
+            pooled.keepalive.stop()
+        try:
+            if logout:
+                pooled.connection.close()
+            else:
+                pooled.connection.user_session = None
+                pooled.connection.close()
+        except Exception as exc:  # pragma: no cover - log seulement
+            logger.debug("Fermeture de la connexion modem en erreur: %s", exc)
+        self._retire(pooled)
+
+    def _retire(self, pooled: PooledConnection) -> None:
+        """Reporte les compteurs d'une connexion fermée dans les totaux du pool."""
+        with self._cond:
+            if pooled not in self._live:
+                return
+            self._live.discard(pooled)
+            for kind, get_stats in CONNECTION_STATS.items():
+                totals = self._retired_stats[kind]
+                for key, value in get_stats(pooled.connection).items():
+                    if key not in GAUGE_STATS:
+                        totals[key] = totals.get(key, 0) + value
+
+    @contextmanager
+    def client(self, timeout=None):
+        """Fournit un ``Client`` connecté le temps d'un bloc ``with``."""
+        pooled = self.checkout(timeout)
+        discard = False
+        try:
+            yield pooled.client
+        except SESSION_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.checkin(pooled, discard=discard)
+
+    def call(self, func, timeout=None):
+        """Exécute ``func(client)`` et réessaie une fois après reconnexion si la session a expiré."""
+        pooled = self.checkout(timeout)
+        discard = False
+        try:
+            try:
+                return func(pooled.client)
+            except SESSION_ERRORS:
+                self._relogin(pooled)
+                return func(pooled.client)
+        except SESSION_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.checkin(pooled, discard=discard)
+
+    def _total_stats(self, kind) -> dict:
+        get_stats = CONNECTION_STATS[kind]
+        with self._cond:
+            data = dict(self._retired_stats[kind])
+            for pooled in self._live:
+                for key, value in get_stats(pooled.connection).items():
+                    data[key] = data.get(key, 0) + value
+        return data
+
+    def token_stats(self) -> dict:
+        """Compteurs de jetons CSRF cumulés sur toutes les connexions, y compris fermées."""
+        return self._total_stats("csrf")
+
+    def session_stats(self) -> dict:
+        """Rechargements et reconnexions automatiques cumulés sur toutes les connexions, y compris fermées."""
+        return self._total_stats("sessions")
+
+    def reconfigure(self, modem_url, username, password, timeout=None) -> None:
+        """Change les paramètres du modem ; les connexions existantes sont fermées."""
+        with self._cond:
+            self.modem_url = modem_url
+            self.username = username
+            self.password = password
+            if timeout is not None:
+                self.timeout = timeout
+            self._generation += 1
+            self.response_cache.clear()
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._free_slots.extend(pooled.slot for pooled in idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_connection(pooled)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._free_slots.extend(pooled.slot for pooled in idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_connection(pooled)
+
+
+__all__ = ["ModemPool", "PooledConnection", "SESSION_ERRORS"]
@@ -0,0 +1,257 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from huawei_lte_api.enums.client import ResponseEnum
+from huawei_lte_api.exceptions import ResponseErrorSystemBusyException
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+# Envoi interrompu après la transmission de la requête au modem : le SMS a
+# pu partir, il n'est donc pas renvoyé automatiquement
+STATUS_UNKNOWN = "unknown"
+
+# Erreurs qui garantissent que le modem n'a pas pris le message : seules
+# celles-ci sont retentées. Un délai de lecture dépassé ou une connexion
+# coupée en cours de réponse laissent l'envoi incertain (STATUS_UNKNOWN).
+RETRYABLE_ERRORS = (
+    ResponseErrorSystemBusyException,
+    requests.exceptions.ConnectTimeout,
+    # Aucune connexion du pool disponible : rien n'a été envoyé
+    TimeoutError,
+)
+
+
+def is_retryable(exc) -> bool:
+    """Indique si l'envoi a échoué avant que le modem ne reçoive la requête."""
+    if isinstance(exc, RETRYABLE_ERRORS):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        # Connexion refusée ou hôte injoignable, et non une connexion
+        # coupée après l'envoi de la requête
+        reason = getattr(exc.args[0] if exc.args else None, "reason", None)
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+def _row_to_dict(row) -> dict:
+    return {
+        "id": row["id"],
+        "status": row["status"],
+        "to": json.loads(row["recipients"]),
+        "from": row["sender"],
+        "text": row["message"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "attempts": row["attempts"],
+        "response": row["response"],
+    }
+
+
+class Outbox:
+    """File d'envoi de SMS persistée dans SQLite (table ``outbox``)."""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def enqueue(self, recipients, sender, text) -> str:
+        message_id = uuid.uuid4().hex
+        now = datetime.utcnow().isoformat()
+        with self.storage.transaction() as conn:
+            conn.execute(
+                "INSERT INTO outbox(id, created_at, updated_at, recipients, sender, message, status) "
+                "VALUES (?,?,?,?,?,?,?)",
+                (message_id, now, now, json.dumps(recipients), sender, text, STATUS_QUEUED),
+            )
+        return message_id
+
+    def get(self, message_id):
+        row = self.storage.connection().execute(
+            "SELECT * FROM outbox WHERE id = ?", (message_id,)
+        ).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def claim_next(self):
+        """Passe le plus ancien message prêt à l'état ``sending`` et le retourne."""
+        with self.storage.transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM outbox WHERE status = ? AND next_attempt_at <= ? "
+                "ORDER BY created_at LIMIT 1",
+                (STATUS_QUEUED, time.time()),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (STATUS_SENDING, datetime.utcnow().isoformat(), row["id"]),
+            )
+        message = _row_to_dict(row)
+        message["attempts"] += 1
+        return message
+
+    def mark(self, message_id, status, response=None, retry_at=0.0):
+        with self.storage.transaction() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, response = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                (status, response, retry_at, datetime.utcnow().isoformat(), message_id),
+            )
+
+    def mark_interrupted(self) -> int:
+        """Passe à ``unknown`` les messages restés ``sending`` après un arrêt brutal.
+
+        Le modem a pu les envoyer avant l'arrêt : ils ne sont pas renvoyés.
+        """
+        with self.storage.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE outbox SET status = ?, response = ?, updated_at = ? WHERE status = ?",
+                (
+                    STATUS_UNKNOWN,
+                    "envoi interrompu par l'arrêt du serveur",
+                    datetime.utcnow().isoformat(),
+                    STATUS_SENDING,
+                ),
+            )
+            return cur.rowcount
+
+    def pending_count(self) -> int:
+        row = self.storage.connection().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)",
+            (STATUS_QUEUED, STATUS_SENDING),
+        ).fetchone()
+        return int(row[0])
+
+
+class OutboxSender:
+    """Thread unique qui vide la file d'envoi à travers le pool de sessions modem.
+
+    L'historique passe par ``log_writer`` (écriture par lots), mais l'état
+    de chaque message (``claim_next`` puis ``mark``) est validé de façon
+    synchrone, un commit par changement d'état : c'est lui qui dit après un
+    arrêt brutal si un SMS a pu partir, il ne doit pas attendre dans une file.
+    """
+
+    def __init__(
+        self,
+        outbox,
+        modem_pool,
+        max_attempts=3,
+        retry_delay=10,
+        poll_interval=1.0,
+        log_writer=None,
+        events=None,
+    ):
+        self.outbox = outbox
+        self.modem_pool = modem_pool
+        self.log_writer = log_writer
+        self.events = events
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        interrupted = self.outbox.mark_interrupted()
+        if interrupted:
+            logger.warning("%s SMS interrompus en cours d'envoi, état inconnu", interrupted)
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="sms-outbox", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        """Réveille le thread d'envoi après une mise en file."""
+        self._wakeup.set()
+
+    def stop(self, timeout=5):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _loop(self):
+        while self._running:
+            try:
+                message = self.outbox.claim_next()
+            except Exception as exc:  # pragma: no cover - log seulement
+                logger.error("Lecture de la file d'envoi en erreur: %s", exc)
+                message = None
+            if message is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._send(message)
+
+    def _publish(self, message, status, response=None):
+        if self.events is not None:
+            self.events.publish(
+                "sms_status",
+                {"id": message["id"], "status": status, "from": message["from"], "response": response},
+            )
+
+    def _send(self, message):
+        recipients = message["to"]
+        self._publish(message, STATUS_SENDING)
+        try:
+            resp = self.modem_pool.call(
+                lambda client: client.sms.send_sms(recipients, message["text"])
+            )
+        except Exception as exc:
+            if is_retryable(exc):
+                self._retry(message, exc)
+            elif isinstance(exc, requests.exceptions.RequestException):
+                # Requête partie vers le modem : le SMS a pu être envoyé
+                logger.error("Envoi du SMS %s interrompu, état inconnu: %s", message["id"], exc)
+                self._finish(message, STATUS_UNKNOWN, str(exc))
+            else:
+                logger.error("Envoi du SMS %s en échec: %s", message["id"], exc)
+                self._finish(message, STATUS_FAILED, str(exc))
+            return
+
+        status = STATUS_SENT if resp == ResponseEnum.OK.value else STATUS_FAILED
+        self._finish(message, status, str(resp))
+
+    def _retry(self, message, exc):
+        if message["attempts"] >= self.max_attempts:
+            self._finish(message, STATUS_FAILED, str(exc))
+            return
+        delay = self.retry_delay * message["attempts"]
+        logger.warning(
+            "Envoi du SMS %s en échec (%s), nouvel essai dans %ss",
+            message["id"],
+            exc,
+            delay,
+        )
+        self.outbox.mark(message["id"], STATUS_QUEUED, str(exc), time.time() + delay)
+        self._publish(message, STATUS_QUEUED, str(exc))
+
+    def _finish(self, message, status, response):
+        self.outbox.mark(message["id"], status, response)
+        self._publish(message, status, response)
+        if self.log_writer is not None:
+            self.log_writer.write(message["to"], message["from"], message["text"], response)
+        else:
+            self.outbox.storage.insert_log(message["to"], message["from"], message["text"], response)
+
+
+__all__ = [
+    "STATUS_QUEUED",
+    "STATUS_SENDING",
+    "STATUS_SENT",
+    "STATUS_FAILED",
+    "STATUS_UNKNOWN",
+    "RETRYABLE_ERRORS",
+    "is_retryable",
+    "Outbox",
+    "OutboxSender",
+]
@@ -1,11 +1,22 @@
 from http.server import HTTPServer
 import os
 import sys
+import queue
 import subprocess
 import shutil
 import logging
+import threading
 
-from .utils import create_kafka_clients
+from .cache import LookupCache
+from .concurrency import RouteLimiter, SingleFlight
+from .events import EventBroker
+from .health import HealthCollector
+from .inbox import InboxPoller
+from .kafka_manager import KafkaManager
+from .log_writer import LogWriter
+from .modem_pool import ModemPool
+from .outbox import Outbox, OutboxSender
+from .storage import Storage
 
 
 class SMSHTTPServer(HTTPServer):
@@ -32,6 +43,24 @@ class SMSHTTPServer(HTTPServer):
         kafka_cert="",
         sms_api_url="",
         sms_api_key="",
+        modem_pool_size=1,
+        workers=8,
+        max_queue=64,
+        modem_concurrency=1,
+        lookup_concurrency=4,
+        route_wait_timeout=30,
+        phone_cache_size=1024,
+        phone_cache_ttl=3600,
+        phone_cache_negative_ttl=60,
+        log_batch_size=500,
+        log_flush_interval=0.5,
+        log_sync="normal",
+        sms_count_interval=10,
+        event_streams=None,
+        health_signal_interval=10,
+        modem_session_file=None,
+        modem_keepalive=0,
+        modem_idle_timeout=0,
     ):
         super().__init__(server_address, handler_class)
         self.modem_url = modem_url
@@ -54,28 +83,186 @@ class SMSHTTPServer(HTTPServer):
         self.sms_api_url = sms_api_url
         self.sms_api_key = sms_api_key
 
-        self.kafka_producer = None
-        self.kafka_consumer = None
-        if self.kafka_url:
-            cfg = {
-                "kafka_client_id": self.kafka_client_id,
-                "kafka_url": self.kafka_url,
-                "kafka_group_id": self.kafka_group_id,
-                "kafka_username": self.kafka_username,
-                "kafka_password": self.kafka_password,
-                "kafka_ca_cert": self.kafka_ca_cert,
-                "kafka_privkey": self.kafka_privkey,
-                "kafka_cert": self.kafka_cert,
+        self.workers = workers
+        self.route_wait_timeout = route_wait_timeout
+        # Un flux /events occupe un worker tant que le navigateur reste
+        # connecté : on en réserve au plus la moitié.
+        if event_streams is None:
+            event_streams = max(1, workers // 2)
+        self.event_streams = event_streams if workers > 0 else 0
+        self.route_limiter = RouteLimiter(
+            {
+                "modem": modem_concurrency,
+                "lookup": lookup_concurrency,
+                "stream": self.event_streams or None,
+                "default": None,
             }
-            self.kafka_producer, self.kafka_consumer = create_kafka_clients(cfg)
-            if self.kafka_producer is None:
-                logging.getLogger(__name__).warning(
-                    "Impossible de se connecter à Kafka, la fonctionnalité sera desactivée"
+        )
+        self.events = EventBroker()
+        self._request_queue = queue.Queue(maxsize=max_queue) if workers > 0 else None
+        self._worker_threads = []
+        self._workers_stopping = threading.Event()
+        self._busy_workers = 0
+        self._rejected_requests = 0
+        self._stats_lock = threading.Lock()
+        for i in range(max(workers, 0)):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"sms-http-{i}", daemon=True
+            )
+            thread.start()
+            self._worker_threads.append(thread)
+
+        self.modem_pool = ModemPool(
+            modem_url,
+            username,
+            password,
+            timeout=timeout,
+            size=modem_pool_size,
+            session_file=modem_session_file,
+            keepalive_interval=modem_keepalive,
+            idle_timeout=modem_idle_timeout,
+        )
+        self.modem_reads = SingleFlight()
+        self.inbox_poller = InboxPoller(
+            self.modem_pool, self.modem_reads, interval=sms_count_interval, events=self.events
+        ).start()
+        self.health = HealthCollector(
+            self.modem_pool,
+            self.modem_reads,
+            intervals={"signal": health_signal_interval, "status": health_signal_interval},
+        ).start()
+        self.phone_cache = LookupCache(
+            maxsize=phone_cache_size,
+            ttl=phone_cache_ttl,
+            negative_ttl=phone_cache_negative_ttl,
+        )
+        self.storage = Storage(db_path)
+        self.log_writer = LogWriter(
+            self.storage,
+            batch_size=log_batch_size,
+            flush_interval=log_flush_interval,
+            sync=log_sync,
+        ).start()
+        self.outbox = Outbox(self.storage)
+        self.outbox_sender = OutboxSender(
+            self.outbox, self.modem_pool, log_writer=self.log_writer, events=self.events
+        )
+        self.outbox_sender.start()
+
+        # Les clients Kafka sont créés en tâche de fond : le serveur HTTP
+        # répond dès maintenant, /phone renvoie 503 tant que Kafka n'est pas prêt.
+        self.kafka = KafkaManager(self.kafka_config()).start()
+
+    def kafka_config(self) -> dict:
+        """Paramètres Kafka courants, au format attendu par ``create_kafka_clients``."""
+        return {
+            "kafka_client_id": self.kafka_client_id,
+            "kafka_url": self.kafka_url,
+            "kafka_group_id": self.kafka_group_id,
+            "kafka_username": self.kafka_username,
+            "kafka_password": self.kafka_password,
+            "kafka_ca_cert": self.kafka_ca_cert,
+            "kafka_privkey": self.kafka_privkey,
+            "kafka_cert": self.kafka_cert,
+        }
+
+    def process_request(self, request, client_address):
+        """Confie la requête au pool de workers (ou la traite directement en mode série)."""
+        if self._request_queue is None:
+            super().process_request(request, client_address)
+            return
+        try:
+            self._request_queue.put_nowait((request, client_address))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected_requests += 1
+            logging.getLogger(__name__).warning(
+                "File d'attente HTTP pleine, requête de %s rejetée", client_address[0]
+            )
+            body = b'{"error": "Serveur surcharge"}'
+            try:
+                request.sendall(
+                    b"HTTP/1.0 503 Service Unavailable\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+                    + body
                 )
-            else:
-                from .utils import warmup_kafka
+            except Exception:
+                pass
+            self.shutdown_request(request)
+
+    def _worker_loop(self):
+        while not self._workers_stopping.is_set():
+            try:
+                item = self._request_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            request, client_address = item
+            with self._stats_lock:
+                self._busy_workers += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._stats_lock:
+                    self._busy_workers -= 1
+
+    def stats(self) -> dict:
+        """Occupation des workers, profondeur de la file et état des limites par route."""
+        with self._stats_lock:
+            data = {
+                "workers": self.workers,
+                "busy_workers": self._busy_workers,
+                "queued": self._request_queue.qsize() if self._request_queue else 0,
+                "max_queue": self._request_queue.maxsize if self._request_queue else 0,
+                "rejected": self._rejected_requests,
+            }
+        data["routes"] = self.route_limiter.stats()
+        data["modem_pool"] = dict(self.modem_pool.stats)
+        data["modem_cache"] = self.modem_pool.response_cache.stats
+        data["modem_csrf"] = self.modem_pool.token_stats()
+        data["modem_sessions"] = self.modem_pool.session_stats()
+        data["modem_reads"] = dict(self.modem_reads.stats)
+        data["inbox"] = self.inbox_poller.snapshot()
+        data["events"] = self.events.stats()
+        data["outbox_pending"] = self.outbox.pending_count()
+        data["phone_cache"] = self.phone_cache.stats()
+        data["log_writer"] = self.log_writer.stats()
+        data["kafka"] = self.kafka.status()
+        return data
 
-                warmup_kafka(self.kafka_consumer)
+    def server_close(self):
+        super().server_close()
+        self.events.close()
+        if self._request_queue is not None:
+            self._workers_stopping.set()
+            # Requêtes acceptées mais jamais prises par un worker : connexions fermées,
+            # ce qui laisse aussi la place de réveiller chaque worker sans bloquer
+            while True:
+                try:
+                    item = self._request_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    self.shutdown_request(item[0])
+            for _ in self._worker_threads:
+                try:
+                    self._request_queue.put_nowait(None)
+                except queue.Full:
+                    break
+        for thread in self._worker_threads:
+            thread.join(timeout=1)
+        self.outbox_sender.stop()
+        self.inbox_poller.stop()
+        self.health.stop()
+        self.log_writer.stop()
+        self.modem_pool.close()
+        self.storage.close()
+        self.kafka.stop()
 
     def restart(self):
         """Redémarre le service ou le processus."""
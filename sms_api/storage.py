@@ -0,0 +1,326 @@
+import html
+import logging
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Réglages appliqués à chaque connexion : WAL pour que les lectures ne
+# bloquent pas les écritures, synchronous=NORMAL (sûr en WAL), attente
+# plutôt qu'erreur immédiate si la base est verrouillée.
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", "5000"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-8000"),
+    ("foreign_keys", "ON"),
+)
+
+
+def _migration_logs(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS logs ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        "timestamp TEXT,"
+        "phone TEXT,"
+        "sender TEXT,"
+        "message TEXT,"
+        "response TEXT)"
+    )
+    cols = [row[1] for row in conn.execute("PRAGMA table_info(logs)")]
+    if "sender" not in cols:
+        conn.execute("ALTER TABLE logs ADD COLUMN sender TEXT")
+
+
+def _migration_outbox(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS outbox ("
+        "id TEXT PRIMARY KEY,"
+        "created_at TEXT,"
+        "updated_at TEXT,"
+        "recipients TEXT,"
+        "sender TEXT,"
+        "message TEXT,"
+        "status TEXT,"
+        "attempts INTEGER DEFAULT 0,"
+        "next_attempt_at REAL DEFAULT 0,"
+        "response TEXT)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, next_attempt_at)"
+    )
+
+
+def _migration_logs_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_sender ON logs(sender, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_phone ON logs(phone, id)")  # supprimé en version 5
+    # Index partiel : les échecs sont rares, on les retrouve sans parcourir la table
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_failed ON logs(id) WHERE response != 'OK'")
+
+
+def _migration_drop_logs_phone_index(conn):
+    # Le filtre par destinataire cherche le numéro dans la liste (LIKE), que
+    # cet index ne sert pas : il ne faisait que ralentir les insertions
+    conn.execute("DROP INDEX IF EXISTS idx_logs_phone")
+
+
+# Index plein texte de l'historique (table de contenu externe : le texte
+# n'est pas dupliqué, les triggers tiennent l'index à jour).
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5("
+    "message, sender, phone, content='logs', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_ai AFTER INSERT ON logs BEGIN "
+    "INSERT INTO logs_fts(rowid, message, sender, phone) "
+    "VALUES (new.id, new.message, new.sender, new.phone); END",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_ad AFTER DELETE ON logs BEGIN "
+    "INSERT INTO logs_fts(logs_fts, rowid, message, sender, phone) "
+    "VALUES ('delete', old.id, old.message, old.sender, old.phone); END",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_au AFTER UPDATE ON logs BEGIN "
+    "INSERT INTO logs_fts(logs_fts, rowid, message, sender, phone) "
+    "VALUES ('delete', old.id, old.message, old.sender, old.phone); "
+    "INSERT INTO logs_fts(rowid, message, sender, phone) "
+    "VALUES (new.id, new.message, new.sender, new.phone); END",
+)
+
+
+def _create_fts(conn) -> bool:
+    try:
+        for statement in _FTS_SCHEMA:
+            conn.execute(statement)
+    except sqlite3.OperationalError as exc:
+        # SQLite compilé sans FTS5 : la recherche passera par LIKE
+        logger.warning("Index plein texte indisponible: %s", exc)
+        return False
+    return True
+
+
+def _migration_logs_fts(conn):
+    if _create_fts(conn):
+        conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')")
+
+
+# Marqueurs posés par snippet(), remplacés par <mark> après échappement HTML
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+
+def _fts_query(text: str) -> str:
+    """Transforme la saisie libre en requête FTS5 sûre (préfixes, ET implicite)."""
+    tokens = re.findall(r"\w+", text)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _highlight(snippet: str) -> str:
+    return (
+        html.escape(snippet)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+# Migrations appliquées dans l'ordre, une seule fois par base ; la version
+# courante est conservée dans la table schema_version.
+MIGRATIONS = [
+    (1, _migration_logs),
+    (2, _migration_outbox),
+    (3, _migration_logs_indexes),
+    (4, _migration_logs_fts),
+    (5, _migration_drop_logs_phone_index),
+]
+
+LOGS_PAGE_MAX = 500
+
+
+class Storage:
+    """Accès SQLite partagé par le serveur.
+
+    Chaque thread garde sa propre connexion ouverte (les requêtes préparées
+    restent ainsi dans le cache de ``sqlite3``), le schéma est migré une
+    seule fois au démarrage.
+    """
+
+    def __init__(self, db_path, pragmas=DEFAULT_PRAGMAS):
+        self.db_path = db_path
+        self.pragmas = pragmas
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.migrate()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            for name, value in self.pragmas:
+                conn.execute(f"PRAGMA {name}={value}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        with conn:
+            yield conn
+
+    def schema_version(self) -> int:
+        conn = self.connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return int(row[0] or 0)
+
+    def migrate(self) -> int:
+        current = self.schema_version()
+        for version, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info("Migration du schéma SQLite vers la version %s", version)
+            with self.transaction() as conn:
+                migration(conn)
+                conn.execute("INSERT INTO schema_version(version) VALUES (?)", (version,))
+            current = version
+        return current
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as exc:  # pragma: no cover - log seulement
+                logger.debug("Fermeture SQLite en erreur: %s", exc)
+        self._local = threading.local()
+
+    # Historique des envois
+
+    def insert_log(self, recipients, sender, text, response):
+        self.insert_logs(
+            [(datetime.utcnow().isoformat(), ",".join(recipients), sender, text, response)]
+        )
+
+    def insert_logs(self, rows):
+        """Insère des lignes ``(timestamp, phone, sender, message, response)`` en une transaction."""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO logs(timestamp, phone, sender, message, response) VALUES (?,?,?,?,?)",
+                rows,
+            )
+
+    def count_logs(self) -> int:
+        row = self.connection().execute("SELECT COUNT(*) FROM logs").fetchone()
+        return int(row[0])
+
+    def last_sender(self) -> str:
+        row = self.connection().execute(
+            "SELECT sender FROM logs WHERE sender IS NOT NULL AND sender != '' ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return row["sender"] if row else ""
+
+    def list_logs(self, before=None, limit=100, since=None, until=None, sender=None, phone=None, status=None):
+        """Page de l'historique, du plus récent au plus ancien.
+
+        La pagination se fait par curseur sur l'identifiant (``before``) :
+        le coût d'une page ne dépend pas de sa position dans l'historique.
+        Retourne ``(lignes, curseur_suivant)``, le curseur valant ``None``
+        sur la dernière page.
+        """
+        limit = max(1, min(int(limit), LOGS_PAGE_MAX))
+        clauses = []
+        params = []
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(int(before))
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            if len(until) == 10:
+                until += "T23:59:59.999999"
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        if sender:
+            clauses.append("sender = ?")
+            params.append(sender)
+        if phone:
+            # ``phone`` liste les destinataires séparés par des virgules : un
+            # numéro est cherché entre deux virgules pour trouver aussi les
+            # envois groupés, sans correspondance sur une partie de numéro
+            clauses.append("',' || phone || ',' LIKE ? ESCAPE '\\'")
+            escaped = phone.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%,{escaped},%")
+        if status == "ok":
+            clauses.append("response = 'OK'")
+        elif status == "failed":
+            clauses.append("response != 'OK'")
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self.connection().execute(
+            "SELECT id, timestamp, sender, phone, message, response FROM logs "
+            f"{where}ORDER BY id DESC LIMIT ?",
+            params + [limit + 1],
+        ).fetchall()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]["id"]
+        return rows, None
+
+    def has_fts(self) -> bool:
+        row = self.connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs_fts'"
+        ).fetchone()
+        return row is not None
+
+    def rebuild_fts(self) -> bool:
+        """Crée si besoin puis reconstruit l'index plein texte depuis ``logs``."""
+        with self.transaction() as conn:
+            if not _create_fts(conn):
+                return False
+            conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('optimize')")
+        return True
+
+    def search_logs(self, text, limit=50):
+        """Recherche dans l'historique, les plus pertinents d'abord.
+
+        Chaque résultat porte un champ ``snippet`` en HTML échappé où les
+        termes trouvés sont entourés de ``<mark>``.
+        """
+        limit = max(1, min(int(limit), LOGS_PAGE_MAX))
+        query = _fts_query(text or "")
+        if not query:
+            return []
+        conn = self.connection()
+        if self.has_fts():
+            rows = conn.execute(
+                "SELECT l.id, l.timestamp, l.sender, l.phone, l.message, l.response, "
+                "snippet(logs_fts, 0, ?, ?, '…', 16) AS snippet "
+                "FROM logs_fts JOIN logs l ON l.id = logs_fts.rowid "
+                "WHERE logs_fts MATCH ? ORDER BY bm25(logs_fts, 10.0, 2.0, 1.0) LIMIT ?",
+                (_MARK_START, _MARK_END, query, limit),
+            ).fetchall()
+            return [dict(row, snippet=_highlight(row["snippet"])) for row in rows]
+        like = f"%{text.strip()}%"
+        rows = conn.execute(
+            "SELECT id, timestamp, sender, phone, message, response FROM logs "
+            "WHERE message LIKE ? OR sender LIKE ? OR phone LIKE ? ORDER BY id DESC LIMIT ?",
+            (like, like, like, limit),
+        ).fetchall()
+        return [dict(row, snippet=html.escape(row["message"] or "")) for row in rows]
+
+    def delete_logs(self, ids) -> int:
+        with self.transaction() as conn:
+            cur = conn.executemany(
+                "DELETE FROM logs WHERE id = ?",
+                [(log_id,) for log_id in ids],
+            )
+            return cur.rowcount
+
+
+__all__ = ["Storage", "MIGRATIONS", "DEFAULT_PRAGMAS", "LOGS_PAGE_MAX"]
@@ -1,18 +1,17 @@
 import os
 import re
-import sqlite3
 import logging
 import uuid
 import threading
 import time
 from datetime import datetime
 
+from .cache import LookupFailed
+
 
 __all__ = [
     "parse_dbm",
     "get_signal_level",
-    "ensure_logs_table",
-    "log_request",
     "validate_request",
     "get_last_update_date",
     "get_current_version",
@@ -48,32 +47,6 @@ def get_signal_level(rsrp: int) -> int:
     return 0
 
 
-def ensure_logs_table(conn):
-    conn.execute(
-        "CREATE TABLE IF NOT EXISTS logs ("
-        "id INTEGER PRIMARY KEY AUTOINCREMENT,"
-        "timestamp TEXT,"
-        "phone TEXT,"
-        "sender TEXT,"
-        "message TEXT,"
-        "response TEXT)"
-    )
-    cols = [row[1] for row in conn.execute("PRAGMA table_info(logs)")]
-    if "sender" not in cols:
-        conn.execute("ALTER TABLE logs ADD COLUMN sender TEXT")
-
-
-def log_request(db_path, recipients, sender, text, response):
-    conn = sqlite3.connect(db_path)
-    ensure_logs_table(conn)
-    conn.execute(
-        "INSERT INTO logs(timestamp, phone, sender, message, response) VALUES (?,?,?,?,?)",
-        (datetime.utcnow().isoformat(), ",".join(recipients), sender, text, response),
-    )
-    conn.commit()
-    conn.close()
-
-
 def validate_request(data):
     recipients = data.get("to")
     sender = data.get("from")
@@ -152,8 +125,13 @@ def _start_consumer_heartbeat(consumer, interval=600):
     consumer._hb_thread = thread
 
 
-def create_kafka_clients(cfg: dict):
-    """Crée un producteur et un consommateur Kafka."""
+def create_kafka_clients(cfg: dict, heartbeat=True):
+    """Crée un producteur et un consommateur Kafka.
+
+    Avec ``heartbeat``, un thread appelle périodiquement ``poll(0)`` sur le
+    consommateur ; à désactiver quand un autre thread le consomme déjà
+    (``KafkaReplyDispatcher``), le consommateur n'étant pas thread-safe.
+    """
     from kafka import KafkaProducer, KafkaConsumer
     from kafka.errors import NoBrokersAvailable
 
@@ -209,7 +187,8 @@ def create_kafka_clients(cfg: dict):
         except Exception as exc:  # pragma: no cover - log seulement
             logger.debug("Première poll Kafka en erreur: %s", exc)
 
-        _start_consumer_heartbeat(consumer)
+        if heartbeat:
+            _start_consumer_heartbeat(consumer)
 
         original_close = consumer.close
 
@@ -251,8 +230,16 @@ def warmup_kafka(consumer, *, timeout_ms=1000, max_attempts=5):
     return thread
 
 
-def get_phone_from_kafka(baudin_id: str, cfg: dict, *, producer=None, consumer=None) -> str:
-    """Interroge Kafka pour obtenir le numéro associé à un identifiant."""
+def get_phone_from_kafka(baudin_id: str, cfg: dict, *, producer=None, consumer=None, dispatcher=None, timeout=30) -> str:
+    """Interroge Kafka pour obtenir le numéro associé à un identifiant.
+
+    Avec un ``dispatcher`` (voir ``kafka_dispatcher.KafkaReplyDispatcher``),
+    plusieurs recherches peuvent être en cours en même temps : chacune attend
+    sa propre réponse au lieu de lire le consommateur partagé.
+
+    Retourne une chaîne vide si Kafka n'est pas configuré ou si le numéro est
+    introuvable ; lève ``LookupFailed`` si Kafka ne répond pas à temps.
+    """
     if not cfg.get("kafka_url"):
         return ""
 
@@ -260,12 +247,18 @@ def get_phone_from_kafka(baudin_id: str, cfg: dict, *, producer=None, consumer=N
 
     logger.info("Recherche du numéro via Kafka pour l'ID %s", baudin_id)
 
+    if dispatcher is not None and producer is not None:
+        phone = dispatcher.request(producer, baudin_id, timeout=timeout)
+        if phone:
+            logger.info("Réponse reçue de Kafka pour %s: %s", baudin_id, phone)
+        return phone
+
     close_clients = False
     if producer is None or consumer is None:
         producer, consumer = create_kafka_clients(cfg)
         close_clients = True
         if producer is None or consumer is None:
-            return ""
+            raise LookupFailed("clients Kafka indisponibles")
 
     if not consumer.assignment():
         warmup_kafka(consumer, timeout_ms=1000, max_attempts=20)
@@ -288,7 +281,7 @@ def get_phone_from_kafka(baudin_id: str, cfg: dict, *, producer=None, consumer=N
         correlation_id,
     )
 
-    end = time.time() + 30
+    end = time.time() + timeout
     while time.time() < end:
 
         logger.debug(
@@ -320,17 +313,17 @@ def get_phone_from_kafka(baudin_id: str, cfg: dict, *, producer=None, consumer=N
                 )
                 continue
 
-            if message.value:
-                phone = message.value
-                logger.info(
-                    "Réponse reçue de Kafka: %s (kafka_correlationId %s)",
-                    phone,
-                    correlation_id,
-                )
-                if close_clients:
-                    producer.close()
-                    consumer.close()
-                return phone
+            # Réponse à notre demande : une valeur vide signifie numéro introuvable
+            phone = message.value or ""
+            logger.info(
+                "Réponse reçue de Kafka: %s (kafka_correlationId %s)",
+                phone or "introuvable",
+                correlation_id,
+            )
+            if close_clients:
+                producer.close()
+                consumer.close()
+            return phone
 
         if not polled:
             logger.debug("Aucun message reçu pendant cette tentative")
@@ -340,4 +333,4 @@ def get_phone_from_kafka(baudin_id: str, cfg: dict, *, producer=None, consumer=N
     if close_clients:
         producer.close()
         consumer.close()
-    return ""
+    raise LookupFailed(f"pas de réponse de Kafka en {timeout} s")
@@ -60,6 +60,89 @@ def main():
         default=5,
         help="Délai en secondes pour la connexion au modem",
     )
+    parser.add_argument(
+        "--modem-pool-size",
+        type=int,
+        default=int(os.getenv("MODEM_POOL_SIZE", "1")),
+        help="Nombre de sessions modem authentifiées conservées ouvertes",
+    )
+    parser.add_argument(
+        "--modem-session-file",
+        default=os.getenv("MODEM_SESSION_FILE", ""),
+        help="Fichier où enregistrer les sessions modem pour les reprendre au redémarrage sans se reconnecter",
+    )
+    parser.add_argument(
+        "--modem-keepalive",
+        type=int,
+        default=int(os.getenv("MODEM_KEEPALIVE", "0")),
+        help="Intervalle en secondes du heartbeat maintenant les sessions modem inactives (0 pour désactiver)",
+    )
+    parser.add_argument(
+        "--modem-idle-timeout",
+        type=int,
+        default=int(os.getenv("MODEM_IDLE_TIMEOUT", "0")),
+        help="Inactivité en secondes après laquelle une session modem est rouverte avant la requête (0 pour désactiver)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("SMS_API_WORKERS", "8")),
+        help="Nombre de threads traitant les requêtes HTTP (0 pour un traitement en série)",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=int(os.getenv("SMS_API_MAX_QUEUE", "64")),
+        help="Nombre maximal de connexions en attente d'un worker avant de répondre 503",
+    )
+    parser.add_argument(
+        "--modem-concurrency",
+        type=int,
+        default=int(os.getenv("MODEM_CONCURRENCY", "1")),
+        help="Nombre de requêtes simultanées autorisées vers le modem",
+    )
+    parser.add_argument(
+        "--phone-cache-size",
+        type=int,
+        default=int(os.getenv("PHONE_CACHE_SIZE", "1024")),
+        help="Nombre de numéros conservés en cache (0 pour désactiver)",
+    )
+    parser.add_argument(
+        "--phone-cache-ttl",
+        type=int,
+        default=int(os.getenv("PHONE_CACHE_TTL", "3600")),
+        help="Durée de validité en secondes d'un numéro en cache",
+    )
+    parser.add_argument(
+        "--sms-count-interval",
+        type=int,
+        default=int(os.getenv("SMS_COUNT_INTERVAL", "10")),
+        help="Intervalle en secondes de relève du nombre de SMS reçus",
+    )
+    parser.add_argument(
+        "--health-signal-interval",
+        type=int,
+        default=int(os.getenv("HEALTH_SIGNAL_INTERVAL", "10")),
+        help="Intervalle en secondes de relève du signal et du réseau pour /health",
+    )
+    parser.add_argument(
+        "--event-streams",
+        type=int,
+        default=int(os.getenv("EVENT_STREAMS", "0")) or None,
+        help="Nombre maximal de flux /events simultanés (défaut : la moitié des workers)",
+    )
+    parser.add_argument(
+        "--log-sync",
+        choices=["off", "normal", "full"],
+        default=os.getenv("LOG_SYNC", "normal"),
+        help="Synchronisation disque de l'historique : full (fsync à chaque lot), normal, off",
+    )
+    parser.add_argument(
+        "--log-batch-size",
+        type=int,
+        default=int(os.getenv("LOG_BATCH_SIZE", "500")),
+        help="Nombre maximal de lignes d'historique écrites par transaction",
+    )
     parser.add_argument("--kafka-client-id", type=str, default=os.getenv("KAFKA_CLIENT_ID", "sms"))
     parser.add_argument("--kafka-url", type=str, default=os.getenv("KAFKA_URL", ""))
     parser.add_argument("--kafka-group-id", type=str, default=os.getenv("KAFKA_GROUP_ID", "sms-consumer"))
@@ -98,6 +181,20 @@ def main():
     kafka_cert = config.get("kafka_cert", args.kafka_cert)
     sms_api_url = config.get("sms_api_url", args.sms_api_url)
     sms_api_key = config.get("sms_api_key", args.sms_api_key)
+    modem_pool_size = int(config.get("modem_pool_size", args.modem_pool_size))
+    modem_session_file = config.get("modem_session_file", args.modem_session_file)
+    modem_keepalive = int(config.get("modem_keepalive", args.modem_keepalive))
+    modem_idle_timeout = int(config.get("modem_idle_timeout", args.modem_idle_timeout))
+    workers = int(config.get("workers", args.workers))
+    max_queue = int(config.get("max_queue", args.max_queue))
+    modem_concurrency = int(config.get("modem_concurrency", args.modem_concurrency))
+    phone_cache_size = int(config.get("phone_cache_size", args.phone_cache_size))
+    phone_cache_ttl = int(config.get("phone_cache_ttl", args.phone_cache_ttl))
+    sms_count_interval = int(config.get("sms_count_interval", args.sms_count_interval))
+    event_streams = config.get("event_streams", args.event_streams)
+    health_signal_interval = int(config.get("health_signal_interval", args.health_signal_interval))
+    log_sync = config.get("log_sync", args.log_sync)
+    log_batch_size = int(config.get("log_batch_size", args.log_batch_size))
 
     server = SMSHTTPServer(
         (args.host, args.port),
@@ -121,6 +218,20 @@ def main():
         kafka_cert=kafka_cert,
         sms_api_url=sms_api_url,
         sms_api_key=sms_api_key,
+        modem_pool_size=modem_pool_size,
+        workers=workers,
+        max_queue=max_queue,
+        modem_concurrency=modem_concurrency,
+        phone_cache_size=phone_cache_size,
+        phone_cache_ttl=phone_cache_ttl,
+        log_sync=log_sync,
+        log_batch_size=log_batch_size,
+        sms_count_interval=sms_count_interval,
+        event_streams=int(event_streams) if event_streams else None,
+        health_signal_interval=health_signal_interval,
+        modem_session_file=modem_session_file or None,
+        modem_keepalive=modem_keepalive,
+        modem_idle_timeout=modem_idle_timeout,
     )
 
     if certfile and keyfile:
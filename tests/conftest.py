@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_modem import FakeModem, FakeModemServer  # noqa: E402
+
+
+@pytest.fixture
+def modem() -> FakeModem:
+    return FakeModem()
+
+
+@pytest.fixture
+def modem_server(modem: FakeModem) -> Iterator[FakeModemServer]:
+    server = FakeModemServer(('127.0.0.1', 0), modem)
+    server.start()
+    yield server
+    server.shutdown()
+    server.server_close()
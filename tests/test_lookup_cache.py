@@ -0,0 +1,72 @@
+from typing import List
+
+import pytest
+
+from sms_api.cache import LookupCache, LookupFailed
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_found_number_is_cached() -> None:
+    calls = []  # type: List[str]
+
+    def load() -> str:
+        calls.append('JD')
+        return '+33612345678'
+
+    cache = LookupCache()
+    assert cache.get_or_load(('kafka', 'JD'), load) == '+33612345678'
+    assert cache.get_or_load(('kafka', 'JD'), load) == '+33612345678'
+    assert calls == ['JD']
+    assert cache.stats()['hits'] == 1
+
+
+def test_failed_lookup_is_not_cached() -> None:
+    calls = []  # type: List[str]
+
+    def load() -> str:
+        calls.append('JD')
+        if len(calls) == 1:
+            raise LookupFailed('no answer')
+        return '+33612345678'
+
+    cache = LookupCache()
+    with pytest.raises(LookupFailed):
+        cache.get_or_load(('kafka', 'JD'), load)
+    assert cache.get_or_load(('kafka', 'JD'), load) == '+33612345678'
+    assert len(calls) == 2
+
+
+def test_unknown_number_expires_after_negative_ttl() -> None:
+    clock = FakeClock()
+    cache = LookupCache(ttl=3600, negative_ttl=60, clock=clock)
+    cache.put(('api', 'XX'), '')
+    cache.put(('api', 'JD'), '+33612345678')
+    clock.now = 61
+    assert cache.get(('api', 'XX')) == (False, None)
+    assert cache.get(('api', 'JD')) == (True, '+33612345678')
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = LookupCache(maxsize=2)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    cache.get('a')
+    cache.put('c', '3')
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, '1')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_purge_namespace() -> None:
+    cache = LookupCache()
+    cache.put(('kafka', 'JD'), '1')
+    cache.put(('api', 'JD'), '2')
+    assert cache.purge('kafka') == 1
+    assert cache.get(('api', 'JD')) == (True, '2')
@@ -0,0 +1,58 @@
+import pytest
+
+from fake_modem import FakeModem, FakeModemServer
+from huawei_lte_api.Client import Client
+from huawei_lte_api.Connection import Connection
+from huawei_lte_api.ResponseCache import ResponseCache
+from huawei_lte_api.enums.device import ControlModeEnum
+from huawei_lte_api.exceptions import ResponseErrorNotSupportedException
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cached_endpoint_is_read_once(modem: FakeModem, modem_server: FakeModemServer) -> None:
+    cache = ResponseCache()
+    with Connection(modem_server.url, username='admin', password='admin', response_cache=cache) as connection:
+        client = Client(connection)
+        first = client.device.information()
+        requests = modem.stats['requests']
+        first['DeviceName'] = 'changed by the caller'
+        assert client.device.information()['DeviceName'] == 'E5576-320'
+        assert modem.stats['requests'] == requests
+        # Not declaring a cache_ttl, always read from the modem
+        client.device.signal()
+        assert modem.stats['requests'] == requests + 1
+
+    assert cache.stats['hits'] == 1
+
+
+def test_post_invalidates_related_endpoints(modem: FakeModem, modem_server: FakeModemServer) -> None:
+    cache = ResponseCache()
+    with Connection(modem_server.url, username='admin', password='admin', response_cache=cache) as connection:
+        client = Client(connection)
+        client.device.information()
+        # Even a failed POST may have changed the device state
+        with pytest.raises(ResponseErrorNotSupportedException):
+            client.device.set_control(ControlModeEnum.REBOOT)
+        requests = modem.stats['requests']
+        client.device.information()
+        assert modem.stats['requests'] == requests + 1
+
+    assert cache.stats['invalidations'] == 1
+
+
+def test_entries_expire() -> None:
+    clock = FakeClock()
+    cache = ResponseCache(clock)
+    cache.put(('api', 'device/information'), {'DeviceName': 'E5576-320'}, 300.0)
+    clock.now = 299.0
+    assert cache.get(('api', 'device/information')) == (True, {'DeviceName': 'E5576-320'})
+    clock.now = 300.0
+    assert cache.get(('api', 'device/information')) == (False, None)
+    assert cache.stats['size'] == 0
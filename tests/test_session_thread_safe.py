@@ -0,0 +1,81 @@
+import threading
+from typing import Callable, List
+
+from fake_modem import FakeModem, FakeModemServer
+from huawei_lte_api.Client import Client
+from huawei_lte_api.Connection import Connection, ConnectionOptions
+from huawei_lte_api.api.User import User
+
+
+def _connect(server: FakeModemServer) -> Connection:
+    return Connection(server.url, username='admin', password='admin', options=ConnectionOptions(thread_safe=True))
+
+
+def _run_threads(target: Callable[[], None], count: int) -> List[threading.Thread]:
+    threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    return [thread for thread in threads if thread.is_alive()]
+
+
+def test_concurrent_posts_use_each_token_once(modem: FakeModem, modem_server: FakeModemServer) -> None:
+    errors = []  # type: List[Exception]
+    with _connect(modem_server) as connection:
+        client = Client(connection)
+
+        def send() -> None:
+            for _ in range(5):
+                try:
+                    client.sms.send_sms(['+33612345678'], 'test')
+                except Exception as e:  # pylint: disable=broad-except
+                    errors.append(e)
+
+        assert not _run_threads(send, 8)
+        assert connection.stats['reloads'] == 0
+
+    assert errors == []
+    assert modem.stats['sent'] == 40
+    assert modem.stats['logins'] == 1
+
+
+def test_relogin_while_posting_does_not_deadlock(modem: FakeModem, modem_server: FakeModemServer) -> None:
+    with _connect(modem_server) as connection:
+        client = Client(connection)
+        modem.csrf_rate = 0.2
+
+        def work() -> None:
+            for i in range(10):
+                try:
+                    client.sms.get_sms_list()
+                    if i % 3 == 0:
+                        connection.relogin()
+                except Exception:  # pylint: disable=broad-except
+                    # Two CSRF errors in a row are not retried, only deadlocks matter here
+                    pass
+
+        assert not _run_threads(work, 6)
+
+
+def test_login_retried_with_a_new_token(modem: FakeModem, modem_server: FakeModemServer) -> None:
+    with _connect(modem_server) as connection:
+        # The modem forgets the tokens the client holds: the login POST fails with a CSRF error,
+        # and the retry must hash the password with the token it is sent with
+        for session in modem.sessions.values():
+            session.tokens.clear()
+        assert User(connection).login('admin', 'admin', force_new_login=True)
+        assert connection.stats['reloads'] == 1
+
+    assert modem.stats['logins'] == 2
+    assert modem.login_failures == 0
+
+
+def test_expired_session_logs_in_again(modem: FakeModem, modem_server: FakeModemServer) -> None:
+    with _connect(modem_server) as connection:
+        for session in modem.sessions.values():
+            session.logged_in = False
+        assert Client(connection).sms.sms_count()['LocalInbox'] == '20'
+        assert connection.stats['relogins'] == 1
+
+    assert modem.stats['logins'] == 2
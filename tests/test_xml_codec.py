@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+import xmltodict
+
+from fake_modem import FakeModemServer
+from huawei_lte_api.Client import Client
+from huawei_lte_api.Connection import Connection
+from huawei_lte_api.XmlCodec import XmlCodec
+
+FIXTURES = Path(__file__).resolve().parents[1] / 'benchmarks' / 'fixtures'
+
+
+@pytest.mark.parametrize('path', sorted(FIXTURES.glob('*.xml')), ids=lambda path: path.stem)
+def test_parse_matches_xmltodict(path: Path) -> None:
+    data = path.read_bytes()
+    assert XmlCodec.parse(data) == xmltodict.parse(data, dict_constructor=dict)
+
+
+def test_parse_namespaced_document_falls_back_to_xmltodict() -> None:
+    data = b'<response xmlns:x="urn:x"><x:a>1</x:a><b attr="2">3</b></response>'
+    assert XmlCodec.parse(data) == xmltodict.parse(data, dict_constructor=dict)
+
+
+def test_parse_refuses_entity_declarations() -> None:
+    data = b'<!DOCTYPE r [<!ENTITY e "expanded">]><response><a>&e;</a></response>'
+    with pytest.raises(ValueError):
+        XmlCodec.parse(data)
+
+
+def test_unparse_request_matches_xmltodict() -> None:
+    request = {
+        'Index': -1,
+        'Phones': {'Phone': ['+33612345678', '+33698765432']},
+        'Content': 'a <b> & c',
+        'Reserved': 1,
+    }
+    assert XmlCodec.unparse_request(request) == xmltodict.unparse({'request': request}).encode('utf-8')
+
+
+def test_modem_responses(modem_server: FakeModemServer) -> None:
+    with Connection(modem_server.url, username='admin', password='admin') as connection:
+        client = Client(connection)
+        assert client.sms.sms_count()['LocalInbox'] == '20'
+        messages = client.sms.get_sms_list()['Messages']['Message']
+        assert len(messages) == 20
+        assert 'Message de test numéro 0' in {message['Content'] for message in messages}
+        assert messages[0]['Sca'] is None